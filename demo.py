@@ -4,6 +4,7 @@ Demo script voor Pasfoto Validatie Applicatie
 Test het complete systeem zonder GUI/camera
 """
 import sys
+import functools
 import cv2
 import numpy as np
 from pathlib import Path
@@ -11,12 +12,42 @@ from datetime import datetime
 
 from src.models.photo import Photo, PhotoStatus
 from src.models.face_detection_model import FaceDetectionModelFactory
-from src.services.validation_service import ValidationService
+from src.services.validation_service import ValidationService, IValidationObserver
 from src.services.storage_service import StorageService
 from src.repositories.photo_repository import SQLitePhotoRepository
 
 
+@functools.lru_cache(maxsize=1)
+def _default_model():
+    """Gedeeld face detection model (MediaPipe laden is duur, dus maar één keer)"""
+    return FaceDetectionModelFactory.create_default_model()
+
+
+@functools.lru_cache(maxsize=1)
+def _service():
+    """Gedeelde validation service die het gedeelde model gebruikt"""
+    return ValidationService(face_detection_model=_default_model())
+
+
+# Test image wordt één keer gemaakt en gedeeld door alle demos
+_TEST_IMAGE = None
+
+
 def create_test_image():
+    """
+    Haal het test image met een gezicht op
+
+    Het image wordt bij de eerste aanroep gemaakt en daarna hergebruikt.
+    Het is read-only, zodat demos het niet per ongeluk aanpassen.
+    """
+    global _TEST_IMAGE
+    if _TEST_IMAGE is None:
+        _TEST_IMAGE = _build_test_image()
+        _TEST_IMAGE.setflags(write=False)
+    return _TEST_IMAGE
+
+
+def _build_test_image():
     """Maak een test image met een gezicht"""
     # Voor nu een simpel beeld, later vervangen met echte foto
     img = np.ones((480, 640, 3), dtype=np.uint8) * 128
@@ -122,24 +153,28 @@ def demo_repository():
     print(f"  Avg confidence: {stats.get('average_confidence', 0):.3f}")
 
 
-def demo_validation_service():
-    """Demo: Validation service met observer pattern"""
+def demo_validation_service(service=None):
+    """
+    Demo: Validation service met observer pattern
+
+    Args:
+        service: ValidationService om te gebruiken (default: gedeelde service)
+    """
     print("\n" + "=" * 70)
     print("DEMO 4: Validation Service (Observer Pattern)")
     print("=" * 70)
 
-    class ConsoleObserver:
+    class ConsoleObserver(IValidationObserver):
         """Observer die updates print naar console"""
-        def update(self, event_type, data):
-            if event_type == "validation_progress":
-                print(f"  {data}")
-            elif event_type == "validation_result":
-                result = data['result']
-                status = "PASS" if result.is_valid else "FAIL"
-                print(f"    [{status}] {data['validator']}: {result.message}")
-
-    # Maak service met observer
-    service = ValidationService()
+        def on_validation_progress(self, message):
+            print(f"  {message}")
+
+        def on_validation_result(self, result):
+            status = "PASS" if result.is_valid else "FAIL"
+            print(f"    [{status}] {result.validator_name}: {result.message}")
+
+    # Service met observer
+    service = service or _service()
     observer = ConsoleObserver()
     service.add_observer(observer)
 
@@ -155,16 +190,23 @@ def demo_validation_service():
     print(f"  Confidence: {validated.get_overall_confidence():.3f}")
     print(f"  Status: {validated.status.value}")
 
+    service.remove_observer(observer)
 
-def demo_design_patterns():
-    """Demo: Design patterns in actie"""
+
+def demo_design_patterns(service=None):
+    """
+    Demo: Design patterns in actie
+
+    Args:
+        service: ValidationService om te gebruiken (default: gedeelde service)
+    """
     print("\n" + "=" * 70)
     print("DEMO 5: Design Patterns")
     print("=" * 70)
 
     # 1. Factory Pattern
     print("\n1. Factory Pattern (FaceDetectionModelFactory):")
-    model1 = FaceDetectionModelFactory.create_default_model()
+    model1 = _default_model()
     model2 = FaceDetectionModelFactory.create_mediapipe_model(
         min_detection_confidence=0.8
     )
@@ -192,13 +234,11 @@ def demo_design_patterns():
 
     # 4. Observer Pattern
     print("\n4. Observer Pattern (ValidationService -> Observers):")
-    service = ValidationService()
+    service = service or _service()
 
-    class DemoObserver:
+    class DemoObserver(IValidationObserver):
         def __init__(self, name):
-            self.name = name
-        def update(self, event_type, data):
-            pass  # Quiet for demo
+            self.name = name  # Quiet for demo, alle events zijn no-ops
 
     obs1 = DemoObserver("GUI Observer")
     obs2 = DemoObserver("Logging Observer")
@@ -208,6 +248,9 @@ def demo_design_patterns():
     print(f"       - {obs1.name}")
     print(f"       - {obs2.name}")
 
+    service.remove_observer(obs1)
+    service.remove_observer(obs2)
+
     # 5. Singleton Pattern (Config)
     print("\n5. Singleton Pattern (ValidatorConfig):")
     from src.validators.base_validator import ValidatorConfig
@@ -2,21 +2,39 @@
 Main entry point voor Pasfoto Validatie Applicatie
 """
 import sys
+import atexit
 import logging
+import logging.handlers
+import queue
 from PyQt6.QtWidgets import QApplication
 
 from src.gui.main_window import PhotoBoothWindow
 
 
 def setup_logging():
-    """Setup logging configuratie"""
+    """
+    Setup logging configuratie
+
+    Log records gaan via een queue naar een achtergrond thread die naar
+    bestand en stdout schrijft, zodat de GUI thread nooit op disk I/O wacht.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    file_handler = logging.FileHandler('pasfoto_validatie.log')
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('pasfoto_validatie.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
 
 
@@ -6,13 +6,37 @@ BioID Face Database: https://www.bioid.com/face-database/
 - 23 verschillende personen
 - Verschillende poses, belichting, achtergronden
 """
+import io
 import os
 import urllib.request
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import shutil
 
 
+def _copy_files(files, dest_dir: Path, max_workers: int = 8):
+    """
+    Kopieer bestanden parallel naar dest_dir (bestaande bestanden worden overgeslagen)
+
+    shutil.copy2 geeft de GIL vrij tijdens de eigenlijke kopie, dus meerdere
+    threads houden de disk beter bezig dan één voor één kopiëren.
+
+    Args:
+        files: Bestanden om te kopiëren
+        dest_dir: Doel directory
+        max_workers: Aantal threads
+    """
+    def copy_one(src: Path):
+        dest = dest_dir / src.name
+        if not dest.exists():
+            shutil.copy2(src, dest)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() zodat exceptions uit de threads hier opgegooid worden
+        list(executor.map(copy_one, files))
+
+
 class BioIDDatasetDownloader:
     """Download en prepareer BioID Face Database"""
 
@@ -25,8 +49,11 @@ class BioIDDatasetDownloader:
         """
         self.data_dir = Path(data_dir)
         self.dataset_url = "https://ftp.uni-erlangen.de/pub/facedb/BioID-FaceDatabase-V1.2.zip"
+        # alleen gebruikt als de zip handmatig is gedownload
         self.zip_path = self.data_dir / "BioID-FaceDatabase-V1.2.zip"
         self.extract_dir = self.data_dir / "extracted"
+        # gedownloade zip blijft in geheugen (~80 MB) tot extract()
+        self._zip_buffer = None
 
     def download(self):
         """Download de dataset"""
@@ -36,30 +63,44 @@ class BioIDDatasetDownloader:
         # Maak directory aan
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        # Check of al gedownload
+        # Handmatig gedownloade zip hoeft niet opnieuw gedownload te worden
         if self.zip_path.exists():
-            print(f"Dataset zip already exists at: {self.zip_path}")
+            print(f"Using existing dataset zip at: {self.zip_path}")
+            return True
+
+        # Check of al gedownload en uitgepakt
+        if self.extract_dir.exists() and any(self.extract_dir.iterdir()):
+            print(f"Dataset already extracted at: {self.extract_dir}")
             response = input("Re-download? (y/n): ")
             if response.lower() != 'y':
                 print("Skipping download...")
-                return
+                return True
 
         print(f"\nDownloading from: {self.dataset_url}")
-        print(f"Saving to: {self.zip_path}")
         print("This may take a few minutes (approx 80 MB)...\n")
 
         try:
-            # Download met progress
-            def report_progress(block_num, block_size, total_size):
-                downloaded = block_num * block_size
-                percent = min(100, (downloaded / total_size) * 100)
-                print(f"\rProgress: {percent:.1f}% ({downloaded / (1024*1024):.1f} MB)", end='')
-
-            urllib.request.urlretrieve(
-                self.dataset_url,
-                self.zip_path,
-                reporthook=report_progress
-            )
+            # Download direct in geheugen, zonder tussentijds zip bestand op disk
+            buffer = io.BytesIO()
+            with urllib.request.urlopen(self.dataset_url) as response:
+                total_size = int(response.headers.get('Content-Length', 0))
+
+                while True:
+                    chunk = response.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    buffer.write(chunk)
+
+                    # Toon progress
+                    downloaded = buffer.tell()
+                    if total_size:
+                        percent = min(100, (downloaded / total_size) * 100)
+                        print(f"\rProgress: {percent:.1f}% ({downloaded / (1024*1024):.1f} MB)", end='')
+                    else:
+                        print(f"\rProgress: {downloaded / (1024*1024):.1f} MB", end='')
+
+            buffer.seek(0)
+            self._zip_buffer = buffer
             print("\n\n[OK] Download complete!")
 
         except Exception as e:
@@ -72,22 +113,32 @@ class BioIDDatasetDownloader:
         return True
 
     def extract(self):
-        """Extract de dataset"""
-        if not self.zip_path.exists():
-            print("[FAIL] Zip file not found. Run download() first.")
+        """Extract de dataset (uit de gedownloade buffer of een handmatige zip)"""
+        if self._zip_buffer is not None:
+            source = self._zip_buffer
+        elif self.zip_path.exists():
+            source = self.zip_path
+        elif self.extract_dir.exists() and any(self.extract_dir.iterdir()):
+            print(f"\n[OK] Already extracted at: {self.extract_dir}")
+            return True
+        else:
+            print("[FAIL] No downloaded dataset found. Run download() first.")
             return False
 
         print("\nExtracting dataset...")
         self.extract_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
+            with zipfile.ZipFile(source, 'r') as zip_ref:
                 zip_ref.extractall(self.extract_dir)
             print(f"[OK] Extracted to: {self.extract_dir}")
             return True
         except Exception as e:
             print(f"[FAIL] Extraction failed: {e}")
             return False
+        finally:
+            # geheugen van de download vrijgeven
+            self._zip_buffer = None
 
     def organize(self):
         """Organiseer dataset in structured folders"""
@@ -121,10 +172,7 @@ class BioIDDatasetDownloader:
 
         print(f"Found {len(image_files)} images")
 
-        for img_file in image_files:
-            dest = images_dir / img_file.name
-            if not dest.exists():
-                shutil.copy2(img_file, dest)
+        _copy_files(image_files, images_dir)
 
         print(f"[OK] Copied {len(image_files)} images to {images_dir}")
 
@@ -134,10 +182,7 @@ class BioIDDatasetDownloader:
             landmarks_dir = self.data_dir / "landmarks"
             landmarks_dir.mkdir(exist_ok=True)
 
-            for lm_file in landmark_files:
-                dest = landmarks_dir / lm_file.name
-                if not dest.exists():
-                    shutil.copy2(lm_file, dest)
+            _copy_files(landmark_files, landmarks_dir)
 
             print(f"[OK] Copied {len(landmark_files)} landmark files to {landmarks_dir}")
 
@@ -8,34 +8,190 @@ import os
 from pathlib import Path
 import cv2
 import numpy as np
+import json
 from datetime import datetime
+from multiprocessing import Pool
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.models.photo import Photo
-from src.models.face_detection_model import FaceDetectionModelFactory
+from src.models.photo import Photo, ValidationResult
+from src.models.face_detection_model import FaceDetectionModel, FaceDetectionModelFactory
 from src.validators.brightness_validator import BrightnessValidator
 from src.validators.sharpness_validator import SharpnessValidator
 from src.validators.face_position_validator import FacePositionValidator
 from src.validators.expression_validator import FacialExpressionValidator
 from src.validators.eye_validator import EyeVisibilityValidator
 from src.services.validation_service import ValidationService
+from src.repositories.photo_repository import SQLitePhotoRepository
+
+
+# Om de hoeveel images de voortgang geprint wordt
+PROGRESS_INTERVAL = 32
+
+# BioID images hebben allemaal dezelfde afmetingen (384x286 grayscale)
+BIOID_IMAGE_SHAPE = (286, 384)
+
+# Per-worker model, service en dataset cache (worden één keer per proces aangemaakt in _worker_init)
+_worker_face_model = None
+_worker_validation_service = None
+_worker_images = None
+_worker_filenames = None
+_worker_photo = None
+
+
+def _worker_init(cache_path: str, filenames: list):
+    """
+    Initialiseer face model, validation service en dataset cache in een worker proces
+
+    Args:
+        cache_path: Pad naar de .npy dataset cache
+        filenames: Bestandsnamen in dezelfde volgorde als de cache
+    """
+    global _worker_face_model, _worker_validation_service, _worker_images, _worker_filenames, _worker_photo
+    # een eigen model per worker, niet via de (gedeelde) factory cache: een
+    # MediaPipe graph van vóór de fork werkt in het child niet meer
+    _worker_face_model = FaceDetectionModel()
+    # de workers draaien al parallel, dus geen extra validator threads per proces
+    _worker_validation_service = ValidationService(face_detection_model=_worker_face_model, max_workers=1)
+    # belichting wordt al voor de hele batch in het hoofdproces berekend (zie test_all)
+    _worker_validation_service.remove_validator("BrightnessValidator")
+    # mode="r" zodat alle workers dezelfde (OS page-cached) pagina's delen
+    _worker_images = np.load(cache_path, mmap_mode="r")
+    _worker_filenames = filenames
+    _worker_photo = Photo()
+
+
+def _process_index(index: int):
+    """
+    Test één image uit de dataset cache in een worker proces
+
+    Args:
+        index: Index van de image in de cache
+
+    Returns:
+        Dictionary met resultaten
+    """
+    return _test_image(
+        _worker_face_model,
+        _worker_validation_service,
+        _worker_photo,
+        np.asarray(_worker_images[index]),
+        _worker_filenames[index]
+    )
+
+
+def _test_image(face_model, validation_service: ValidationService, photo: Photo,
+                img: np.ndarray, filename: str):
+    """
+    Test validators op één image
+
+    Args:
+        face_model: FaceDetectionModel om mee te detecteren
+        validation_service: ValidationService om mee te valideren
+        photo: Photo object dat voor deze image hergebruikt wordt (zie Photo.reset)
+        img: Image als NumPy array (grayscale of BGR)
+        filename: Bestandsnaam van de image
+
+    Returns:
+        Dictionary met resultaten
+    """
+    # Hergebruik het Photo object (grayscale wordt direct door de validators ondersteund)
+    photo.reset(img)
+
+    # Detect face
+    face_detection = face_model.detect_face(img)
+
+    # Validate (met de al berekende face detection)
+    validated_photo = validation_service.validate_photo(photo, face_detection=face_detection, fast_fail=True)
+
+    return {
+        'filename': filename,
+        'face_detected': face_detection.face_found,
+        'face_confidence': face_detection.confidence,
+        'overall_valid': validated_photo.is_valid(),
+        'overall_confidence': validated_photo.get_overall_confidence(),
+        'validation_results': [
+            {
+                'validator': r.validator_name,
+                'valid': r.is_valid,
+                'confidence': r.confidence,
+                'message': r.message
+            }
+            for r in validated_photo.validation_results
+        ]
+    }
+
+
+def _merge_result(result: dict, validation_result: ValidationResult) -> None:
+    """
+    Voeg een los berekend validatie resultaat toe aan een test resultaat
+
+    Args:
+        result: Dictionary zoals teruggegeven door _test_image (wordt aangepast)
+        validation_result: Resultaat om vooraan toe te voegen
+    """
+    result['validation_results'].insert(0, {
+        'validator': validation_result.validator_name,
+        'valid': validation_result.is_valid,
+        'confidence': validation_result.confidence,
+        'message': validation_result.message
+    })
+
+    # overall waardes opnieuw berekenen, net als Photo.is_valid / get_overall_confidence
+    validation_results = result['validation_results']
+    result['overall_valid'] = all(vr['valid'] for vr in validation_results)
+    result['overall_confidence'] = sum(vr['confidence'] for vr in validation_results) / len(validation_results)
+
+
+def _result_to_photo(result: dict) -> Photo:
+    """
+    Bouw een Photo (zonder image data) uit een test resultaat
+
+    Args:
+        result: Dictionary zoals teruggegeven door _test_image
+
+    Returns:
+        Photo object met validatie resultaten en status
+    """
+    photo = Photo(metadata={
+        'source': 'bioid',
+        'filename': result['filename'],
+        'face_detected': result['face_detected']
+    })
+
+    for vr in result['validation_results']:
+        photo.add_validation_result(ValidationResult(
+            validator_name=vr['validator'],
+            is_valid=vr['valid'],
+            confidence=vr['confidence'],
+            message=vr['message']
+        ))
+
+    photo.update_status()
+    return photo
 
 
 class BioIDTester:
     """Test validators met BioID dataset"""
 
-    def __init__(self, dataset_path: str = "data/bioid/images"):
+    def __init__(self, dataset_path: str = "data/bioid/images", db_path: str = None):
         """
         Initialiseer tester
 
         Args:
             dataset_path: Pad naar BioID images
+            db_path: Optioneel pad naar SQLite database om resultaten in op te slaan
         """
         self.dataset_path = Path(dataset_path)
-        self.face_model = FaceDetectionModelFactory.create_default_model()
+        self.cache_path = self.dataset_path.parent / "_cache.npy"
+        self.cache_index_path = self.dataset_path.parent / "_cache.json"
+        # face model pas laden als het sequentiële pad het nodig heeft (zie face_model)
+        self._face_model = None
         self.validation_service = ValidationService()
+        self.repository = SQLitePhotoRepository(db_path) if db_path else None
+        self._image_files = None
+        self._photo = Photo()
 
         # Statistieken
         self.stats = {
@@ -44,6 +200,18 @@ class BioIDTester:
             'validation_results': {}
         }
 
+    @property
+    def face_model(self) -> FaceDetectionModel:
+        """
+        Face detection model voor het sequentiële pad, geladen bij het eerste gebruik
+
+        Niet in __init__: test_all forkt worker processen die elk hun eigen
+        model laden, en een MediaPipe graph van vóór de fork werkt daar niet.
+        """
+        if self._face_model is None:
+            self._face_model = FaceDetectionModelFactory.create_default_model()
+        return self._face_model
+
     def load_images(self, limit: int = None):
         """
         Laad BioID images
@@ -59,95 +227,157 @@ class BioIDTester:
             print("Run: python scripts/download_bioid_dataset.py")
             return []
 
-        image_files = list(self.dataset_path.glob("*.pgm"))
+        # dataset verandert niet tijdens een run, dus maar één keer globben
+        if self._image_files is None:
+            self._image_files = sorted(self.dataset_path.glob("*.pgm"))
 
-        if limit:
-            image_files = image_files[:limit]
+        image_files = self._image_files[:limit] if limit else self._image_files
 
         print(f"Found {len(image_files)} images")
         return image_files
 
-    def test_single_image(self, image_path: Path):
+    def _build_cache(self):
+        """
+        Decodeer alle BioID images één keer naar een .npy cache
+
+        Slaat een (N, H, W) uint8 grayscale array op met een JSON sidecar
+        met de bestandsnamen in dezelfde volgorde.
+        """
+        image_files = self.load_images()
+
+        print(f"Building dataset cache for {len(image_files)} images...")
+
+        images = np.lib.format.open_memmap(
+            self.cache_path, mode="w+", dtype=np.uint8,
+            shape=(len(image_files), *BIOID_IMAGE_SHAPE)
+        )
+        filenames = []
+
+        for image_path in image_files:
+            img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+
+            if img is None or img.shape != BIOID_IMAGE_SHAPE:
+                print(f"✗ Skipping {image_path.name}")
+                continue
+
+            images[len(filenames)] = img
+            filenames.append(image_path.name)
+
+        images.flush()
+        del images
+
+        with open(self.cache_index_path, "w") as f:
+            json.dump(filenames, f)
+
+    def load_cache(self, limit: int = None):
         """
-        Test validators op één image
+        Laad de dataset cache (bouwt hem eerst als hij nog niet bestaat)
 
         Args:
-            image_path: Pad naar image
+            limit: Optioneel limit op aantal images
 
         Returns:
-            Dictionary met resultaten
+            (images, filenames) tuple, images is een read-only memmap
         """
-        # Laad image
-        img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
-
-        if img is None:
-            return None
-
-        # Converteer grayscale naar BGR (validators verwachten BGR)
-        img_bgr = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
-
-        # Maak Photo object
-        photo = Photo(image_data=img_bgr)
-
-        # Detect face
-        face_detection = self.face_model.detect_face(img_bgr)
-
-        # Validate
-        validated_photo = self.validation_service.validate_photo(photo)
-
-        return {
-            'filename': image_path.name,
-            'face_detected': face_detection.face_found,
-            'face_confidence': face_detection.confidence,
-            'overall_valid': validated_photo.is_valid(),
-            'overall_confidence': validated_photo.get_overall_confidence(),
-            'validation_results': [
-                {
-                    'validator': r.validator_name,
-                    'valid': r.is_valid,
-                    'confidence': r.confidence,
-                    'message': r.message
-                }
-                for r in validated_photo.validation_results
-            ]
-        }
+        if not self.dataset_path.exists():
+            print(f"✗ Dataset not found at {self.dataset_path}")
+            print("Run: python scripts/download_bioid_dataset.py")
+            return None, []
+
+        if (not self.cache_path.exists() or not self.cache_index_path.exists()
+                or np.load(self.cache_path, mmap_mode="r").shape[1:] != BIOID_IMAGE_SHAPE):
+            self._build_cache()
+
+        with open(self.cache_index_path) as f:
+            filenames = json.load(f)
 
-    def test_all(self, limit: int = None):
+        # overgeslagen images staan aan het eind van de cache, die laten we weg
+        images = np.load(self.cache_path, mmap_mode="r")[:len(filenames)]
+
+        if limit:
+            images = images[:limit]
+            filenames = filenames[:limit]
+
+        print(f"Found {len(filenames)} images")
+        return images, filenames
+
+    def test_single_image(self, images: np.ndarray, filenames: list, index: int):
+        """
+        Test validators op één image uit de dataset cache
+
+        Args:
+            images: Dataset cache (zie load_cache)
+            filenames: Bestandsnamen bij de cache
+            index: Index van de image
+
+        Returns:
+            Dictionary met resultaten
+        """
+        return _test_image(
+            self.face_model,
+            self.validation_service,
+            self._photo,
+            np.asarray(images[index]),
+            filenames[index]
+        )
+
+    def test_all(self, limit: int = None, workers: int = None):
         """
         Test alle images
 
+        Images worden parallel verwerkt in een multiprocessing Pool; elke worker
+        heeft een eigen MediaPipe model en ValidationService.
+
         Args:
             limit: Optioneel limit op aantal images
+            workers: Aantal worker processen (default: aantal CPU cores)
         """
         print("=" * 70)
         print("BioID Dataset Validation Test")
         print("=" * 70)
         print()
 
-        image_files = self.load_images(limit)
+        images, filenames = self.load_cache(limit)
 
-        if not image_files:
+        if not filenames:
             return
 
-        print(f"Testing {len(image_files)} images...\n")
+        print(f"Testing {len(filenames)} images...\n")
 
-        results = []
+        # Belichting hangt niet af van face detection, dus die berekenen we
+        # gevectoriseerd voor de hele dataset in plaats van per image
+        brightness_results = BrightnessValidator().validate_array(images)
+        index_by_filename = {filename: i for i, filename in enumerate(filenames)}
 
-        for i, image_path in enumerate(image_files, 1):
-            print(f"\rProcessing {i}/{len(image_files)}: {image_path.name}", end='')
-
-            result = self.test_single_image(image_path)
-
-            if result:
-                results.append(result)
+        results = []
 
-                # Update stats
-                self.stats['total_images'] += 1
-                if result['face_detected']:
-                    self.stats['faces_detected'] += 1
+        with Pool(
+            processes=workers,
+            initializer=_worker_init,
+            initargs=(str(self.cache_path), filenames)
+        ) as pool:
+            for i, result in enumerate(pool.imap_unordered(_process_index, range(len(filenames)), chunksize=16), 1):
+                # Progress maar om de PROGRESS_INTERVAL images printen
+                if i % PROGRESS_INTERVAL == 0 or i == len(filenames):
+                    sys.stdout.write(f"\rProcessing {i}/{len(filenames)}")
+                    sys.stdout.flush()
+
+                if result:
+                    _merge_result(result, brightness_results[index_by_filename[result['filename']]])
+                    results.append(result)
+
+                    # Update stats
+                    self.stats['total_images'] += 1
+                    if result['face_detected']:
+                        self.stats['faces_detected'] += 1
 
         print("\n")
 
+        # Sla alle resultaten in één batch op
+        if self.repository:
+            saved = self.repository.save_photos(_result_to_photo(r) for r in results)
+            print(f"Saved {saved} results to database\n")
+
         # Analyze results
         self.analyze_results(results)
 
@@ -172,34 +402,36 @@ class BioIDTester:
         print(f"  Detection rate: {face_detection_rate:.1f}%")
 
         # Validator statistics
-        validator_stats = {}
-
-        for result in results:
-            if not result['face_detected']:
-                continue
-
+        # Eerste pass: tel per validator hoeveel resultaten er zijn
+        detected = [r for r in results if r['face_detected']]
+        counts = {}
+        for result in detected:
             for vr in result['validation_results']:
-                validator_name = vr['validator']
-
-                if validator_name not in validator_stats:
-                    validator_stats[validator_name] = {
-                        'total': 0,
-                        'passed': 0,
-                        'confidences': []
-                    }
-
-                validator_stats[validator_name]['total'] += 1
-                if vr['valid']:
-                    validator_stats[validator_name]['passed'] += 1
-                validator_stats[validator_name]['confidences'].append(vr['confidence'])
+                counts[vr['validator']] = counts.get(vr['validator'], 0) + 1
+
+        # Tweede pass: vul vooraf gealloceerde arrays
+        validator_stats = {
+            name: {
+                'valid': np.empty(count, dtype=bool),
+                'confidences': np.empty(count, dtype=np.float32),
+                'n': 0
+            }
+            for name, count in counts.items()
+        }
+        for result in detected:
+            for vr in result['validation_results']:
+                stats = validator_stats[vr['validator']]
+                stats['valid'][stats['n']] = vr['valid']
+                stats['confidences'][stats['n']] = vr['confidence']
+                stats['n'] += 1
 
         print(f"\nValidator Performance:")
         print(f"{'Validator':<30} {'Pass Rate':<15} {'Avg Confidence':<15}")
         print("-" * 70)
 
         for validator_name, stats in sorted(validator_stats.items()):
-            pass_rate = (stats['passed'] / stats['total']) * 100
-            avg_conf = np.mean(stats['confidences'])
+            pass_rate = stats['valid'].mean() * 100
+            avg_conf = stats['confidences'].mean()
 
             print(f"{validator_name:<30} {pass_rate:>6.1f}%         {avg_conf:>6.3f}")
 
@@ -211,7 +443,9 @@ class BioIDTester:
         print(f"  Images passing all validators: {overall_valid}/{len(results)} ({overall_rate:.1f}%)")
 
         # Average confidence
-        avg_overall_conf = np.mean([r['overall_confidence'] for r in results if r['face_detected']])
+        avg_overall_conf = np.fromiter(
+            (r['overall_confidence'] for r in detected), dtype=np.float32, count=len(detected)
+        ).mean() if detected else 0.0
         print(f"  Average overall confidence: {avg_overall_conf:.3f}")
 
         print("\n" + "=" * 70)
@@ -227,12 +461,12 @@ class BioIDTester:
         print(f"\nDetailed test for: {validator_name}")
         print("=" * 70)
 
-        image_files = self.load_images(limit)
+        images, filenames = self.load_cache(limit)
 
         failed_cases = []
 
-        for image_path in image_files:
-            result = self.test_single_image(image_path)
+        for index in range(len(filenames)):
+            result = self.test_single_image(images, filenames, index)
 
             if not result or not result['face_detected']:
                 continue
@@ -263,15 +497,17 @@ def main():
     parser = argparse.ArgumentParser(description='Test validators met BioID dataset')
     parser.add_argument('--limit', type=int, default=None, help='Limit aantal images')
     parser.add_argument('--validator', type=str, default=None, help='Test specifieke validator')
+    parser.add_argument('--workers', type=int, default=None, help='Aantal worker processen')
+    parser.add_argument('--db', type=str, default=None, help='Sla resultaten op in deze SQLite database')
 
     args = parser.parse_args()
 
-    tester = BioIDTester()
+    tester = BioIDTester(db_path=args.db)
 
     if args.validator:
         tester.test_specific_validator(args.validator, limit=args.limit or 100)
     else:
-        tester.test_all(limit=args.limit)
+        tester.test_all(limit=args.limit, workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -6,26 +6,149 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QProgressBar, QTextEdit,
     QMessageBox, QFrame
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThread, QThreadPool, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap
 import cv2
 import numpy as np
 import logging
+import threading
 
 from ..services.camera_service import PhotoBoothCameraService
-from ..services.validation_service import ValidationService
+from ..services.validation_service import ValidationService, IValidationObserver
 from ..services.storage_service import StorageService
-from ..models.photo import Photo
+from ..models.photo import Photo, ValidationResult
 
 
 logger = logging.getLogger(__name__)
 
 
-class PhotoBoothWindow(QMainWindow):
+class ValidationWorkerSignals(QObject):
+    """Signals van een ValidationWorker (QRunnable kan zelf geen signals hebben)"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class ValidationWorker(QRunnable):
+    """
+    Valideert een foto op een QThreadPool thread zodat de GUI blijft reageren
+    """
+
+    def __init__(self, validation_service: ValidationService, photo: Photo):
+        """
+        Initialiseer worker
+
+        Args:
+            validation_service: ValidationService om mee te valideren
+            photo: Photo object om te valideren
+        """
+        super().__init__()
+        self._validation_service = validation_service
+        self._photo = photo
+        self.signals = ValidationWorkerSignals()
+
+    def run(self):
+        """Voer de validatie uit (draait op een worker thread)"""
+        try:
+            validated_photo = self._validation_service.validate_photo(self._photo)
+            self.signals.finished.emit(validated_photo)
+        except Exception as e:
+            logger.error(f"Error validating photo: {e}", exc_info=True)
+            self.signals.failed.emit(str(e))
+
+
+class CameraThread(QThread):
+    """
+    Haalt preview frames op van de camera buiten de GUI thread
+
+    camera.grab() blokkeert tot er een nieuw frame is, dus deze loop loopt
+    vanzelf op de FPS van de camera. Er staat steeds maar één frame klaar: als
+    de GUI nog niet getekend heeft, vervangt een nieuw frame het oude in plaats
+    van dat er een achterstand aan frames in de event queue ontstaat.
+    """
+    # geen payload: de GUI haalt het nieuwste frame op met take_frame()
+    frame_ready = pyqtSignal()
+
+    def __init__(self, camera_service: PhotoBoothCameraService):
+        """
+        Initialiseer camera thread
+
+        Args:
+            camera_service: Camera service om frames van op te halen
+        """
+        super().__init__()
+        self._camera_service = camera_service
+        self._running = False
+        # nieuwste frame + of er al een frame_ready onderweg is naar de GUI
+        self._frame_lock = threading.Lock()
+        self._latest_frame = None
+        self._frame_pending = False
+
+    def run(self):
+        """Lees frames tot stop() aangeroepen wordt (draait op de camera thread)"""
+        self._running = True
+        while self._running:
+            frame = self._camera_service.get_preview_with_overlay(overlay_type="guidelines")
+
+            if frame is None:
+                # geen camera of leesfout, niet in een rondje blijven spinnen
+                self.msleep(33)
+                continue
+
+            # frame zit in de ring buffer van de camera service en wordt een paar
+            # frames later overschreven, dus de GUI krijgt een eigen kopie
+            frame = frame.copy()
+            with self._frame_lock:
+                self._latest_frame = frame
+                pending, self._frame_pending = self._frame_pending, True
+            if not pending:
+                self.frame_ready.emit()
+            self.msleep(1)
+
+    def take_frame(self):
+        """
+        Haal het nieuwste frame op (vanaf de GUI thread)
+
+        Returns:
+            Nieuwste preview frame, of None als er geen nieuw frame is
+        """
+        with self._frame_lock:
+            frame, self._latest_frame = self._latest_frame, None
+            self._frame_pending = False
+        return frame
+
+    def stop(self):
+        """Stop de loop en wacht tot de thread klaar is"""
+        self._running = False
+        self.wait()
+
+
+class PhotoBoothWindow(QMainWindow, IValidationObserver):
     """
     Main window voor photobooth applicatie
     """
 
+    # observer events komen van de validatie thread binnen en worden via deze
+    # signals (queued) naar de GUI thread doorgestuurd
+    _validation_progress = pyqtSignal(str)
+    _validation_result = pyqtSignal(object)
+
+    # HTML voor de validatie feedback
+    _FEEDBACK_TEMPLATE = (
+        "<h3>Validatie Resultaat</h3>"
+        "<p><b>Status:</b> {status}</p>"
+        "<p><b>Overall Confidence:</b> {confidence:.1%}</p>"
+        "<hr>"
+        "{summary}"
+        "<h4>Details:</h4>"
+        "<ul>{items}</ul>"
+    )
+    _FEEDBACK_ITEM_TEMPLATE = (
+        "<li><span style='color: {color};'>{icon} <b>{name}:</b> "
+        "{message} ({confidence:.1%})</span></li>"
+    )
+    _FEEDBACK_PASSED = "<p style='color: green; font-weight: bold;'>✓ Alle validaties geslaagd!</p>"
+    _FEEDBACK_FAILED = "<p style='color: red; font-weight: bold;'>✗ Sommige validaties gefaald</p>"
+
     def __init__(self):
         """Initialiseer main window"""
         super().__init__()
@@ -38,27 +161,49 @@ class PhotoBoothWindow(QMainWindow):
         # State
         self._current_photo: Photo = None
         self._capturing = False
+        self._completed_validations = 0
+        self._validator_count = 0
+        self._target_size_cache = None
+        self._display_buffer: np.ndarray = None
+        self._display_qimage: QImage = None
 
         # Setup UI
         self._setup_ui()
 
         # Register as observer for validation updates
         self._validation_service.add_observer(self)
+        self._validation_progress.connect(
+            self._status_label.setText, Qt.ConnectionType.QueuedConnection
+        )
+        self._validation_result.connect(
+            self._on_validation_result, Qt.ConnectionType.QueuedConnection
+        )
+
+        # Validatie draait op een thread pool, niet op de GUI thread
+        self._thread_pool = QThreadPool.globalInstance()
+        self._validation_worker: ValidationWorker = None
 
-        # Start camera
+        # Preview thread (wordt gestart zodra de camera open is)
+        self._camera_thread = CameraThread(self._camera_service)
+        self._camera_thread.frame_ready.connect(self._update_preview)
+
+        # Camera openen kan even duren, dus pas doen als de event loop draait
+        # en het window al getekend is
+        QTimer.singleShot(0, self._initialize_camera)
+
+        logger.info("PhotoBoothWindow initialized")
+
+    def _initialize_camera(self):
+        """Open de camera en start de preview thread"""
         if not self._camera_service.initialize():
             QMessageBox.critical(
                 self,
                 "Camera Error",
                 "Kon camera niet initialiseren. Controleer of een camera verbonden is."
             )
+            return
 
-        # Start preview timer
-        self._preview_timer = QTimer()
-        self._preview_timer.timeout.connect(self._update_preview)
-        self._preview_timer.start(33)  # ~30 FPS
-
-        logger.info("PhotoBoothWindow initialized")
+        self._camera_thread.start()
 
     def _setup_ui(self):
         """Setup gebruikersinterface"""
@@ -179,44 +324,88 @@ class PhotoBoothWindow(QMainWindow):
         return panel
 
     def _update_preview(self):
-        """Update camera preview"""
-        if not self._camera_service.is_initialized or self._capturing:
-            return
-
-        # Get frame with overlay
-        frame = self._camera_service.get_preview_with_overlay(overlay_type="guidelines")
-
-        if frame is None:
+        """Update camera preview met het nieuwste frame van de camera thread"""
+        frame = self._camera_thread.take_frame()
+        if frame is None or self._capturing:
             return
 
         # Convert to Qt format
         self._display_image(frame, self._camera_label)
 
-    def _display_image(self, image: np.ndarray, label: QLabel):
+    def _display_image(self, image: np.ndarray, label: QLabel, smooth: bool = False):
         """
         Display image in label
 
         Args:
             image: NumPy array (BGR format)
             label: QLabel to display in
+            smooth: Schaal met hogere kwaliteit (voor de gemaakte foto, niet voor de preview)
         """
-        # Convert BGR to RGB
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-
-        # Convert to QImage
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-
-        # Scale to label size while maintaining aspect ratio
-        pixmap = QPixmap.fromImage(qt_image)
-        scaled_pixmap = pixmap.scaled(
-            label.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
+        # Schaal met OpenCV naar label grootte (aspect ratio blijft behouden),
+        # dat is sneller dan QPixmap.scaled en de QImage wordt ook kleiner
+        tw, th = self._target_size(image.shape, label)
+        h, w = image.shape[:2]
+        if (tw, th) != (w, h):
+            # resize schrijft direct in de vaste display buffer waar de QImage naar kijkt
+            buffer, qt_image = self._get_display_buffer(tw, th)
+            # INTER_AREA geeft het mooiste verkleinde resultaat, maar voor 30 FPS
+            # preview is INTER_LINEAR goed genoeg en goedkoper
+            interpolation = cv2.INTER_AREA if smooth and tw < w else cv2.INTER_LINEAR
+            cv2.resize(image, (tw, th), dst=buffer, interpolation=interpolation)
+        else:
+            # QImage snapt alleen rijen met aaneengesloten pixels (geen views met
+            # een stap in de kolommen of kanalen); dan één keer zelf kopiëren
+            if not image.flags['C_CONTIGUOUS']:
+                image = np.ascontiguousarray(image)
+            # Qt kan BGR direct lezen, dus geen cvtColor nodig
+            # QImage kopieert de data niet; image blijft geldig tot fromImage hieronder
+            qt_image = QImage(image.data, tw, th, image.strides[0], QImage.Format.Format_BGR888)
+
+        label.setPixmap(QPixmap.fromImage(qt_image))
+
+    def _get_display_buffer(self, width: int, height: int) -> tuple:
+        """
+        Haal de display buffer en de QImage die erover ligt op
+
+        De buffer wordt alleen opnieuw aangemaakt als de display grootte verandert,
+        zodat er niet elk frame een nieuwe image gealloceerd wordt.
+
+        Args:
+            width: Breedte van de display image
+            height: Hoogte van de display image
+
+        Returns:
+            (buffer, qimage) tuple
+        """
+        if self._display_buffer is None or self._display_buffer.shape[:2] != (height, width):
+            self._display_buffer = np.empty((height, width, 3), dtype=np.uint8)
+            self._display_qimage = QImage(
+                self._display_buffer.data, width, height, width * 3, QImage.Format.Format_BGR888
+            )
+
+        return self._display_buffer, self._display_qimage
+
+    def _target_size(self, image_shape: tuple, label: QLabel) -> tuple:
+        """
+        Bereken de display grootte van een image in een label
 
-        label.setPixmap(scaled_pixmap)
+        Args:
+            image_shape: Shape van de image (height, width[, channels])
+            label: QLabel waarin de image getoond wordt
+
+        Returns:
+            (width, height) tuple die in het label past met behoud van aspect ratio
+        """
+        h, w = image_shape[:2]
+        key = (label.width(), label.height(), w, h)
+
+        # label en frame grootte veranderen bijna nooit, dus onthoud de laatste uitkomst
+        if self._target_size_cache is None or self._target_size_cache[0] != key:
+            scale = min(label.width() / w, label.height() / h)
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+            self._target_size_cache = (key, size)
+
+        return self._target_size_cache[1]
 
     def _on_capture_clicked(self):
         """Handle capture button click"""
@@ -236,15 +425,29 @@ class PhotoBoothWindow(QMainWindow):
         self._current_photo = photo
 
         # Display captured photo
-        self._display_image(photo.image_data, self._camera_label)
+        self._display_image(photo.image_data, self._camera_label, smooth=True)
 
         # Start validation
         self._status_label.setText("Foto wordt gevalideerd...")
         self._progress_bar.setVisible(True)
         self._progress_bar.setValue(0)
+        self._completed_validations = 0
+        self._validator_count = len(self._validation_service.get_validators())
+
+        # Validate op een worker thread; resultaat komt binnen via _on_validation_finished
+        self._validation_worker = ValidationWorker(self._validation_service, photo)
+        self._validation_worker.signals.finished.connect(self._on_validation_finished)
+        self._validation_worker.signals.failed.connect(self._on_validation_failed)
+        self._thread_pool.start(self._validation_worker)
+
+    def _on_validation_finished(self, validated_photo: Photo):
+        """
+        Handle afgeronde validatie (op de GUI thread)
 
-        # Validate in separate thread would be better, but for simplicity we do it directly
-        validated_photo = self._validation_service.validate_photo(photo)
+        Args:
+            validated_photo: Gevalideerde photo
+        """
+        self._validation_worker = None
         self._current_photo = validated_photo
 
         # Save photo (approved or rejected)
@@ -253,6 +456,17 @@ class PhotoBoothWindow(QMainWindow):
         # Show results
         self._show_validation_results()
 
+    def _on_validation_failed(self, error: str):
+        """
+        Handle mislukte validatie (op de GUI thread)
+
+        Args:
+            error: Foutmelding
+        """
+        self._validation_worker = None
+        QMessageBox.warning(self, "Fout", f"Validatie mislukt: {error}")
+        self._reset_ui()
+
     def _show_validation_results(self):
         """Toon validatie resultaten"""
         if self._current_photo is None:
@@ -261,39 +475,35 @@ class PhotoBoothWindow(QMainWindow):
         # Update progress
         self._progress_bar.setValue(100)
 
-        # Build feedback text
-        feedback = []
-        feedback.append(f"<h3>Validatie Resultaat</h3>")
-        feedback.append(f"<p><b>Status:</b> {self._current_photo.status.value.upper()}</p>")
-        feedback.append(f"<p><b>Overall Confidence:</b> {self._current_photo.get_overall_confidence():.1%}</p>")
-        feedback.append("<hr>")
-
-        if self._current_photo.is_valid():
-            feedback.append("<p style='color: green; font-weight: bold;'>✓ Alle validaties geslaagd!</p>")
+        is_valid = self._current_photo.is_valid()
+
+        if is_valid:
             self._status_label.setText("Pasfoto geaccepteerd!")
             self._status_label.setStyleSheet("font-size: 16px; padding: 10px; color: green; font-weight: bold;")
         else:
-            feedback.append("<p style='color: red; font-weight: bold;'>✗ Sommige validaties gefaald</p>")
             self._status_label.setText("Pasfoto afgekeurd - zie feedback")
             self._status_label.setStyleSheet("font-size: 16px; padding: 10px; color: red; font-weight: bold;")
 
-        feedback.append("<h4>Details:</h4>")
-        feedback.append("<ul>")
-
-        for result in self._current_photo.validation_results:
-            icon = "✓" if result.is_valid else "✗"
-            color = "green" if result.is_valid else "red"
-            feedback.append(
-                f"<li><span style='color: {color};'>{icon} <b>{result.validator_name}:</b> "
-                f"{result.message} ({result.confidence:.1%})</span></li>"
+        # Build feedback text
+        items = "".join(
+            self._FEEDBACK_ITEM_TEMPLATE.format(
+                color="green" if result.is_valid else "red",
+                icon="✓" if result.is_valid else "✗",
+                name=result.validator_name,
+                message=result.message,
+                confidence=result.confidence
             )
-
-        feedback.append("</ul>")
-
-        self._feedback_text.setHtml("".join(feedback))
+            for result in self._current_photo.validation_results
+        )
+        self._feedback_text.document().setHtml(self._FEEDBACK_TEMPLATE.format(
+            status=self._current_photo.status.value.upper(),
+            confidence=self._current_photo.get_overall_confidence(),
+            summary=self._FEEDBACK_PASSED if is_valid else self._FEEDBACK_FAILED,
+            items=items
+        ))
 
         # Enable action buttons
-        if self._current_photo.is_valid():
+        if is_valid:
             self._accept_button.setEnabled(True)
         self._retry_button.setEnabled(True)
 
@@ -328,23 +538,46 @@ class PhotoBoothWindow(QMainWindow):
         self._status_label.setStyleSheet("font-size: 16px; padding: 10px;")
         self._feedback_text.clear()
 
-    def update(self, event_type: str, data):
+    def on_validation_progress(self, message: str) -> None:
         """
-        Observer update methode
+        Observer: een validator wordt gestart
+
+        Wordt vanaf de validatie thread aangeroepen, dus alleen doorsturen
+        naar de GUI thread.
 
         Args:
-            event_type: Type van event
-            data: Event data
+            message: Status bericht
         """
-        if event_type == "validation_progress":
-            # Update status
-            self._status_label.setText(data)
-        elif event_type == "validation_result":
-            # Update progress bar
-            progress = len(self._current_photo.validation_results) / len(self._validation_service.get_validators()) * 100
-            self._progress_bar.setValue(int(progress))
+        self._validation_progress.emit(message)
+
+    def on_validation_result(self, result: ValidationResult) -> None:
+        """
+        Observer: een validator is klaar (vanaf de validatie thread)
+
+        Args:
+            result: Resultaat van de validator
+        """
+        self._validation_result.emit(result)
+
+    def _on_validation_result(self, result: ValidationResult):
+        """
+        Update de progress bar op de GUI thread
+
+        Args:
+            result: Resultaat van de validator
+        """
+        if self._validator_count == 0:
+            return
+
+        self._completed_validations += 1
+        self._progress_bar.setValue(int(self._completed_validations / self._validator_count * 100))
 
     def closeEvent(self, event):
         """Handle window close"""
+        # wacht op een lopende validatie voordat de camera vrijgegeven wordt
+        self._thread_pool.waitForDone()
+        self._validation_service.close()
+        self._camera_thread.stop()
         self._camera_service.release()
+        self._storage_service.close()
         event.accept()
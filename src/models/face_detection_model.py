@@ -5,7 +5,9 @@ Face detection model using MediaPipe
 import cv2
 import mediapipe as mp # Google MediaPipe bibliotheek
 import numpy as np
-from typing import Optional, Dict, Tuple
+import os
+import threading
+from typing import Optional, Dict, List, Sequence, Tuple
 from dataclasses import dataclass
 
 from .photo import FaceDetectionResult
@@ -22,7 +24,9 @@ class FaceDetectionModel:
     def __init__(
         self,
         min_detection_confidence: float = 0.7,
-        min_tracking_confidence: float = 0.5
+        min_tracking_confidence: float = 0.5,
+        tracking: bool = False,
+        max_detection_size: Optional[int] = 640
     ):
         """
         Initialiseer face detection model
@@ -30,21 +34,34 @@ class FaceDetectionModel:
         Args:
             min_detection_confidence: Minimum confidence voor face detectie
             min_tracking_confidence: Minimum confidence voor tracking
+            tracking: Volg het gezicht over opeenvolgende frames (video/preview)
+                      in plaats van elke image opnieuw te detecteren
+            max_detection_size: Langste zijde waarnaar images verkleind worden
+                                voor detectie (None = nooit verkleinen)
         """
         # sla de confidence waardes op voor later gebruik
         self._min_detection_confidence = min_detection_confidence
         self._min_tracking_confidence = min_tracking_confidence
+        self._max_detection_size = max_detection_size
 
         # hier maken we het MediaPipe gezichts mesh model aan
         # dit ding kan 468 punten op je gezicht vinden, best veel eigenlijk
         self._mp_face_mesh = mp.solutions.face_mesh
         self._face_mesh = self._mp_face_mesh.FaceMesh(
-            static_image_mode=True,  # we doen losse foto's, geen video
+            # losse foto's: elke keer volledige detectie, video: tracking tussen frames
+            static_image_mode=not tracking,
             max_num_faces=1,  # we willen maar 1 gezicht per foto
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
 
+        # MediaPipe FaceMesh (en de RGB buffer) zijn niet thread-safe, en één
+        # model kan via de factory gedeeld worden, dus detectie gaat via een lock
+        self._lock = threading.RLock()
+
+        # RGB buffer voor detect_face, wordt bij de eerste image aangemaakt
+        self._rgb_buffer: Optional[np.ndarray] = None
+
         # dit zijn de indices van belangrijke punten op het gezicht
         # MediaPipe heeft 468 punten, maar we hebben niet allemaal nodig want sommige zijn best dicht bij elkaar
         self._LANDMARK_INDICES = {
@@ -75,21 +92,102 @@ class FaceDetectionModel:
                          172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109]
         }
 
+        # de punten die _extract_landmarks gebruikt, in een vaste volgorde,
+        # zodat ze per detectie met één fancy-index opgehaald kunnen worden
+        self._FEATURE_POINTS = (
+            'left_eye_top', 'left_eye_bottom', 'left_eye_left', 'left_eye_right',
+            'right_eye_top', 'right_eye_bottom', 'right_eye_left', 'right_eye_right',
+            'mouth_top', 'mouth_bottom', 'mouth_left', 'mouth_right',
+            'left_eyebrow_inner', 'left_eyebrow_outer'
+        )
+        self._feature_indices = np.array(
+            [self._LANDMARK_INDICES[name] for name in self._FEATURE_POINTS], dtype=np.intp
+        )
+
     def detect_face(self, image: np.ndarray) -> FaceDetectionResult:
         """
         Detecteer gezicht en extract landmarks
 
         Args:
-            image: Input image als NumPy array (BGR format)
+            image: Input image als NumPy array (BGR format of grayscale)
+
+        Returns:
+            FaceDetectionResult met detectie informatie
+        """
+        with self._lock:
+            return self._detect_face(image)
+
+    def detect_faces_batch(self, images: Sequence[np.ndarray]) -> List[FaceDetectionResult]:
+        """
+        Detecteer gezichten in een reeks images
+
+        MediaPipe Face Mesh verwerkt één image per process() call, dus dit is geen
+        batch inferentie; wel wordt de lock maar één keer genomen en de RGB buffer
+        hergebruikt zolang de afmetingen gelijk blijven.
+
+        Args:
+            images: Input images als NumPy arrays (BGR format of grayscale)
+
+        Returns:
+            Lijst met FaceDetectionResult, één per image
+        """
+        with self._lock:
+            return [self._detect_face(image) for image in images]
+
+    def _detect_face(self, image: np.ndarray) -> FaceDetectionResult:
+        """
+        Detecteer gezicht (zie detect_face, lock is al genomen)
+
+        Args:
+            image: Input image als NumPy array (BGR format of grayscale)
 
         Returns:
             FaceDetectionResult met detectie informatie
         """
-        # Converteer BGR naar RGB (MediaPipe verwacht RGB)
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        original_shape = image.shape
+
+        # Verklein grote images eerst; MediaPipe heeft genoeg aan ~640 pixels en de
+        # landmarks zijn genormaliseerd, dus die schalen we straks op de originele maat
+        h, w = image.shape[:2]
+        scale = self._max_detection_size / max(h, w) if self._max_detection_size else 1.0
+        if scale < 1.0:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        # Converteer naar RGB (MediaPipe verwacht RGB), in een buffer die
+        # hergebruikt wordt zolang de afmetingen gelijk blijven
+        rgb_shape = image.shape[:2] + (3,)
+        if self._rgb_buffer is None or self._rgb_buffer.shape != rgb_shape:
+            self._rgb_buffer = np.empty(rgb_shape, dtype=np.uint8)
+
+        if image.ndim == 2:
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB, dst=self._rgb_buffer)
+        else:
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+
+        return self.detect_face_rgb(image_rgb, image_shape=original_shape)
+
+    def detect_face_rgb(
+        self,
+        image_rgb: np.ndarray,
+        image_shape: Optional[Tuple[int, ...]] = None
+    ) -> FaceDetectionResult:
+        """
+        Detecteer gezicht in een image die al RGB is (geen kleurconversie)
+
+        Args:
+            image_rgb: Input image als NumPy array (RGB format)
+            image_shape: Shape waarin bbox en landmarks uitgedrukt worden, als
+                         image_rgb een verkleinde versie is (default: image_rgb.shape)
+
+        Returns:
+            FaceDetectionResult met detectie informatie
+        """
+        if image_shape is None:
+            image_shape = image_rgb.shape
 
         # Process image
-        results = self._face_mesh.process(image_rgb)
+        with self._lock:
+            results = self._face_mesh.process(image_rgb)
 
         # Check of gezicht gedetecteerd is
         if not results.multi_face_landmarks:
@@ -103,11 +201,14 @@ class FaceDetectionModel:
         # Haal eerste (en enige) gezicht op
         face_landmarks = results.multi_face_landmarks[0]
 
+        # Zet alle landmarks één keer om naar pixel coordinaten (N x 2 array)
+        points = self._landmarks_to_points(face_landmarks, image_shape)
+
         # Bereken bounding box
-        bbox = self._calculate_bounding_box(face_landmarks, image.shape)
+        bbox = self._calculate_bounding_box(points, image_shape)
 
         # Extract belangrijke landmarks
-        landmarks = self._extract_landmarks(face_landmarks, image.shape)
+        landmarks = self._extract_landmarks(points, image_shape)
 
         # Bereken confidence (MediaPipe geeft geen directe confidence, gebruik landmark count)
         confidence = min(1.0, len(face_landmarks.landmark) / 468)  # 468 is totaal aantal landmarks
@@ -119,41 +220,62 @@ class FaceDetectionModel:
             landmarks=landmarks
         )
 
-    def _calculate_bounding_box(
+    def _landmarks_to_points(
         self,
         face_landmarks,
-        image_shape: Tuple[int, int, int]
+        image_shape: Tuple[int, ...]
+    ) -> np.ndarray:
+        """
+        Zet MediaPipe landmarks om naar pixel coordinaten
+
+        Args:
+            face_landmarks: MediaPipe face landmarks
+            image_shape: Shape van image (height, width[, channels])
+
+        Returns:
+            Array van shape (N, 2) met (x, y) per landmark
+        """
+        h, w = image_shape[:2]
+
+        # één keer door de protobuf lopen (zonder tussenlijst van tuples),
+        # daarna alle punten in één keer schalen
+        landmarks = face_landmarks.landmark
+        points = np.fromiter(
+            (c for lm in landmarks for c in (lm.x, lm.y)),
+            dtype=np.float64,
+            count=2 * len(landmarks)
+        ).reshape(-1, 2)
+        np.multiply(points, (w, h), out=points)
+        return points
+
+    def _calculate_bounding_box(
+        self,
+        points: np.ndarray,
+        image_shape: Tuple[int, ...]
     ) -> Tuple[int, int, int, int]:
         """
         Bereken bounding box van gezicht
 
         Args:
-            face_landmarks: MediaPipe face landmarks
-            image_shape: Shape van image (height, width, channels)
+            points: Landmark pixel coordinaten (zie _landmarks_to_points)
+            image_shape: Shape van image (height, width[, channels])
 
         Returns:
             (x, y, width, height) tuple
         """
-        h, w, _ = image_shape
+        h, w = image_shape[:2]
 
-        # Haal alle landmark coordinaten op
-        x_coords = [lm.x * w for lm in face_landmarks.landmark]
-        y_coords = [lm.y * h for lm in face_landmarks.landmark]
-
-        # Bereken min/max
-        x_min = int(min(x_coords))
-        x_max = int(max(x_coords))
-        y_min = int(min(y_coords))
-        y_max = int(max(y_coords))
+        # Bereken min/max (afgekapt naar ints, net als int())
+        mins = points.min(axis=0).astype(np.int64)
+        maxs = points.max(axis=0).astype(np.int64)
 
         # Voeg wat padding toe
-        padding_x = int((x_max - x_min) * 0.1)
-        padding_y = int((y_max - y_min) * 0.1)
+        padding = ((maxs - mins) * 0.1).astype(np.int64)
 
-        x_min = max(0, x_min - padding_x)
-        y_min = max(0, y_min - padding_y)
-        x_max = min(w, x_max + padding_x)
-        y_max = min(h, y_max + padding_y)
+        # en klem alles in één keer binnen de image
+        x_min, y_min, x_max, y_max = np.clip(
+            np.concatenate((mins - padding, maxs + padding)), 0, (w, h, w, h)
+        ).tolist()
 
         width = x_max - x_min
         height = y_max - y_min
@@ -162,37 +284,30 @@ class FaceDetectionModel:
 
     def _extract_landmarks(
         self,
-        face_landmarks,
-        image_shape: Tuple[int, int, int]
+        points: np.ndarray,
+        image_shape: Tuple[int, ...]
     ) -> Dict:
         """
         Extract belangrijke landmarks en bereken features
 
         Args:
-            face_landmarks: MediaPipe face landmarks
+            points: Landmark pixel coordinaten (zie _landmarks_to_points)
             image_shape: Shape van image
 
         Returns:
             Dictionary met landmark features
         """
-        h, w, _ = image_shape
+        h, w = image_shape[:2]
         landmarks_dict = {}
 
-        # Helper functie om landmark coordinaten op te halen
-        def get_point(idx):
-            lm = face_landmarks.landmark[idx]
-            return (int(lm.x * w), int(lm.y * h))
-
-        # Extract oog landmarks
-        left_eye_top = get_point(self._LANDMARK_INDICES['left_eye_top'])
-        left_eye_bottom = get_point(self._LANDMARK_INDICES['left_eye_bottom'])
-        left_eye_left = get_point(self._LANDMARK_INDICES['left_eye_left'])
-        left_eye_right = get_point(self._LANDMARK_INDICES['left_eye_right'])
-
-        right_eye_top = get_point(self._LANDMARK_INDICES['right_eye_top'])
-        right_eye_bottom = get_point(self._LANDMARK_INDICES['right_eye_bottom'])
-        right_eye_left = get_point(self._LANDMARK_INDICES['right_eye_left'])
-        right_eye_right = get_point(self._LANDMARK_INDICES['right_eye_right'])
+        # Haal alle benodigde punten in één keer op en kap ze af naar ints
+        # (zelfde als int() per punt), volgorde zoals in self._FEATURE_POINTS
+        (
+            left_eye_top, left_eye_bottom, left_eye_left, left_eye_right,
+            right_eye_top, right_eye_bottom, right_eye_left, right_eye_right,
+            mouth_top, mouth_bottom, mouth_left, mouth_right,
+            left_eyebrow_inner, left_eyebrow_outer
+        ) = points[self._feature_indices].astype(np.int32).tolist()
 
         # Bereken eye aspect ratios
         left_eye_height = abs(left_eye_top[1] - left_eye_bottom[1])
@@ -219,12 +334,6 @@ class FaceDetectionModel:
         landmarks_dict['left_eye_region'] = (left_eye_x, left_eye_y, left_eye_w, left_eye_h)
         landmarks_dict['right_eye_region'] = (right_eye_x, right_eye_y, right_eye_w, right_eye_h)
 
-        # Extract mond landmarks
-        mouth_top = get_point(self._LANDMARK_INDICES['mouth_top'])
-        mouth_bottom = get_point(self._LANDMARK_INDICES['mouth_bottom'])
-        mouth_left = get_point(self._LANDMARK_INDICES['mouth_left'])
-        mouth_right = get_point(self._LANDMARK_INDICES['mouth_right'])
-
         # Bereken mouth aspect ratio
         mouth_height = abs(mouth_top[1] - mouth_bottom[1])
         mouth_width = abs(mouth_right[0] - mouth_left[0])
@@ -233,10 +342,6 @@ class FaceDetectionModel:
         landmarks_dict['mouth_lower'] = mouth_bottom[1]
         landmarks_dict['mouth_width'] = mouth_width
 
-        # Extract wenkbrauw landmarks
-        left_eyebrow_inner = get_point(self._LANDMARK_INDICES['left_eyebrow_inner'])
-        left_eyebrow_outer = get_point(self._LANDMARK_INDICES['left_eyebrow_outer'])
-
         # Bereken eyebrow raise (afstand tussen wenkbrauw en oog)
         eyebrow_eye_distance = abs(left_eyebrow_inner[1] - left_eye_top[1])
         # Normaliseer op basis van gezichts hoogte
@@ -261,16 +366,25 @@ class FaceDetectionModelFactory:
     """
     Factory voor het creëren van face detection models
 
-    Implementeert Factory Pattern
+    Implementeert Factory Pattern. Models voor losse foto's worden per set
+    parameters maar één keer aangemaakt en daarna gedeeld, omdat het laden van
+    MediaPipe relatief duur is. Een gedeeld model serialiseert detecties via
+    een lock; wie parallel wil detecteren maakt per thread een eigen model.
+    De cache geldt per proces: een geforkt child proces begint met een lege
+    cache (zie _reset_models_after_fork).
     """
 
+    # gedeelde models, key is (min_detection_confidence, min_tracking_confidence)
+    _models: Dict[Tuple[float, float], FaceDetectionModel] = {}
+    _models_lock = threading.Lock()
+
     @staticmethod
     def create_mediapipe_model(
         min_detection_confidence: float = 0.7,
         min_tracking_confidence: float = 0.5
     ) -> FaceDetectionModel:
         """
-        Creëer MediaPipe face detection model
+        Creëer MediaPipe face detection model (of geef het gedeelde model terug)
 
         Args:
             min_detection_confidence: Minimum detection confidence
@@ -279,10 +393,30 @@ class FaceDetectionModelFactory:
         Returns:
             FaceDetectionModel instance
         """
-        return FaceDetectionModel(
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
+        key = (min_detection_confidence, min_tracking_confidence)
+
+        with FaceDetectionModelFactory._models_lock:
+            model = FaceDetectionModelFactory._models.get(key)
+            if model is None:
+                model = FaceDetectionModel(
+                    min_detection_confidence=min_detection_confidence,
+                    min_tracking_confidence=min_tracking_confidence
+                )
+                FaceDetectionModelFactory._models[key] = model
+
+        return model
+
+    @staticmethod
+    def create_tracking_model() -> FaceDetectionModel:
+        """
+        Creëer face detection model voor opeenvolgende frames (camera preview)
+
+        Tracking models houden state bij over frames, dus die worden niet gedeeld.
+
+        Returns:
+            FaceDetectionModel instance in tracking mode
+        """
+        return FaceDetectionModel(tracking=True)
 
     @staticmethod
     def create_default_model() -> FaceDetectionModel:
@@ -292,4 +426,29 @@ class FaceDetectionModelFactory:
         Returns:
             FaceDetectionModel instance met default settings
         """
-        return FaceDetectionModel()
+        return FaceDetectionModelFactory.create_mediapipe_model()
+
+
+# models die een geforkt child van de parent geërfd heeft (zie _reset_models_after_fork)
+_inherited_models: List[FaceDetectionModel] = []
+
+
+def _reset_models_after_fork() -> None:
+    """
+    Vergeet de gedeelde models in een geforkt child proces
+
+    Een MediaPipe graph overleeft een fork niet (zijn threads gaan niet mee),
+    dus een child dat het model van de parent hergebruikt blijft hangen. Het
+    child laadt daarom zijn eigen models. De geërfde models worden wel
+    vastgehouden: sluiten (in __del__) wacht op die verdwenen threads en zou
+    het child net zo goed laten hangen. De lock kan tijdens de fork door een
+    andere thread vastgehouden zijn en wordt dus ook vervangen.
+    """
+    _inherited_models.extend(FaceDetectionModelFactory._models.values())
+    FaceDetectionModelFactory._models = {}
+    FaceDetectionModelFactory._models_lock = threading.Lock()
+
+
+# os.register_at_fork bestaat niet op Windows (daar wordt ook niet geforkt)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_models_after_fork)
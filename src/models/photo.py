@@ -4,7 +4,8 @@ Domain model voor pasfoto's
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Callable, Optional, Union
+import json
 import numpy as np
 
 
@@ -15,7 +16,7 @@ class PhotoStatus(Enum):
     REJECTED = "rejected"
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class ValidationResult:
     """
     Resultaat van een validatie check
@@ -31,15 +32,111 @@ class ValidationResult:
     is_valid: bool
     confidence: float
     message: str
-    details: Optional[dict] = None
+    # de details, of de JSON (from_json_details) of functie (from_details_factory)
+    # waar ze bij het eerste lezen uit gemaakt worden, zie details
+    _details: Union[dict, bytes, str, Callable[[], dict], None] = field(
+        default=None, repr=False, compare=False
+    )
 
-    def __post_init__(self):
-        """Valideer confidence score"""
-        if not 0.0 <= self.confidence <= 1.0:
+    def __init__(
+        self,
+        validator_name: str,
+        is_valid: bool,
+        confidence: float,
+        message: str,
+        details: Optional[dict] = None
+    ):
+        """Valideer confidence score (alleen in debug mode, python -O slaat dit over)"""
+        if __debug__ and not 0.0 <= confidence <= 1.0:
             raise ValueError("Confidence must be between 0.0 and 1.0")
+        self.validator_name = validator_name
+        self.is_valid = is_valid
+        self.confidence = confidence
+        self.message = message
+        self._details = details
+
+    @property
+    def details(self) -> Optional[dict]:
+        """Optionele extra details, geparsed of opgebouwd bij het eerste lezen"""
+        details = self._details
+        if isinstance(details, (bytes, str)):
+            details = self._details = json.loads(details)
+        elif callable(details):
+            details = self._details = details()
+        return details
+
+    @details.setter
+    def details(self, value: Optional[dict]) -> None:
+        self._details = value
 
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            (self.validator_name, self.is_valid, self.confidence, self.message, self.details)
+            == (other.validator_name, other.is_valid, other.confidence, other.message, other.details)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationResult(validator_name={self.validator_name!r}, is_valid={self.is_valid!r}, "
+            f"confidence={self.confidence!r}, message={self.message!r}, details={self.details!r})"
+        )
+
+    @classmethod
+    def from_json_details(
+        cls,
+        validator_name: str,
+        is_valid: bool,
+        confidence: float,
+        message: str,
+        details_json: Optional[Union[bytes, str]]
+    ) -> "ValidationResult":
+        """
+        Maak een resultaat met details als JSON, die pas geparsed worden als iemand ze leest
+
+        Args:
+            validator_name: Naam van de validator
+            is_valid: Of de validatie geslaagd is
+            confidence: Confidence score (0.0 - 1.0)
+            message: Feedback bericht voor gebruiker
+            details_json: Details als JSON bytes/string (leeg of None = geen details)
+
+        Returns:
+            ValidationResult object
+        """
+        result = cls(validator_name, is_valid, confidence, message)
+        result._details = details_json or None
+        return result
 
-@dataclass
+    @classmethod
+    def from_details_factory(
+        cls,
+        validator_name: str,
+        is_valid: bool,
+        confidence: float,
+        message: str,
+        details_fn: Callable[[], dict]
+    ) -> "ValidationResult":
+        """
+        Maak een resultaat waarvan de details pas opgebouwd worden als iemand ze leest
+
+        Args:
+            validator_name: Naam van de validator
+            is_valid: Of de validatie geslaagd is
+            confidence: Confidence score (0.0 - 1.0)
+            message: Feedback bericht voor gebruiker
+            details_fn: Functie zonder argumenten die de details dict teruggeeft
+
+        Returns:
+            ValidationResult object
+        """
+        result = cls(validator_name, is_valid, confidence, message)
+        result._details = details_fn
+        return result
+
+
+@dataclass(slots=True)
 class Photo:
     """
     Domain model voor een pasfoto
@@ -60,6 +157,64 @@ class Photo:
     validation_results: list[ValidationResult] = field(default_factory=list)
     file_path: Optional[str] = None
     metadata: dict = field(default_factory=dict)
+    # lopende totalen, worden bijgewerkt in add_validation_result
+    _confidence_sum: float = field(default=0.0, init=False, repr=False, compare=False)
+    _failed: list[ValidationResult] = field(default_factory=list, init=False, repr=False, compare=False)
+    # afgeleide data van image_data (grayscale, face detection), zie get_cached
+    _cache: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Bereken de totalen voor meegegeven validatie resultaten"""
+        self._confidence_sum = sum(r.confidence for r in self.validation_results)
+        self._failed = [r for r in self.validation_results if not r.is_valid]
+
+    @property
+    def is_grayscale(self) -> bool:
+        """Of de image data grayscale (2-D) is in plaats van BGR"""
+        return self.image_data is not None and self.image_data.ndim == 2
+
+    def reset(self, image_data: Optional[np.ndarray]) -> None:
+        """
+        Hergebruik dit object voor een nieuwe foto
+
+        Args:
+            image_data: Nieuwe image data
+        """
+        self.image_data = image_data
+        self.status = PhotoStatus.PENDING
+        # in place leegmaken zodat de lijst zelf hergebruikt wordt
+        self.validation_results.clear()
+        self._confidence_sum = 0.0
+        self._failed.clear()
+        self._cache.clear()
+
+    def get_cached(self, key):
+        """
+        Haal eerder berekende data van deze image op
+
+        Een waarde hoort bij het image_data object waarvoor hij is opgeslagen;
+        na het vervangen van image_data geeft dit dus None.
+
+        Args:
+            key: Naam van de data (bv. "gray")
+
+        Returns:
+            Opgeslagen waarde, of None als die er (voor deze image) niet is
+        """
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] is self.image_data:
+            return entry[1]
+        return None
+
+    def set_cached(self, key, value) -> None:
+        """
+        Bewaar afgeleide data van de huidige image (zie get_cached)
+
+        Args:
+            key: Naam van de data
+            value: Waarde om te bewaren
+        """
+        self._cache[key] = (self.image_data, value)
 
     def add_validation_result(self, result: ValidationResult) -> None:
         """
@@ -69,6 +224,9 @@ class Photo:
             result: ValidationResult object
         """
         self.validation_results.append(result)
+        self._confidence_sum += result.confidence
+        if not result.is_valid:
+            self._failed.append(result)
 
     def is_valid(self) -> bool:
         """
@@ -77,9 +235,7 @@ class Photo:
         Returns:
             True als alle validaties geslaagd zijn
         """
-        if not self.validation_results:
-            return False
-        return all(result.is_valid for result in self.validation_results)
+        return bool(self.validation_results) and not self._failed
 
     def get_overall_confidence(self) -> float:
         """
@@ -90,7 +246,7 @@ class Photo:
         """
         if not self.validation_results:
             return 0.0
-        return sum(r.confidence for r in self.validation_results) / len(self.validation_results)
+        return self._confidence_sum / len(self.validation_results)
 
     def get_failed_validations(self) -> list[ValidationResult]:
         """
@@ -99,7 +255,7 @@ class Photo:
         Returns:
             Lijst met gefaalde ValidationResult objecten
         """
-        return [r for r in self.validation_results if not r.is_valid]
+        return list(self._failed)
 
     def update_status(self) -> None:
         """Update status gebaseerd op validatie resultaten"""
@@ -111,7 +267,7 @@ class Photo:
             self.status = PhotoStatus.PENDING
 
 
-@dataclass
+@dataclass(slots=True)
 class FaceDetectionResult:
     """
     Resultaat van gezichtsdetectie
@@ -2,13 +2,17 @@
 Repository interface en implementatie voor photo storage
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 import sqlite3
 import json
 import logging
 import os
-import uuid
+import struct
+import threading
+import time
+from uuid import uuid4
 import numpy as np
 
 from ..models.photo import Photo, PhotoStatus, ValidationResult
@@ -16,30 +20,33 @@ from ..models.photo import Photo, PhotoStatus, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+# little-endian float32, voor confidence waardes die als BLOB zijn opgeslagen
+_FLOAT_LE = struct.Struct('<f')
 
-def convert_numpy_types(obj):
+
+def numpy_json_default(obj):
     """
     Converteer numpy types naar standaard Python types voor JSON serialisatie
 
+    Wordt als default= aan json.dumps meegegeven, dus alleen aangeroepen voor
+    waardes die de (C) encoder zelf niet kent; gewone dicts, lists en Python
+    getallen worden niet meer recursief in Python nagelopen.
+
     Args:
-        obj: Object om te converteren
+        obj: Object dat json niet zelf kan serialiseren
 
     Returns:
-        Geconverteerd object
+        JSON serialiseerbaar object
     """
-    if isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, (np.integer, np.int32, np.int64)):
+    if isinstance(obj, np.integer):
         return int(obj)
-    elif isinstance(obj, (np.floating, np.float32, np.float64)):
+    elif isinstance(obj, np.floating):
         return float(obj)
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, np.bool_):
         return bool(obj)
-    return obj
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class IPhotoRepository(ABC):
@@ -88,6 +95,31 @@ class IPhotoRepository(ABC):
         """
         pass
 
+    def get_file_info(self, photo_id: str) -> Optional[Tuple[Optional[str], PhotoStatus]]:
+        """
+        Haal alleen het bestandspad en de status van een photo op
+
+        Args:
+            photo_id: ID van photo
+
+        Returns:
+            (file_path, status) of None als niet gevonden (standaard via get_by_id)
+        """
+        photo = self.get_by_id(photo_id)
+        return (photo.file_path, photo.status) if photo else None
+
+    def iter_all(self, limit: Optional[int] = None) -> Iterator[Photo]:
+        """
+        Loop over alle photos zonder ze allemaal tegelijk in het geheugen te houden
+
+        Args:
+            limit: Optionele limiet op aantal resultaten
+
+        Returns:
+            Iterator met Photo objecten (standaard via get_all)
+        """
+        return iter(self.get_all(limit))
+
     @abstractmethod
     def get_by_status(self, status: PhotoStatus) -> List[Photo]:
         """
@@ -114,12 +146,51 @@ class IPhotoRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def delete_older_than(
+        self,
+        cutoff: datetime,
+        exclude_status: Optional[PhotoStatus] = None
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Verwijder alle photos van voor een bepaald moment
+
+        Args:
+            cutoff: Photos met een timestamp voor dit moment worden verwijderd
+            exclude_status: Photos met deze status blijven altijd staan
+
+        Returns:
+            Lijst met (id, file_path) van de verwijderde photos
+        """
+        pass
+
+    def close(self) -> None:
+        """Geef resources zoals database connecties vrij (standaard niks te doen)"""
+        pass
+
 
 class SQLitePhotoRepository(IPhotoRepository):
     """
     SQLite implementatie van photo repository
     """
 
+    # hoe lang get_statistics zijn resultaat hergebruikt (seconden)
+    _STATS_TTL = 2.0
+
+    # Instellingen voor elke connectie: WAL zodat lezers en schrijvers elkaar
+    # niet blokkeren, en geen fsync per commit (synchronous=NORMAL).
+    # foreign_keys staat in SQLite standaard uit, zonder deze pragma doet
+    # ON DELETE CASCADE op validation_results niks
+    _PRAGMAS = '''
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA cache_size=-65536;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA mmap_size=268435456;
+        PRAGMA busy_timeout=60000;
+        PRAGMA foreign_keys=ON;
+    '''
+
     def __init__(self, db_path: str = "data/photos.db"):
         """
         Initialiseer SQLite repository
@@ -128,14 +199,82 @@ class SQLitePhotoRepository(IPhotoRepository):
             db_path: Pad naar SQLite database bestand
         """
         self._db_path = db_path
+
+        # één connectie per thread die de hele levensduur van de repository
+        # meegaat, in plaats van een nieuwe connectie per aanroep
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        # (tijdstip, statistieken) van de laatste get_statistics, zie _STATS_TTL
+        self._stats_cache: Tuple[float, Optional[dict]] = (0.0, None)
+
         self._ensure_database_exists()
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Haal de connectie van de huidige thread op (wordt de eerste keer geopend)
+
+        Returns:
+            sqlite3 Connection met de PRAGMA instellingen toegepast
+        """
+        conn = getattr(self._local, 'conn', None)
+
+        if conn is None:
+            # check_same_thread=False zodat close() alle connecties kan sluiten;
+            # verder gebruikt elke thread alleen zijn eigen connectie.
+            # isolation_level=None: transacties beginnen we zelf (zie _transaction)
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, isolation_level=None)
+            conn.executescript(self._PRAGMAS)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+
+            with self._connections_lock:
+                self._connections.append(conn)
+
+        return conn
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        """
+        Voer alle writes in het with-blok uit in één transactie
+
+        BEGIN IMMEDIATE pakt de write lock meteen, zodat er geen deadlock
+        ontstaat als een andere connectie tegelijk wil schrijven.
+
+        Args:
+            conn: Connectie om de transactie op te doen
+        """
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        # de data is veranderd, dus de gecachte statistieken kloppen niet meer
+        self._stats_cache = (0.0, None)
+
+    def close(self) -> None:
+        """Sluit alle connecties (laat SQLite eerst de query planner statistieken bijwerken)"""
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+            self._local = threading.local()
+
+        for conn in connections:
+            try:
+                conn.execute('PRAGMA optimize')
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error closing connection: {e}", exc_info=True)
+
     def _ensure_database_exists(self) -> None:
         """Maak database en tables aan als ze niet bestaan"""
         # Zorg dat directory bestaat
         os.makedirs(os.path.dirname(self._db_path), exist_ok=True)
 
-        conn = sqlite3.connect(self._db_path)
+        conn = self._connect()
         cursor = conn.cursor()
 
         # Create photos table
@@ -145,7 +284,7 @@ class SQLitePhotoRepository(IPhotoRepository):
                 timestamp TEXT NOT NULL,
                 status TEXT NOT NULL,
                 file_path TEXT,
-                metadata TEXT,
+                metadata BLOB,
                 overall_confidence REAL,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP
             )
@@ -160,74 +299,49 @@ class SQLitePhotoRepository(IPhotoRepository):
                 is_valid INTEGER NOT NULL,
                 confidence REAL NOT NULL,
                 message TEXT NOT NULL,
-                details TEXT,
+                details BLOB,
                 FOREIGN KEY (photo_id) REFERENCES photos(id) ON DELETE CASCADE
             )
         ''')
 
         # Create indices
+        # (status, overall_confidence) dekt zowel filteren op status als de
+        # GROUP BY in get_statistics, dus de oude status-only index is overbodig
+        cursor.execute('DROP INDEX IF EXISTS idx_photos_status')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_photos_status_confidence
+            ON photos(status, overall_confidence)
+        ''')
+
+        # get_by_status filtert op status en sorteert op timestamp
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_photos_status
-            ON photos(status)
+            CREATE INDEX IF NOT EXISTS idx_photos_status_timestamp
+            ON photos(status, timestamp DESC)
         ''')
 
+        # get_all sorteert alleen op timestamp
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_photos_timestamp
             ON photos(timestamp DESC)
         ''')
 
+        # validation results worden altijd per photo opgehaald of verwijderd
+        # (JOIN, DELETE in _save_batch en de ON DELETE CASCADE)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_validation_results_photo_id
+            ON validation_results(photo_id)
+        ''')
+
         conn.commit()
-        conn.close()
 
         logger.info(f"Database initialized at {self._db_path}")
 
     def save(self, photo: Photo) -> bool:
         """Sla photo op in database"""
         try:
-            # Generate ID if not set
-            if photo.id is None:
-                photo.id = str(uuid.uuid4())
-
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-
-            # Insert photo
-            cursor.execute('''
-                INSERT OR REPLACE INTO photos
-                (id, timestamp, status, file_path, metadata, overall_confidence)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                photo.id,
-                photo.timestamp.isoformat(),
-                photo.status.value,
-                photo.file_path,
-                json.dumps(convert_numpy_types(photo.metadata)),
-                photo.get_overall_confidence()
-            ))
-
-            # Delete existing validation results (in case of update)
-            cursor.execute(
-                'DELETE FROM validation_results WHERE photo_id = ?',
-                (photo.id,)
-            )
-
-            # Insert validation results
-            for result in photo.validation_results:
-                cursor.execute('''
-                    INSERT INTO validation_results
-                    (photo_id, validator_name, is_valid, confidence, message, details)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    photo.id,
-                    result.validator_name,
-                    1 if result.is_valid else 0,
-                    result.confidence,
-                    result.message,
-                    json.dumps(convert_numpy_types(result.details)) if result.details else None
-                ))
-
-            conn.commit()
-            conn.close()
+            # zelfde pad als save_photos: executemany voor de validation results
+            # en alles in één transactie (ook rollback bij een fout)
+            self._save_batch(self._connect(), [photo])
 
             logger.info(f"Photo {photo.id} saved successfully")
             return True
@@ -236,134 +350,285 @@ class SQLitePhotoRepository(IPhotoRepository):
             logger.error(f"Error saving photo: {e}", exc_info=True)
             return False
 
-    def get_by_id(self, photo_id: str) -> Optional[Photo]:
-        """Haal photo op via ID"""
+    def save_photos(self, photos: Iterable[Photo], batch_size: Optional[int] = 1000) -> int:
+        """
+        Sla veel photos in één keer op
+
+        Alle rijen gaan via executemany in één transactie per batch, in plaats
+        van een transactie per photo zoals bij save().
+
+        Args:
+            photos: Photo objecten om op te slaan
+            batch_size: Aantal photos per transactie (None = alles in één
+                        transactie, dus alles of niets)
+
+        Returns:
+            Aantal opgeslagen photos (bij een fout: de photos uit de batches die
+            al gecommit waren)
+        """
+        count = 0
         try:
-            conn = sqlite3.connect(self._db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            conn = self._connect()
 
-            # Get photo metadata
-            cursor.execute(
-                'SELECT * FROM photos WHERE id = ?',
-                (photo_id,)
-            )
-            row = cursor.fetchone()
+            batch = []
+            for photo in photos:
+                batch.append(photo)
+                if batch_size is not None and len(batch) >= batch_size:
+                    self._save_batch(conn, batch)
+                    count += len(batch)
+                    batch = []
+
+            if batch:
+                self._save_batch(conn, batch)
+                count += len(batch)
+
+            # Na een bulk load de statistieken voor de query planner bijwerken
+            conn.execute('ANALYZE')
 
-            if row is None:
-                return None
+            logger.info(f"Saved {count} photos in batch")
+            return count
 
-            # Get validation results
-            cursor.execute(
-                'SELECT * FROM validation_results WHERE photo_id = ?',
-                (photo_id,)
+        except Exception as e:
+            logger.error(f"Error saving photos: {e}", exc_info=True)
+            return count
+
+    def _save_batch(self, conn: sqlite3.Connection, photos: List[Photo]) -> None:
+        """
+        Sla een batch photos op in één transactie
+
+        Args:
+            conn: Open database connectie
+            photos: Photo objecten om op te slaan
+        """
+        for photo in photos:
+            if photo.id is None:
+                # hex: 32 tekens zonder streepjes, korter in de primary key index
+                photo.id = uuid4().hex
+
+        # metadata en details gaan als UTF-8 bytes (BLOB) de database in, dan
+        # hoeft sqlite3 ze bij opslaan en ophalen niet als TEXT te coderen;
+        # json.loads accepteert zowel bytes als de TEXT van oudere databases
+        photo_rows = [
+            (
+                photo.id,
+                photo.timestamp.isoformat(),
+                photo.status.value,
+                photo.file_path,
+                json.dumps(photo.metadata, default=numpy_json_default).encode(),
+                float(photo.get_overall_confidence())
             )
-            validation_rows = cursor.fetchall()
-
-            conn.close()
-
-            # Reconstruct photo (zonder image_data - moet apart geladen worden)
-            photo = Photo(
-                image_data=None,  # Image data moet geladen worden via file_path
-                timestamp=datetime.fromisoformat(row['timestamp']),
-                id=row['id'],
-                status=PhotoStatus(row['status']),
-                file_path=row['file_path'],
-                metadata=json.loads(row['metadata']) if row['metadata'] else {}
+            for photo in photos
+        ]
+
+        result_rows = [
+            (
+                photo.id,
+                result.validator_name,
+                1 if result.is_valid else 0,
+                # float() zodat numpy floats als REAL en niet als BLOB opgeslagen worden
+                float(result.confidence),
+                result.message,
+                json.dumps(result.details, default=numpy_json_default).encode() if result.details else None
+            )
+            for photo in photos
+            for result in photo.validation_results
+        ]
+
+        with self._transaction(conn):
+            conn.executemany('''
+                INSERT OR REPLACE INTO photos
+                (id, timestamp, status, file_path, metadata, overall_confidence)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', photo_rows)
+
+            conn.executemany(
+                'DELETE FROM validation_results WHERE photo_id = ?',
+                [(photo.id,) for photo in photos]
             )
 
-            # Add validation results
-            for vr in validation_rows:
-                # Converteer confidence naar float (kan bytes zijn door SQLite type affinity)
-                confidence_value = vr['confidence']
-                if isinstance(confidence_value, bytes):
-                    # Parse bytes als little-endian float
-                    import struct
-                    confidence_value = struct.unpack('<f', confidence_value)[0]
-                else:
-                    confidence_value = float(confidence_value)
-
-                result = ValidationResult(
-                    validator_name=vr['validator_name'],
-                    is_valid=bool(vr['is_valid']),
-                    confidence=confidence_value,
-                    message=vr['message'],
-                    details=json.loads(vr['details']) if vr['details'] else None
-                )
-                photo.add_validation_result(result)
-
-            return photo
+            conn.executemany('''
+                INSERT INTO validation_results
+                (photo_id, validator_name, is_valid, confidence, message, details)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', result_rows)
+
+    # photos met hun validation results in één query; de subquery doet filter,
+    # sortering en limit op photos zodat LIMIT niet over de JOIN rijen telt
+    _SELECT_PHOTOS_WITH_RESULTS = '''
+        SELECT p.id, p.timestamp, p.status, p.file_path, p.metadata,
+               v.validator_name, v.is_valid, v.confidence, v.message, v.details
+        FROM (SELECT * FROM photos {where} ORDER BY timestamp DESC {limit}) p
+        LEFT JOIN validation_results v ON v.photo_id = p.id
+        ORDER BY p.timestamp DESC, p.id, v.id
+    '''
+
+    def get_by_id(self, photo_id: str) -> Optional[Photo]:
+        """Haal photo op via ID"""
+        try:
+            photos = self._query_photos('WHERE id = ?', (photo_id,))
+            return photos[0] if photos else None
 
         except Exception as e:
             logger.error(f"Error getting photo {photo_id}: {e}", exc_info=True)
             return None
 
-    def get_all(self, limit: Optional[int] = None) -> List[Photo]:
-        """Haal alle photos op"""
+    def get_file_info(self, photo_id: str) -> Optional[Tuple[Optional[str], PhotoStatus]]:
+        """Haal pad en status op met één kleine query (geen JOIN, geen JSON)"""
         try:
-            conn = sqlite3.connect(self._db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            query = 'SELECT id FROM photos ORDER BY timestamp DESC'
-            if limit:
-                query += f' LIMIT {limit}'
+            row = self._connect().execute(
+                'SELECT file_path, status FROM photos WHERE id = ?', (photo_id,)
+            ).fetchone()
+            return (row['file_path'], PhotoStatus(row['status'])) if row else None
 
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            conn.close()
+        except Exception as e:
+            logger.error(f"Error getting file info for {photo_id}: {e}", exc_info=True)
+            return None
 
-            # Load each photo
-            photos = []
-            for row in rows:
-                photo = self.get_by_id(row['id'])
-                if photo:
-                    photos.append(photo)
+    def get_all(self, limit: Optional[int] = None) -> List[Photo]:
+        """Haal alle photos op"""
+        return list(self.iter_all(limit))
 
-            return photos
+    def iter_all(self, limit: Optional[int] = None) -> Iterator[Photo]:
+        """Loop over alle photos, de rijen worden per batch uit de database gehaald"""
+        try:
+            yield from self._iter_photos(limit=limit)
 
         except Exception as e:
             logger.error(f"Error getting all photos: {e}", exc_info=True)
-            return []
 
     def get_by_status(self, status: PhotoStatus) -> List[Photo]:
         """Haal photos op via status"""
         try:
-            conn = sqlite3.connect(self._db_path)
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            return self._query_photos('WHERE status = ?', (status.value,))
 
-            cursor.execute(
-                'SELECT id FROM photos WHERE status = ? ORDER BY timestamp DESC',
-                (status.value,)
-            )
-            rows = cursor.fetchall()
-            conn.close()
+        except Exception as e:
+            logger.error(f"Error getting photos by status: {e}", exc_info=True)
+            return []
+
+    # aantal rijen dat _iter_photos per keer uit de cursor haalt
+    _FETCH_SIZE = 512
 
-            # Load each photo
-            photos = []
+    def _query_photos(
+        self,
+        where: str = '',
+        params: tuple = (),
+        limit: Optional[int] = None
+    ) -> List[Photo]:
+        """
+        Haal photos met validation results op in één JOIN query
+
+        Args:
+            where: WHERE clause op de photos tabel (met ? placeholders)
+            params: Parameters voor de WHERE clause
+            limit: Optionele limiet op aantal photos
+
+        Returns:
+            Lijst met Photo objecten, nieuwste eerst
+        """
+        return list(self._iter_photos(where, params, limit))
+
+    def _iter_photos(
+        self,
+        where: str = '',
+        params: tuple = (),
+        limit: Optional[int] = None
+    ) -> Iterator[Photo]:
+        """
+        Zelfde als _query_photos, maar geeft de photos één voor één terug
+
+        Args:
+            where: WHERE clause op de photos tabel (met ? placeholders)
+            params: Parameters voor de WHERE clause
+            limit: Optionele limiet op aantal photos
+
+        Returns:
+            Iterator met Photo objecten, nieuwste eerst
+        """
+        # limit als parameter binden (nooit in de SQL tekst), zodat elke limit
+        # dezelfde query tekst geeft en sqlite3 het prepared statement uit zijn cache hergebruikt
+        if limit:
+            query = self._SELECT_PHOTOS_WITH_RESULTS.format(where=where, limit='LIMIT ?')
+            params = params + (int(limit),)
+        else:
+            query = self._SELECT_PHOTOS_WITH_RESULTS.format(where=where, limit='')
+
+        cursor = self._connect().execute(query, params)
+
+        photo = None
+        while True:
+            rows = cursor.fetchmany(self._FETCH_SIZE)
+            if not rows:
+                break
+
+            # rijen staan gegroepeerd per photo, dus een nieuwe photo begint als het id
+            # verandert (een photo kan over twee batches verdeeld zijn)
             for row in rows:
-                photo = self.get_by_id(row['id'])
-                if photo:
-                    photos.append(photo)
+                if photo is None or photo.id != row['id']:
+                    if photo is not None:
+                        yield photo
+                    photo = self._row_to_photo(row)
 
-            return photos
+                # LEFT JOIN: photo zonder validation results geeft één rij met NULLs
+                if row['validator_name'] is not None:
+                    photo.add_validation_result(self._row_to_validation_result(row))
 
-        except Exception as e:
-            logger.error(f"Error getting photos by status: {e}", exc_info=True)
-            return []
+        if photo is not None:
+            yield photo
+
+    def _row_to_photo(self, row: sqlite3.Row) -> Photo:
+        """
+        Reconstrueer een photo uit een database rij (zonder validation results)
+
+        Args:
+            row: Rij met de kolommen van de photos tabel
+
+        Returns:
+            Photo object zonder image_data (moet apart geladen worden via file_path)
+        """
+        return Photo(
+            image_data=None,  # Image data moet geladen worden via file_path
+            timestamp=datetime.fromisoformat(row['timestamp']),
+            id=row['id'],
+            status=PhotoStatus(row['status']),
+            file_path=row['file_path'],
+            metadata=json.loads(row['metadata']) if row['metadata'] else {}
+        )
+
+    def _row_to_validation_result(self, row: sqlite3.Row) -> ValidationResult:
+        """
+        Reconstrueer een validation result uit een database rij
+
+        Args:
+            row: Rij met de kolommen van de validation_results tabel
+
+        Returns:
+            ValidationResult object
+        """
+        # Converteer confidence naar float (kan bytes zijn in oudere databases,
+        # waar numpy float32 waardes als BLOB zijn opgeslagen)
+        confidence_value = row['confidence']
+        if isinstance(confidence_value, bytes):
+            confidence_value = _FLOAT_LE.unpack(confidence_value)[0]
+        else:
+            confidence_value = float(confidence_value)
+
+        # details worden pas geparsed als iemand ze echt leest
+        return ValidationResult.from_json_details(
+            validator_name=row['validator_name'],
+            is_valid=bool(row['is_valid']),
+            confidence=confidence_value,
+            message=row['message'],
+            details_json=row['details']
+        )
 
     def delete(self, photo_id: str) -> bool:
         """Verwijder photo"""
         try:
-            conn = sqlite3.connect(self._db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM photos WHERE id = ?', (photo_id,))
+            conn = self._connect()
+            with self._transaction(conn):
+                cursor = conn.execute('DELETE FROM photos WHERE id = ?', (photo_id,))
 
-            conn.commit()
             deleted = cursor.rowcount > 0
-            conn.close()
 
             if deleted:
                 logger.info(f"Photo {photo_id} deleted")
@@ -376,40 +641,87 @@ class SQLitePhotoRepository(IPhotoRepository):
             logger.error(f"Error deleting photo {photo_id}: {e}", exc_info=True)
             return False
 
+    def delete_older_than(
+        self,
+        cutoff: datetime,
+        exclude_status: Optional[PhotoStatus] = None
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Verwijder alle photos van voor een bepaald moment in één DELETE
+
+        Args:
+            cutoff: Photos met een timestamp voor dit moment worden verwijderd
+            exclude_status: Photos met deze status blijven altijd staan
+
+        Returns:
+            Lijst met (id, file_path) van de verwijderde photos, zodat de
+            bestanden opgeruimd kunnen worden
+        """
+        try:
+            where = 'WHERE timestamp < ?'
+            params: tuple = (cutoff.isoformat(),)
+            if exclude_status is not None:
+                where += ' AND status != ?'
+                params += (exclude_status.value,)
+
+            conn = self._connect()
+            # ophalen en verwijderen in dezelfde transactie, zodat er geen
+            # photo tussendoor bij kan komen die we wel verwijderen maar niet teruggeven
+            with self._transaction(conn):
+                deleted = [
+                    (row['id'], row['file_path'])
+                    for row in conn.execute(f'SELECT id, file_path FROM photos {where}', params)
+                ]
+                conn.execute(f'DELETE FROM photos {where}', params)
+
+            logger.info(f"Deleted {len(deleted)} photos older than {cutoff}")
+            return deleted
+
+        except Exception as e:
+            logger.error(f"Error deleting photos older than {cutoff}: {e}", exc_info=True)
+            return []
+
     def get_statistics(self) -> dict:
         """
         Haal statistieken op
 
+        Het resultaat wordt _STATS_TTL seconden gecached (de GUI vraagt dit vaak op),
+        en na elke write via deze repository opnieuw berekend.
+
         Returns:
             Dictionary met statistieken
         """
+        cached_at, stats = self._stats_cache
+        if stats is not None and time.monotonic() - cached_at < self._STATS_TTL:
+            return {**stats, "by_status": dict(stats["by_status"])}
+
         try:
-            conn = sqlite3.connect(self._db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
-            # Total count
-            cursor.execute('SELECT COUNT(*) FROM photos')
-            total = cursor.fetchone()[0]
-
-            # Count by status
+            # Eén index scan voor aantallen en confidence per status
             cursor.execute('''
-                SELECT status, COUNT(*) as count
+                SELECT status, COUNT(*), SUM(overall_confidence), COUNT(overall_confidence)
                 FROM photos
                 GROUP BY status
             ''')
-            status_counts = {row[0]: row[1] for row in cursor.fetchall()}
+            rows = cursor.fetchall()
 
-            # Average confidence
-            cursor.execute('SELECT AVG(overall_confidence) FROM photos')
-            avg_confidence = cursor.fetchone()[0] or 0.0
+            status_counts = {row[0]: row[1] for row in rows}
+            total = sum(status_counts.values())
 
-            conn.close()
+            # Gemiddelde over alle photos (zelfde als AVG: NULL telt niet mee)
+            confidence_sum = sum(row[2] or 0.0 for row in rows)
+            confidence_count = sum(row[3] for row in rows)
+            avg_confidence = confidence_sum / confidence_count if confidence_count else 0.0
 
-            return {
+            stats = {
                 "total_photos": total,
                 "by_status": status_counts,
                 "average_confidence": avg_confidence
             }
+            self._stats_cache = (time.monotonic(), stats)
+            return {**stats, "by_status": dict(status_counts)}
 
         except Exception as e:
             logger.error(f"Error getting statistics: {e}", exc_info=True)
@@ -3,6 +3,7 @@ Camera service voor foto capture
 """
 import cv2
 import numpy as np
+import threading
 from typing import Optional, Tuple
 from datetime import datetime
 import logging
@@ -20,6 +21,10 @@ class CameraService:
     Handles camera initialization, frame capture, en resource management
     """
 
+    # aantal frame buffers dat om de beurt hergebruikt wordt; een frame blijft
+    # zo nog even geldig terwijl de GUI thread hem tekent
+    _FRAME_BUFFERS = 3
+
     def __init__(self, camera_index: int = 0):
         """
         Initialiseer camera service
@@ -30,6 +35,15 @@ class CameraService:
         self._camera_index = camera_index
         self._camera: Optional[cv2.VideoCapture] = None
         self._is_initialized = False
+        # de preview thread en de GUI thread lezen allebei frames
+        self._lock = threading.Lock()
+        # laatst gelezen frame en de RGB versie ervan (één conversie per frame)
+        self._last_frame: Optional[np.ndarray] = None
+        self._rgb_buffer: Optional[np.ndarray] = None
+        self._rgb_frame_stale = True
+        # vooraf gealloceerde buffers voor retrieve(), zie get_frame
+        self._frame_buffers: list = [None] * self._FRAME_BUFFERS
+        self._frame_index = 0
 
     def initialize(self) -> bool:
         """
@@ -50,6 +64,13 @@ class CameraService:
             self._camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
             self._camera.set(cv2.CAP_PROP_FPS, 30)
 
+            # alloceer de frame buffers op de resolutie die de camera echt geeft
+            width = int(self._camera.get(cv2.CAP_PROP_FRAME_WIDTH)) or 1280
+            height = int(self._camera.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 720
+            self._frame_buffers = [
+                np.empty((height, width, 3), dtype=np.uint8) for _ in range(self._FRAME_BUFFERS)
+            ]
+
             self._is_initialized = True
             logger.info(f"Camera {self._camera_index} initialized successfully")
             return True
@@ -62,6 +83,9 @@ class CameraService:
         """
         Haal een frame op van de camera
 
+        Het frame staat in een hergebruikte buffer en wordt na een paar
+        volgende get_frame() aanroepen overschreven (kopieer hem om hem te bewaren).
+
         Returns:
             Frame als NumPy array, of None bij fout
         """
@@ -70,18 +94,57 @@ class CameraService:
             return None
 
         try:
-            ret, frame = self._camera.read()
-
-            if not ret:
-                logger.warning("Failed to read frame from camera")
-                return None
-
+            with self._lock:
+                # grab + retrieve in plaats van read(), zodat het frame in een
+                # bestaande buffer gedecodeerd wordt in plaats van een nieuwe array
+                if not self._camera.grab():
+                    logger.warning("Failed to grab frame from camera")
+                    return None
+
+                index = (self._frame_index + 1) % self._FRAME_BUFFERS
+                ret, frame = self._camera.retrieve(self._frame_buffers[index])
+
+                if not ret or frame is None:
+                    logger.warning("Failed to read frame from camera")
+                    return None
+
+                # retrieve alloceert zelf als de buffer niet past, onthoud die dan
+                self._frame_buffers[index] = frame
+                self._frame_index = index
+
+            self._last_frame = frame
+            self._rgb_frame_stale = True
             return frame
 
         except Exception as e:
             logger.error(f"Error reading frame: {e}", exc_info=True)
             return None
 
+    def get_rgb_frame(self) -> Optional[np.ndarray]:
+        """
+        Haal de RGB versie van het laatst gelezen frame op
+
+        De conversie gebeurt maar één keer per frame, in een vaste buffer die
+        bij het volgende frame overschreven wordt (kopieer hem als je hem wil bewaren).
+        Na get_preview_with_overlay zit de overlay ook in dit frame.
+        Handig voor FaceDetectionModel.detect_face_rgb.
+
+        Returns:
+            Frame als RGB NumPy array, of None als er nog geen frame is
+        """
+        frame = self._last_frame
+
+        if frame is None:
+            return None
+
+        if self._rgb_frame_stale:
+            if self._rgb_buffer is None or self._rgb_buffer.shape != frame.shape:
+                self._rgb_buffer = np.empty_like(frame)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+            self._rgb_frame_stale = False
+
+        return self._rgb_buffer
+
     def capture_photo(self) -> Optional[Photo]:
         """
         Capture een foto en creëer Photo object
@@ -95,8 +158,9 @@ class CameraService:
             return None
 
         try:
+            # het frame staat in een hergebruikte buffer, de photo krijgt een eigen kopie
             photo = Photo(
-                image_data=frame.copy(),  # Copy to avoid reference issues
+                image_data=frame.copy(),
                 timestamp=datetime.now(),
                 metadata={
                     "camera_index": self._camera_index,
@@ -137,7 +201,8 @@ class CameraService:
     def release(self) -> None:
         """Release camera resources"""
         if self._camera is not None:
-            self._camera.release()
+            with self._lock:
+                self._camera.release()
             self._is_initialized = False
             logger.info("Camera released")
 
@@ -206,6 +271,8 @@ class PhotoBoothCameraService(CameraService):
         """
         Haal preview frame op met overlay
 
+        De overlay wordt direct in de frame buffer getekend, zonder kopie.
+
         Args:
             overlay_type: Type overlay ("guidelines", "face_box", etc.)
 
@@ -227,7 +294,7 @@ class PhotoBoothCameraService(CameraService):
 
     def _add_guidelines_overlay(self, frame: np.ndarray) -> np.ndarray:
         """
-        Voeg richtlijnen overlay toe
+        Voeg richtlijnen overlay toe (tekent in het frame zelf)
 
         Args:
             frame: Input frame
@@ -236,33 +303,32 @@ class PhotoBoothCameraService(CameraService):
             Frame met overlay
         """
         h, w = frame.shape[:2]
-        overlay = frame.copy()
 
         # Teken ovaal voor gezichtspositie
         center = (w // 2, int(h * 0.45))
         axes = (int(w * 0.15), int(h * 0.25))
-        cv2.ellipse(overlay, center, axes, 0, 0, 360, (0, 255, 0), 2)
+        cv2.ellipse(frame, center, axes, 0, 0, 360, (0, 255, 0), 2)
 
         # Teken centrum kruisje
         cross_size = 20
         cv2.line(
-            overlay,
+            frame,
             (w // 2 - cross_size, h // 2),
             (w // 2 + cross_size, h // 2),
             (0, 255, 0), 1
         )
         cv2.line(
-            overlay,
+            frame,
             (w // 2, h // 2 - cross_size),
             (w // 2, h // 2 + cross_size),
             (0, 255, 0), 1
         )
 
-        return overlay
+        return frame
 
     def _add_face_box_overlay(self, frame: np.ndarray) -> np.ndarray:
         """
-        Voeg face box overlay toe
+        Voeg face box overlay toe (tekent in het frame zelf)
 
         Args:
             frame: Input frame
@@ -271,7 +337,6 @@ class PhotoBoothCameraService(CameraService):
             Frame met overlay
         """
         h, w = frame.shape[:2]
-        overlay = frame.copy()
 
         # Teken rechthoek voor gezicht (ideale positie/grootte)
         box_w = int(w * 0.4)
@@ -280,10 +345,10 @@ class PhotoBoothCameraService(CameraService):
         box_y = int(h * 0.15)
 
         cv2.rectangle(
-            overlay,
+            frame,
             (box_x, box_y),
             (box_x + box_w, box_y + box_h),
             (0, 255, 0), 2
         )
 
-        return overlay
+        return frame
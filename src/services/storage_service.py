@@ -4,18 +4,105 @@ Storage service voor foto opslag
 # imports voor bestands operaties en foto opslag
 import os
 import cv2
+import queue
 import logging
-from typing import Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from uuid import uuid4
 from datetime import datetime
 import numpy as np
 
-from ..models.photo import Photo
+from ..models.photo import Photo, PhotoStatus
 from ..repositories.photo_repository import IPhotoRepository, SQLitePhotoRepository
 
 
 logger = logging.getLogger(__name__)
 
 
+def _remove_file(file_path: str) -> bool:
+    """
+    Verwijder een bestand
+
+    Args:
+        file_path: Pad naar het bestand
+
+    Returns:
+        True als verwijderd, False als het bestand niet (meer) bestond
+    """
+    try:
+        os.unlink(file_path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _dir_size(path: str) -> int:
+    """
+    Tel de grootte van alle bestanden onder een directory op
+
+    Loopt met een stack in plaats van recursie door de subdirectories;
+    scandir geeft de stat info van de DirEntry mee, dus per bestand is er
+    hoogstens één extra syscall.
+
+    Args:
+        path: Directory om te tellen
+
+    Returns:
+        Totaal aantal bytes (0 als de directory niet bestaat)
+    """
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    return total
+
+
+def _write_bytes(file_path: str, data) -> None:
+    """
+    Schrijf bytes in één keer naar een bestand
+
+    Args:
+        file_path: Pad naar het bestand
+        data: Bytes (of numpy buffer) om te schrijven
+    """
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data).cast("B")
+        # os.write kan minder schrijven dan gevraagd, dus schrijf de rest erachteraan
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _is_encodable(image_data) -> bool:
+    """
+    Check of een image als jpeg opgeslagen kan worden
+
+    Args:
+        image_data: Image om te checken
+
+    Returns:
+        True voor een niet lege uint8 image met 1, 3 of 4 kanalen
+    """
+    if not isinstance(image_data, np.ndarray) or image_data.size == 0 or image_data.dtype != np.uint8:
+        return False
+    return image_data.ndim == 2 or (image_data.ndim == 3 and image_data.shape[2] in (1, 3, 4))
+
+
 class StorageService:
     """
     Service voor foto opslag (bestanden + metadata)
@@ -23,6 +110,17 @@ class StorageService:
     Combineert file system storage met repository voor metadata
     """
 
+    # aantal threads voor het verwijderen van bestanden in cleanup_old_photos
+    _CLEANUP_WORKERS = 8
+    # kwaliteit 90 zonder huffman optimalisatie: sneller encoden, nauwelijks groter bestand
+    _JPEG_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), 90, int(cv2.IMWRITE_JPEG_OPTIMIZE), 0]
+    # onze eigen jpegs hebben geen EXIF orientatie, dus die hoeft imread niet te zoeken
+    _IMREAD_FLAGS = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+    # aantal photos waarvan pad en status onthouden worden
+    _META_CACHE_SIZE = 256
+    # hoe lang de gemeten directory grootte hergebruikt wordt (seconden)
+    _STATS_TTL = 2.0
+
     def __init__(
         self,
         storage_path: str = "data/photos",
@@ -48,6 +146,26 @@ class StorageService:
         os.makedirs(os.path.join(storage_path, "rejected"), exist_ok=True)
         os.makedirs(os.path.join(storage_path, "pending"), exist_ok=True)
 
+        # jpeg encoden en wegschrijven gebeurt op een eigen thread, zodat
+        # save_photo de camera loop niet blokkeert
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="PhotoWriter", daemon=True)
+        # IDs van photos waarvan het schrijven mislukte, tot de volgende flush()
+        self._failed_writes: List[str] = []
+        self._failed_lock = threading.Lock()
+        self._writer.start()
+
+        # (tijdstip, bytes) van de laatste directory walk; save en delete passen
+        # de grootte aan zodat we niet elke keer opnieuw hoeven te tellen
+        self._size_cache: Tuple[float, Optional[int]] = (0.0, None)
+        self._size_lock = threading.Lock()
+
+        # LRU cache photo id -> (bestandspad, status) van recente photos, zodat
+        # load_photo en delete_photo niet steeds de hele photo hoeven op te halen
+        self._meta_cache: OrderedDict = OrderedDict()
+        self._meta_lock = threading.Lock()
+        self._read_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PhotoReader")
+
         logger.info(f"StorageService initialized with path: {storage_path}")
 
     def save_photo(self, photo: Photo) -> bool:
@@ -61,10 +179,15 @@ class StorageService:
             True als succesvol, False anders
         """
         try:
+            # check eerst of het bestand straks geschreven kan worden, anders
+            # staat er een database rij zonder foto
+            if not _is_encodable(photo.image_data):
+                logger.error(f"Cannot save photo {photo.id}: image data is empty or not encodable")
+                return False
+
             # maak een unieke ID voor de foto als die er nog geen heeft
             if photo.id is None:
-                import uuid
-                photo.id = str(uuid.uuid4())
+                photo.id = uuid4().hex
 
             filename = f"{photo.id}.jpg"
 
@@ -73,25 +196,20 @@ class StorageService:
             status_dir = photo.status.value
             file_path = os.path.join(self._storage_path, status_dir, filename)
 
-            # schrijf de foto naar disk
-            success = cv2.imwrite(file_path, photo.image_data)
-
-            if not success:
-                logger.error(f"Failed to write image to {file_path}")
-                return False
-
             # update het photo object met het pad
             photo.file_path = file_path
 
-            # sla ook de metadata op in de database
+            # sla eerst de metadata op in de database
             success = self._repository.save(photo)
 
             if success:
-                logger.info(f"Photo {photo.id} saved successfully to {file_path}")
+                # het bestand wordt op de achtergrond geschreven, zie flush(); met
+                # een eigen kopie, want de caller mag de image daarna gewoon hergebruiken
+                self._write_queue.put((photo.id, file_path, photo.image_data.copy()))
+                self._remember_meta(photo.id, file_path, photo.status)
+                logger.info(f"Photo {photo.id} queued for writing to {file_path}")
             else:
                 logger.error(f"Failed to save photo metadata for {photo.id}")
-                # als metadata niet gelukt is, gooi dan de foto ook weg
-                os.remove(file_path)
 
             return success
 
@@ -99,6 +217,111 @@ class StorageService:
             logger.error(f"Error saving photo: {e}", exc_info=True)
             return False
 
+    def _write_loop(self) -> None:
+        """Writer thread: encode en schrijf photos uit de queue tot de None sentinel"""
+        while True:
+            item = self._write_queue.get()
+            try:
+                if item is None:
+                    return
+                photo_id, file_path, image_data = item
+                try:
+                    success, buffer = cv2.imencode(".jpg", image_data, self._JPEG_PARAMS)
+                    if not success:
+                        raise ValueError("imencode failed")
+                    existed = os.path.exists(file_path)
+                    _write_bytes(file_path, buffer)
+                except Exception as e:
+                    logger.error(f"Error writing image for photo {photo_id}: {e}", exc_info=True)
+                    self._rollback_write(photo_id, file_path)
+                    continue
+                # een overschreven bestand had al een grootte, dan maar opnieuw tellen
+                self._update_size_cache(None if existed else buffer.size)
+                logger.debug(f"Image written to {file_path}")
+            except Exception as e:
+                logger.error(f"Error in photo writer: {e}", exc_info=True)
+            finally:
+                self._write_queue.task_done()
+
+    def _rollback_write(self, photo_id: str, file_path: str) -> None:
+        """
+        Ruim een photo op waarvan het bestand niet geschreven kon worden
+
+        Verwijdert een eventueel half geschreven bestand en de database rij, zodat
+        er geen metadata zonder foto achterblijft. flush() geeft het ID terug.
+
+        Args:
+            photo_id: ID van photo
+            file_path: Pad waar het bestand had moeten staan
+        """
+        _remove_file(file_path)
+        self._repository.delete(photo_id)
+        self._forget_meta(photo_id)
+        self._update_size_cache(None)
+        with self._failed_lock:
+            self._failed_writes.append(photo_id)
+
+    def _update_size_cache(self, delta: Optional[int]) -> None:
+        """
+        Pas de gecachte directory grootte aan
+
+        Args:
+            delta: Aantal bytes erbij (negatief = eraf), of None om de cache te legen
+        """
+        with self._size_lock:
+            cached_at, size = self._size_cache
+            if delta is None or size is None:
+                self._size_cache = (0.0, None)
+            else:
+                self._size_cache = (cached_at, size + delta)
+
+    def _get_meta(self, photo_id: str) -> Optional[Tuple[Optional[str], PhotoStatus]]:
+        """
+        Haal (bestandspad, status) op, uit de cache of met een kleine query
+
+        Args:
+            photo_id: ID van photo
+
+        Returns:
+            (file_path, status) of None als de photo niet bestaat
+        """
+        with self._meta_lock:
+            meta = self._meta_cache.get(photo_id)
+            if meta is not None:
+                self._meta_cache.move_to_end(photo_id)
+                return meta
+
+        meta = self._repository.get_file_info(photo_id)
+        if meta is not None:
+            self._remember_meta(photo_id, *meta)
+        return meta
+
+    def _remember_meta(self, photo_id: str, file_path: Optional[str], status: PhotoStatus) -> None:
+        """Zet (bestandspad, status) in de cache, de oudste valt eruit als hij vol is"""
+        with self._meta_lock:
+            self._meta_cache[photo_id] = (file_path, status)
+            self._meta_cache.move_to_end(photo_id)
+            if len(self._meta_cache) > self._META_CACHE_SIZE:
+                self._meta_cache.popitem(last=False)
+
+    def _forget_meta(self, photo_id: str) -> None:
+        """Haal een photo uit de cache"""
+        with self._meta_lock:
+            self._meta_cache.pop(photo_id, None)
+
+    def flush(self) -> List[str]:
+        """
+        Wacht tot alle photos in de queue naar disk geschreven zijn
+
+        Returns:
+            IDs van photos die sinds de vorige flush() niet geschreven konden
+            worden; die zijn ook uit de repository verwijderd
+        """
+        self._write_queue.join()
+        with self._failed_lock:
+            failed, self._failed_writes = self._failed_writes, []
+        return failed
+
     def load_photo(self, photo_id: str) -> Optional[Photo]:
         """
         Laad photo (metadata + bestand)
@@ -110,7 +333,18 @@ class StorageService:
             Photo object of None als niet gevonden
         """
         try:
-            # haal eerst de metadata op uit de database
+            # bestanden die nog in de queue staan moeten eerst op disk staan
+            self._write_queue.join()
+
+            # decodeer de jpeg alvast op de achtergrond terwijl de validation
+            # results uit de database komen (imread laat de GIL los)
+            meta = self._get_meta(photo_id)
+            cached_path = meta[0] if meta else None
+            pending_read = None
+            if cached_path:
+                pending_read = self._read_executor.submit(cv2.imread, cached_path, self._IMREAD_FLAGS)
+
+            # haal de metadata op uit de database
             photo = self._repository.get_by_id(photo_id)
 
             if photo is None:
@@ -119,7 +353,11 @@ class StorageService:
 
             # laad dan de echte foto van disk
             if photo.file_path and os.path.exists(photo.file_path):
-                image_data = cv2.imread(photo.file_path)
+                if pending_read is not None and photo.file_path == cached_path:
+                    image_data = pending_read.result()
+                else:
+                    image_data = cv2.imread(photo.file_path, self._IMREAD_FLAGS)
+                self._remember_meta(photo_id, photo.file_path, photo.status)
 
                 if image_data is None:
                     logger.error(f"Failed to read image from {photo.file_path}")
@@ -147,19 +385,27 @@ class StorageService:
             True als succesvol
         """
         try:
-            # zoek de foto op
-            photo = self._repository.get_by_id(photo_id)
+            # bestanden die nog in de queue staan moeten eerst op disk staan
+            self._write_queue.join()
+
+            # zoek het bestand op (alleen pad en status nodig)
+            meta = self._get_meta(photo_id)
+            file_path = meta[0] if meta else None
 
             success = True
 
             # verwijder het bestand van disk
-            if photo and photo.file_path and os.path.exists(photo.file_path):
-                os.remove(photo.file_path)
-                logger.info(f"Deleted file: {photo.file_path}")
+            if file_path and os.path.exists(file_path):
+                file_size = os.path.getsize(file_path)
+                os.remove(file_path)
+                self._update_size_cache(-file_size)
+                logger.info(f"Deleted file: {file_path}")
             else:
                 logger.warning(f"File not found for photo {photo_id}")
                 success = False
 
+            self._forget_meta(photo_id)
+
             # verwijder ook de metadata uit database
             if not self._repository.delete(photo_id):
                 logger.error(f"Failed to delete metadata for {photo_id}")
@@ -182,10 +428,12 @@ class StorageService:
             Aantal geëxporteerde photos
         """
         try:
+            # bestanden die nog in de queue staan moeten eerst op disk staan
+            self._write_queue.join()
+
             # maak de export directory aan
             os.makedirs(export_path, exist_ok=True)
 
-            from ..models.photo import PhotoStatus
             # haal alle goedgekeurde foto's op
             approved_photos = self._repository.get_by_status(PhotoStatus.APPROVED)
 
@@ -217,25 +465,33 @@ class StorageService:
         """
         try:
             from datetime import timedelta
-            from ..models.photo import PhotoStatus
+
+            # bestanden die nog in de queue staan moeten eerst op disk staan
+            self._write_queue.join()
 
             # bereken de cutoff datum
             cutoff_date = datetime.now() - timedelta(days=days)
 
-            # haal alle foto's op
-            all_photos = self._repository.get_all()
+            # de database verwijdert alles in één keer (goedgekeurde foto's
+            # houden we altijd) en geeft de bestandspaden terug
+            deleted = self._repository.delete_older_than(
+                cutoff_date, exclude_status=PhotoStatus.APPROVED
+            )
 
-            count = 0
-            for photo in all_photos:
-                # goedgekeurde foto's houden we altijd
-                if photo.status == PhotoStatus.APPROVED:
-                    continue
+            # ruim daarna de bestanden op, parallel want unlink wacht vooral op disk
+            file_paths = [file_path for _, file_path in deleted if file_path]
+            for photo_id, _ in deleted:
+                self._forget_meta(photo_id)
+            with ThreadPoolExecutor(max_workers=self._CLEANUP_WORKERS) as executor:
+                removed = sum(executor.map(_remove_file, file_paths))
+
+            if removed:
+                self._update_size_cache(None)
 
-                # als de foto ouder is dan de cutoff datum, gooi hem weg
-                if photo.timestamp < cutoff_date:
-                    if self.delete_photo(photo.id):
-                        count += 1
+            if removed < len(deleted):
+                logger.warning(f"{len(deleted) - removed} files not found during cleanup")
 
+            count = len(deleted)
             logger.info(f"Cleaned up {count} old photos")
             return count
 
@@ -243,6 +499,14 @@ class StorageService:
             logger.error(f"Error cleaning up old photos: {e}", exc_info=True)
             return 0
 
+    def close(self) -> None:
+        """Schrijf openstaande photos weg, stop de writer thread en sluit de repository"""
+        self._write_queue.join()
+        self._write_queue.put(None)
+        self._writer.join()
+        self._read_executor.shutdown()
+        self._repository.close()
+
     def get_storage_statistics(self) -> dict:
         """
         Haal storage statistieken op
@@ -251,21 +515,17 @@ class StorageService:
             Dictionary met statistieken
         """
         try:
+            self._write_queue.join()
+
             # haal stats op uit de database
             repo_stats = self._repository.get_statistics()
 
             # bereken hoeveel ruimte alle foto's innemen
-            def get_dir_size(path):
-                total = 0
-                if os.path.exists(path):
-                    for entry in os.scandir(path):
-                        if entry.is_file():
-                            total += entry.stat().st_size
-                        elif entry.is_dir():
-                            total += get_dir_size(entry.path)  # recursief voor subdirs
-                return total
-
-            total_size = get_dir_size(self._storage_path)
+            with self._size_lock:
+                cached_at, total_size = self._size_cache
+                if total_size is None or time.monotonic() - cached_at >= self._STATS_TTL:
+                    total_size = _dir_size(self._storage_path)
+                    self._size_cache = (time.monotonic(), total_size)
 
             # combineer alles in een mooie dictionary
             return {
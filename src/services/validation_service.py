@@ -2,12 +2,17 @@
 Validation service - orchestreert alle validators
 """
 # importeer alle dingen die we nodig hebben
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 import logging
+import os
+import queue
+import threading
 
-from ..models.photo import Photo, PhotoStatus, FaceDetectionResult
+from ..models.photo import Photo, PhotoStatus, FaceDetectionResult, ValidationResult
 from ..models.face_detection_model import FaceDetectionModel, FaceDetectionModelFactory
-from ..validators.base_validator import IValidator
+from ..validators.base_validator import IValidator, get_grayscale_image
 # alle 7 validators importeren
 from ..validators.brightness_validator import BrightnessValidator
 from ..validators.sharpness_validator import SharpnessValidator
@@ -21,6 +26,64 @@ from ..validators.shadow_validator import ShadowValidator
 logger = logging.getLogger(__name__)
 
 
+class SummaryRow(NamedTuple):
+    """Eén regel in get_validation_summary (_asdict() geeft de JSON vorm)"""
+    validator: str
+    valid: bool
+    confidence: float
+    message: str
+
+
+# alle events die een IValidationObserver kan ontvangen
+OBSERVER_EVENTS = (
+    "on_face_detection",
+    "on_validation_progress",
+    "on_validation_result",
+    "on_validation_complete",
+)
+
+
+class IValidationObserver:
+    """
+    Observer interface voor ValidationService
+
+    Elk event heeft een eigen methode; alle methodes doen standaard niets,
+    dus een observer implementeert alleen de events die hij nodig heeft.
+    """
+
+    def on_face_detection(self, message: str) -> None:
+        """
+        Face detection is gestart
+
+        Args:
+            message: Status bericht
+        """
+
+    def on_validation_progress(self, message: str) -> None:
+        """
+        Een validator wordt gestart
+
+        Args:
+            message: Status bericht (bv. "Running BrightnessValidator... (1/7)")
+        """
+
+    def on_validation_result(self, result: ValidationResult) -> None:
+        """
+        Een validator is klaar
+
+        Args:
+            result: Resultaat van de validator
+        """
+
+    def on_validation_complete(self, photo: Photo) -> None:
+        """
+        Alle validators zijn klaar
+
+        Args:
+            photo: Gevalideerde photo (status is bijgewerkt)
+        """
+
+
 class ValidationService:
     """
     Service voor het valideren van pasfoto's
@@ -32,7 +95,8 @@ class ValidationService:
     def __init__(
         self,
         face_detection_model: Optional[FaceDetectionModel] = None,
-        validators: Optional[List[IValidator]] = None
+        validators: Optional[List[IValidator]] = None,
+        max_workers: Optional[int] = None
     ):
         """
         Initialiseer validation service
@@ -40,23 +104,86 @@ class ValidationService:
         Args:
             face_detection_model: Face detection model (optioneel, anders default)
             validators: Lijst met validators (optioneel, anders default set)
+            max_workers: Aantal threads voor de validators (optioneel, anders
+                         één per validator tot het aantal cores; 1 = alles op de
+                         aanroepende thread, handig als je zelf al parallel draait)
         """
-        # als er geen model is meegegeven, maak dan een standaard model aan
-        if face_detection_model is None:
-            self._face_detection_model = FaceDetectionModelFactory.create_default_model()
-        else:
-            self._face_detection_model = face_detection_model
-
-        # als er geen validators zijn meegegeven, maak ze dan zelf aan
-        if validators is None:
-            self._validators = self._create_default_validators()
-        else:
-            self._validators = validators
+        # het model en de default validators worden pas bij het eerste gebruik
+        # aangemaakt: het laden van het MediaPipe model kost honderden ms en
+        # hoort niet bij het opstarten van de GUI
+        self._face_detection_model = face_detection_model
+        self._validators = validators
+        self._lazy_lock = threading.Lock()
+        # (naam, requires_face, is_critical, validate) per validator, opnieuw opgebouwd na
+        # add_validator/remove_validator (zie _get_dispatch)
+        self._validator_dispatch: Optional[Tuple[Tuple[str, bool, bool, Callable], ...]] = None
 
         # lijst voor observers (voor real-time updates naar de GUI)
-        self._observers: List = []
+        self._observers: List[IValidationObserver] = []
+        # per event alleen de observers die er iets mee doen, met hun handler
+        self._observers_by_event: Dict[str, List[Tuple[object, Callable]]] = defaultdict(list)
+
+        # validators lezen alleen de foto en het face detection resultaat en
+        # rekenen vooral in OpenCV/NumPy (laat de GIL los), dus ze kunnen naast elkaar;
+        # de thread pool wordt ook pas bij de eerste validatie gestart
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        logger.info("ValidationService initialized")
+
+    @property
+    def face_detection_model(self) -> FaceDetectionModel:
+        """Face detection model (default model wordt bij eerste gebruik aangemaakt)"""
+        if self._face_detection_model is None:
+            with self._lazy_lock:
+                if self._face_detection_model is None:
+                    self._face_detection_model = FaceDetectionModelFactory.create_default_model()
+        return self._face_detection_model
+
+    @property
+    def validators(self) -> List[IValidator]:
+        """Validators (default set wordt bij eerste gebruik aangemaakt; wijzig via add/remove_validator)"""
+        if self._validators is None:
+            with self._lazy_lock:
+                if self._validators is None:
+                    self._validators = self._create_default_validators()
+                    logger.info("Created %d default validators", len(self._validators))
+        return self._validators
+
+    def _get_dispatch(self) -> Tuple[Tuple[str, bool, bool, Callable], ...]:
+        """
+        Haal de validators op als vaste tuple met naam en gebonden validate methode
+
+        Returns:
+            Tuple met (naam, requires_face, is_critical, validate) per validator, in volgorde
+        """
+        dispatch = self._validator_dispatch
+        if dispatch is None:
+            dispatch = tuple(
+                (validator.get_name(), validator.requires_face(), validator.is_critical(), validator.validate)
+                for validator in self.validators
+            )
+            self._validator_dispatch = dispatch
+        return dispatch
+
+    def _get_executor(self) -> Optional[ThreadPoolExecutor]:
+        """
+        Haal de thread pool voor de validators op (wordt bij eerste gebruik gestart)
 
-        logger.info(f"ValidationService initialized with {len(self._validators)} validators")
+        Returns:
+            ThreadPoolExecutor, of None als alles op de aanroepende thread draait
+        """
+        if self._executor is None:
+            max_workers = self._max_workers
+            if max_workers is None:
+                max_workers = min(len(self.validators), os.cpu_count() or 1)
+            if max_workers > 1:
+                with self._lazy_lock:
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=max_workers, thread_name_prefix="Validator"
+                        )
+        return self._executor
 
     def _create_default_validators(self) -> List[IValidator]:
         """
@@ -84,8 +211,9 @@ class ValidationService:
             validator: Validator om toe te voegen
         """
         # voeg een extra validator toe aan de lijst
-        self._validators.append(validator)
-        logger.info(f"Added validator: {validator.get_name()}")
+        self.validators.append(validator)
+        self._validator_dispatch = None
+        logger.info("Added validator: %s", validator.get_name())
 
     def remove_validator(self, validator_name: str) -> bool:
         """
@@ -98,10 +226,11 @@ class ValidationService:
             True als verwijderd, False als niet gevonden
         """
         # zoek de validator en gooi hem eruit
-        for i, validator in enumerate(self._validators):
+        for i, validator in enumerate(self.validators):
             if validator.get_name() == validator_name:
-                del self._validators[i]
-                logger.info(f"Removed validator: {validator_name}")
+                del self.validators[i]
+                self._validator_dispatch = None
+                logger.info("Removed validator: %s", validator_name)
                 return True
         return False
 
@@ -112,52 +241,133 @@ class ValidationService:
         Returns:
             Lijst met validators
         """
-        return self._validators.copy()
+        return self.validators.copy()
 
-    def validate_photo(self, photo: Photo) -> Photo:
+    # onder deze confidence keurt een kritieke validator de foto sowieso af
+    CRITICAL_CONFIDENCE_FLOOR = 0.2
+
+    def validate_photo(
+        self,
+        photo: Photo,
+        face_detection: Optional[FaceDetectionResult] = None,
+        fast_fail: bool = False,
+        stop_on_critical: bool = False
+    ) -> Photo:
         """
         Valideer een foto met alle validators
 
         Args:
             photo: Photo object om te valideren
+            face_detection: Al berekende face detection (optioneel, anders wordt
+                            face detection hier uitgevoerd)
+            fast_fail: Sla validators die een gezicht nodig hebben over als er
+                       geen gezicht is gevonden, en geef direct een FAIL resultaat
+            stop_on_critical: Sla alle volgende validators over zodra een kritieke
+                              validator (belichting, scherpte) onder
+                              CRITICAL_CONFIDENCE_FLOOR scoort; die krijgen direct
+                              een FAIL resultaat
 
         Returns:
             Photo object met validation results
         """
         logger.info("Starting photo validation")
 
-        # stap 1: zoek eerst het gezicht in de foto
-        self._notify_observers("face_detection", "Detecting face...")
-        face_detection = self._face_detection_model.detect_face(photo.image_data)
+        # de grayscale versie hangt niet af van de face detection; met een pool
+        # rekenen we hem uit terwijl hieronder het gezicht gezocht wordt (beide
+        # laten de GIL los), anders gewoon hier op deze thread
+        image = photo.image_data
+        needs_gray = image is not None and image.size and (image.ndim == 2 or image.shape[2] == 3)
+        executor = self._get_executor()
+        gray_future = None
+        if needs_gray and executor is not None and photo.get_cached("gray") is None:
+            gray_future = executor.submit(get_grayscale_image, photo)
+
+        # stap 1: zoek eerst het gezicht in de foto (als dat nog niet gedaan is)
+        # (bij opnieuw valideren van dezelfde image hergebruiken we de vorige detectie)
+        face_detection_model = self.face_detection_model
+        cache_key = ("face_detection", id(face_detection_model))
+        if face_detection is None:
+            face_detection = photo.get_cached(cache_key)
+        if face_detection is None:
+            self._notify_observers("on_face_detection", "Detecting face...")
+            face_detection = face_detection_model.detect_face(photo.image_data)
+            photo.set_cached(cache_key, face_detection)
 
         if not face_detection.face_found:
             logger.warning("No face detected in photo")
 
-        # stap 2: run alle validators over de foto
-        for i, validator in enumerate(self._validators):
-            validator_name = validator.get_name()
-            # stuur een update naar de GUI
-            self._notify_observers(
-                "validation_progress",
-                f"Running {validator_name}... ({i+1}/{len(self._validators)})"
-            )
+        # gedeelde tussenresultaten klaar hebben voordat de validators starten,
+        # zodat ze op de pool er niet op elkaar hoeven te wachten
+        if gray_future is not None:
+            gray_future.result()
+        elif needs_gray:
+            get_grayscale_image(photo)
+
+        # stap 2: start alle validators tegelijk op de thread pool; validators
+        # die we met fast_fail overslaan (geen gezicht) worden niet gestart
+        dispatch = self._get_dispatch()
+        skip_face_validators = fast_fail and not face_detection.face_found
+        futures = [
+            executor.submit(validate, photo, face_detection)
+            if executor is not None and not (skip_face_validators and requires_face)
+            else None
+            for _, requires_face, _, validate in dispatch
+        ]
+
+        # resultaten in de volgorde van de validators ophalen, zodat de observers
+        # en photo.validation_results altijd dezelfde volgorde hebben
+        report_progress = self._has_observers("on_validation_progress")
+        failed_critical = None
+        for i, ((validator_name, requires_face, is_critical, validate), future) in enumerate(zip(dispatch, futures)):
+            # stuur een update naar de GUI (bericht alleen maken als iemand luistert)
+            if report_progress:
+                self._notify_observers(
+                    "on_validation_progress",
+                    f"Running {validator_name}... ({i+1}/{len(dispatch)})"
+                )
 
             try:
-                # laat de validator zijn ding doen
-                result = validator.validate(photo, face_detection)
+                if failed_critical is not None:
+                    # de foto is al afgekeurd, de rest hoeft niet meer te draaien
+                    if future is not None:
+                        future.cancel()
+                    result = ValidationResult(
+                        validator_name=validator_name,
+                        is_valid=False,
+                        confidence=0.0,
+                        message=f"Overgeslagen: {failed_critical} faalde",
+                        details={"error": "critical_failure", "skipped": True,
+                                 "failed_validator": failed_critical}
+                    )
+                elif skip_face_validators and requires_face:
+                    # zonder gezicht faalt deze validator toch, dus niet uitvoeren
+                    result = ValidationResult(
+                        validator_name=validator_name,
+                        is_valid=False,
+                        confidence=0.0,
+                        message="Geen gezicht gedetecteerd",
+                        details={"error": "no_face_detected", "skipped": True}
+                    )
+                elif future is not None:
+                    # wacht tot de validator op de pool klaar is
+                    result = future.result()
+                else:
+                    # geen pool: laat de validator hier zijn ding doen
+                    result = validate(photo, face_detection)
+
+                if stop_on_critical and is_critical and result.confidence < self.CRITICAL_CONFIDENCE_FLOOR:
+                    failed_critical = validator_name
 
                 # voeg het resultaat toe aan de foto
                 photo.add_validation_result(result)
 
                 # vertel de observers wat er gebeurd is
-                self._notify_observers("validation_result", {
-                    "validator": validator_name,
-                    "result": result
-                })
+                self._notify_observers("on_validation_result", result)
 
+                # %-formattering: de string wordt alleen gemaakt als INFO aan staat
                 logger.info(
-                    f"{validator_name}: {'PASS' if result.is_valid else 'FAIL'} "
-                    f"(confidence: {result.confidence:.2f})"
+                    "%s: %s (confidence: %.2f)",
+                    validator_name, "PASS" if result.is_valid else "FAIL", result.confidence
                 )
 
             except Exception as e:
@@ -168,28 +378,167 @@ class ValidationService:
         photo.update_status()
 
         # stap 4: vertel iedereen dat we klaar zijn
-        self._notify_observers("validation_complete", {
-            "photo": photo,
-            "is_valid": photo.is_valid(),
-            "confidence": photo.get_overall_confidence()
-        })
+        self._notify_observers("on_validation_complete", photo)
 
-        logger.info(
-            f"Validation complete. Status: {photo.status.value}, "
-            f"Overall confidence: {photo.get_overall_confidence():.2f}"
-        )
+        # de overall confidence alleen uitrekenen als er ook echt gelogd wordt
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Validation complete. Status: %s, Overall confidence: %.2f",
+                photo.status.value, photo.get_overall_confidence()
+            )
 
         return photo
 
-    def add_observer(self, observer) -> None:
+    def validate_photos(self, photos: List[Photo], fast_fail: bool = False) -> List[Photo]:
+        """
+        Valideer een lijst photos (bv. een hele map met pasfoto's)
+
+        Face detection gebeurt eerst voor alle photos in één call op het model,
+        daarna draaien de validators per photo. Photos die al een face detection
+        van dit model in hun cache hebben worden niet opnieuw gedetecteerd.
+
+        Args:
+            photos: Photos om te valideren
+            fast_fail: Zie validate_photo
+
+        Returns:
+            Dezelfde photos met validation results, in dezelfde volgorde
+        """
+        face_detection_model = self.face_detection_model
+        cache_key = ("face_detection", id(face_detection_model))
+
+        pending = [photo for photo in photos if photo.get_cached(cache_key) is None]
+        if pending:
+            self._notify_observers("on_face_detection", f"Detecting faces in {len(pending)} photos...")
+            detections = face_detection_model.detect_faces_batch([photo.image_data for photo in pending])
+            for photo, face_detection in zip(pending, detections):
+                photo.set_cached(cache_key, face_detection)
+
+        return [self.validate_photo(photo, fast_fail=fast_fail) for photo in photos]
+
+    # aantal photos dat de detector thread vooruit mag lopen in validate_photo_stream
+    _STREAM_QUEUE_SIZE = 2
+    # hoe lang de stream bij het stoppen op de detector thread wacht (seconden)
+    _STREAM_JOIN_TIMEOUT = 1.0
+
+    def validate_photo_stream(
+        self,
+        photos: Iterable[Photo],
+        fast_fail: bool = False
+    ) -> Iterator[Photo]:
+        """
+        Valideer een reeks photos (bv. live webcam frames) als pipeline
+
+        Een aparte thread doet face detection op photo N+1 terwijl de validators
+        op photo N draaien, zodat de tijd per photo max(detectie, validatie) wordt
+        in plaats van detectie + validatie.
+
+        De detector is een daemon thread die de photos iterable leest. Stopt de
+        consumer halverwege, dan wacht de stream hooguit _STREAM_JOIN_TIMEOUT
+        seconden op die thread; blijft de bron daarna nog blokkeren (bv. een
+        camera generator), dan loopt de detector op de achtergrond af zodra de
+        bron weer iets oplevert en houdt hij het programma niet open.
+        on_face_detection komt van de detector thread, vlak voor elke detectie.
+
+        Args:
+            photos: Iterable met photos om te valideren
+            fast_fail: Zie validate_photo
+
+        Returns:
+            Iterator met gevalideerde photos, in dezelfde volgorde
+        """
+        # begrensde queue: de detector loopt hooguit een paar photos voor
+        detected: queue.Queue = queue.Queue(maxsize=self._STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # niet eeuwig blokkeren als de consumer al gestopt is
+            while not stop.is_set():
+                try:
+                    detected.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        face_detection_model = self.face_detection_model
+
+        def detect() -> None:
+            try:
+                for photo in photos:
+                    if stop.is_set():
+                        return
+                    self._notify_observers("on_face_detection", "Detecting face...")
+                    face_detection = face_detection_model.detect_face(photo.image_data)
+                    if not put((photo, face_detection)):
+                        return
+            except Exception as e:
+                logger.error(f"Error in face detection stream: {e}", exc_info=True)
+            finally:
+                put(done)
+
+        detector = threading.Thread(target=detect, name="FaceDetector", daemon=True)
+        detector.start()
+
+        try:
+            while True:
+                item = detected.get()
+                if item is done:
+                    return
+                photo, face_detection = item
+                yield self.validate_photo(photo, face_detection=face_detection, fast_fail=fast_fail)
+        finally:
+            # ook als de consumer halverwege stopt: detector netjes afsluiten
+            stop.set()
+            detector.join(timeout=self._STREAM_JOIN_TIMEOUT)
+            if detector.is_alive():
+                logger.warning("Face detector thread still waiting on its photo source; leaving it as daemon")
+
+    def close(self) -> None:
+        """Stop de validator threads"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def add_observer(self, observer, event_types: Optional[Iterable[str]] = None) -> None:
         """
         Voeg een observer toe voor real-time updates
 
         Args:
-            observer: Observer object met update(event_type, data) methode
+            observer: IValidationObserver (of object met dezelfde on_* methodes)
+            event_types: Events waar de observer op ingeschreven wordt (optioneel,
+                         anders alle events waarvoor hij een eigen methode heeft)
         """
+        if event_types is None:
+            event_types = [event for event in OBSERVER_EVENTS if self._handles_event(observer, event)]
+
+        event_types = list(event_types)
+        for event in event_types:
+            if event not in OBSERVER_EVENTS:
+                raise ValueError(f"Unknown observer event: {event}")
+
         # voeg observer toe zodat die updates krijgt
         self._observers.append(observer)
+        for event in event_types:
+            self._observers_by_event[event].append((observer, getattr(observer, event)))
+
+    @staticmethod
+    def _handles_event(observer, event: str) -> bool:
+        """
+        Check of een observer een event zelf afhandelt
+
+        Args:
+            observer: Observer om te checken
+            event: Naam van de IValidationObserver methode
+
+        Returns:
+            False als de observer alleen de lege default van IValidationObserver heeft
+        """
+        handler = getattr(type(observer), event, None)
+        if handler is None:
+            return hasattr(observer, event)
+        return handler is not getattr(IValidationObserver, event)
 
     def remove_observer(self, observer) -> None:
         """
@@ -200,19 +549,33 @@ class ValidationService:
         """
         if observer in self._observers:
             self._observers.remove(observer)
+            for event, handlers in self._observers_by_event.items():
+                self._observers_by_event[event] = [(o, h) for o, h in handlers if o is not observer]
+
+    def _has_observers(self, method_name: str) -> bool:
+        """
+        Check of iemand naar een event luistert
+
+        Args:
+            method_name: Naam van de IValidationObserver methode voor dit event
 
-    def _notify_observers(self, event_type: str, data) -> None:
+        Returns:
+            True als er minstens één observer voor dit event is
         """
-        Notify alle observers van een event
+        return bool(self._observers_by_event.get(method_name))
+
+    def _notify_observers(self, method_name: str, data) -> None:
+        """
+        Notify de observers die op een event ingeschreven zijn
 
         Args:
-            event_type: Type van event
+            method_name: Naam van de IValidationObserver methode voor dit event
             data: Event data
         """
-        # vertel alle observers wat er gebeurt (bv de GUI)
-        for observer in self._observers:
+        # vertel de geïnteresseerde observers wat er gebeurt (bv de GUI)
+        for _, handler in self._observers_by_event.get(method_name, ()):
             try:
-                observer.update(event_type, data)
+                handler(data)
             except Exception as e:
                 logger.error(f"Error notifying observer: {e}", exc_info=True)
 
@@ -224,23 +587,21 @@ class ValidationService:
             photo: Gevalideerde photo
 
         Returns:
-            Dictionary met samenvatting
+            Dictionary met samenvatting; "results" is een tuple met SummaryRow
+            per validator
         """
         # maak een mooie samenvatting van alle resultaten
+        results = tuple(
+            SummaryRow(r.validator_name, r.is_valid, r.confidence, r.message)
+            for r in photo.validation_results
+        )
+        passed = sum(1 for row in results if row.valid)
         return {
             "status": photo.status.value,
             "is_valid": photo.is_valid(),
             "overall_confidence": photo.get_overall_confidence(),
-            "total_validators": len(photo.validation_results),
-            "passed_validators": sum(1 for r in photo.validation_results if r.is_valid),
-            "failed_validators": len(photo.get_failed_validations()),
-            "results": [
-                {
-                    "validator": r.validator_name,
-                    "valid": r.is_valid,
-                    "confidence": r.confidence,
-                    "message": r.message
-                }
-                for r in photo.validation_results
-            ]
+            "total_validators": len(results),
+            "passed_validators": passed,
+            "failed_validators": len(results) - passed,
+            "results": results
         }
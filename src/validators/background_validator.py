@@ -6,7 +6,43 @@ import cv2
 from typing import Optional
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
-from .base_validator import BaseValidator, ValidatorConfig
+from .base_validator import BaseValidator, ValidatorConfig, get_edge_map
+
+
+# Score tabellen: een waarde onder thresholds[i] krijgt scores[i], boven de
+# laatste drempel de laatste score
+# uniformiteit: std < 20 -> 1.0, < 40 -> 0.7, < 60 -> 0.5, anders 0.3
+_UNIFORMITY_THRESHOLDS = np.array([20.0, 40.0, 60.0])
+_UNIFORMITY_SCORES = np.array([1.0, 0.7, 0.5, 0.3])
+# kleur: std < 15 -> 1.0, < 30 -> 0.7, anders 0.4
+_COLOR_THRESHOLDS = np.array([15.0, 30.0])
+_COLOR_SCORES = np.array([1.0, 0.7, 0.4])
+# edges: ratio < 0.05 -> 1.0, < 0.10 -> 0.7, < 0.20 -> 0.5, anders 0.3
+_EDGE_THRESHOLDS = np.array([0.05, 0.10, 0.20])
+_EDGE_SCORES = np.array([1.0, 0.7, 0.5, 0.3])
+# lichte achtergrond: mean > 180 -> 0.1, > 150 -> 0.05, anders 0.0
+_BRIGHTNESS_THRESHOLDS = np.array([150.0, 180.0])
+_BRIGHTNESS_BONUSES = np.array([0.0, 0.05, 0.1])
+
+
+def _expand_face_rect(bbox, img_width: int, img_height: int):
+    """
+    Vergroot de gezichts bbox om nek/schouders mee te nemen, afgekapt op de image
+
+    Args:
+        bbox: (x, y, w, h) van het gezicht
+        img_width: Breedte van de image
+        img_height: Hoogte van de image
+
+    Returns:
+        (x, y, w, h) van het vergrote gebied, volledig binnen de image
+    """
+    x, y, w, h = bbox
+    expanded_x = min(max(0, x - int(w * 0.3)), img_width)
+    expanded_y = min(max(0, y - int(h * 0.2)), img_height)
+    expanded_w = max(0, min(img_width - expanded_x, int(w * 1.6)))
+    expanded_h = max(0, min(img_height - expanded_y, int(h * 1.8)))
+    return expanded_x, expanded_y, expanded_w, expanded_h
 
 
 class BackgroundValidator(BaseValidator):
@@ -50,27 +86,22 @@ class BackgroundValidator(BaseValidator):
                 details={"error": "no_face_for_reference"}
             )
 
-        img_height, img_width = photo.image_data.shape[:2]
+        # Op volle resolutie: de edge ratio en std drempels hieronder gelden
+        # voor de originele foto, op een thumbnail schuiven ze mee met de schaal
+        image = photo.image_data
+        img_height, img_width = image.shape[:2]
         x, y, w, h = face_detection.face_bbox
 
-        # Maak een masker voor het gezicht (om uit te sluiten)
-        face_mask = np.zeros((img_height, img_width), dtype=np.uint8)
-
-        # Vergroot het gezichtsgebied een beetje om nek/schouders mee te nemen
-        expanded_x = max(0, x - int(w * 0.3))
-        expanded_y = max(0, y - int(h * 0.2))
-        expanded_w = min(img_width - expanded_x, int(w * 1.6))
-        expanded_h = min(img_height - expanded_y, int(h * 1.8))
-
-        face_mask[expanded_y:expanded_y+expanded_h, expanded_x:expanded_x+expanded_w] = 255
+        # Achtergrond masker: alles behalve het (vergrote) gezichtsgebied
+        expanded_x, expanded_y, expanded_w, expanded_h = _expand_face_rect(
+            (x, y, w, h), img_width, img_height
+        )
+        bg_mask = self._get_buffer("mask", (img_height, img_width))
+        bg_mask.fill(255)
+        bg_mask[expanded_y:expanded_y+expanded_h, expanded_x:expanded_x+expanded_w] = 0
+        bg_count = img_width * img_height - expanded_w * expanded_h
 
-        # Inverteer masker om achtergrond te krijgen
-        bg_mask = cv2.bitwise_not(face_mask)
-
-        # Haal achtergrond pixels op
-        bg_pixels = photo.image_data[bg_mask > 0]
-
-        if len(bg_pixels) < 100:
+        if bg_count < 100:
             # Te weinig achtergrond pixels
             return self._create_result(
                 is_valid=True,
@@ -79,58 +110,34 @@ class BackgroundValidator(BaseValidator):
                 details={"note": "small_background"}
             )
 
-        # Converteer naar grijstinten voor uniformiteits analyse
-        gray = cv2.cvtColor(photo.image_data, cv2.COLOR_BGR2GRAY)
-        bg_gray = gray[bg_mask > 0]
+        # Alle statistieken met het masker in OpenCV, zonder de achtergrond
+        # pixels eerst naar een aparte array te kopiëren
+        gray = self._get_grayscale_image(photo)
 
         # Bereken uniformiteit van achtergrond
-        bg_std = np.std(bg_gray)
-        bg_mean = np.mean(bg_gray)
+        bg_mean, bg_std = (v[0, 0] for v in cv2.meanStdDev(gray, mask=bg_mask))
 
-        # Bereken kleur uniformiteit
-        bg_color_std = np.std(bg_pixels, axis=0).mean()
+        # Bereken kleur uniformiteit (gemiddelde std over de kanalen)
+        _, color_std = cv2.meanStdDev(image, mask=bg_mask)
+        bg_color_std = color_std.mean()
 
         # Check voor edges in achtergrond (objecten)
-        edges = cv2.Canny(gray, 50, 150)
-        bg_edges = edges[bg_mask > 0]
-        edge_ratio = np.sum(bg_edges > 0) / len(bg_edges) if len(bg_edges) > 0 else 0
+        edges = get_edge_map(photo)
+        edge_ratio = cv2.countNonZero(cv2.bitwise_and(edges, bg_mask)) / bg_count
 
-        # Score berekening
+        # Score berekening via drempel tabellen (zie boven): searchsorted geeft
+        # het vak waar de waarde in valt, zonder if/elif ladder
         # 1. Uniformiteit (lagere std = beter)
-        if bg_std < 20:
-            uniformity_score = 1.0
-        elif bg_std < 40:
-            uniformity_score = 0.7
-        elif bg_std < 60:
-            uniformity_score = 0.5
-        else:
-            uniformity_score = 0.3
+        uniformity_score = _UNIFORMITY_SCORES[np.searchsorted(_UNIFORMITY_THRESHOLDS, bg_std, side='right')]
 
         # 2. Kleur uniformiteit
-        if bg_color_std < 15:
-            color_score = 1.0
-        elif bg_color_std < 30:
-            color_score = 0.7
-        else:
-            color_score = 0.4
+        color_score = _COLOR_SCORES[np.searchsorted(_COLOR_THRESHOLDS, bg_color_std, side='right')]
 
         # 3. Edge score (minder edges = beter)
-        if edge_ratio < 0.05:
-            edge_score = 1.0
-        elif edge_ratio < 0.10:
-            edge_score = 0.7
-        elif edge_ratio < 0.20:
-            edge_score = 0.5
-        else:
-            edge_score = 0.3
+        edge_score = _EDGE_SCORES[np.searchsorted(_EDGE_THRESHOLDS, edge_ratio, side='right')]
 
-        # 4. Lichte achtergrond bonus (voor pasfoto's)
-        if bg_mean > 180:  # Lichte achtergrond
-            brightness_bonus = 0.1
-        elif bg_mean > 150:
-            brightness_bonus = 0.05
-        else:
-            brightness_bonus = 0.0
+        # 4. Lichte achtergrond bonus (voor pasfoto's), pas boven de drempel
+        brightness_bonus = _BRIGHTNESS_BONUSES[np.searchsorted(_BRIGHTNESS_THRESHOLDS, bg_mean, side='left')]
 
         # Combineer scores
         confidence = (uniformity_score * 0.4 + color_score * 0.3 + edge_score * 0.3) + brightness_bonus
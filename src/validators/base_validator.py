@@ -2,12 +2,158 @@
 Base validator interface en abstracte implementatie
 """
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional, Union
+import threading
+import cv2
 import numpy as np
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
 
 
+# validators draaien parallel; zo rekent maar één thread gedeelde data uit
+_cache_lock = threading.Lock()
+
+# langste zijde waarop een analyse regio hoogstens bekeken wordt (zie downscale_region)
+REGION_SIZE = 1024
+
+
+def _get_or_compute(photo: Photo, key: str, compute):
+    """
+    Haal gedeelde data van de photo uit de cache, of reken hem één keer uit
+
+    Args:
+        photo: Photo object
+        key: Cache naam
+        compute: Functie zonder argumenten die de waarde berekent; draait onder
+                 de cache lock, dus mag zelf geen andere gecachte data ophalen
+
+    Returns:
+        De (gecachte) waarde
+    """
+    value = photo.get_cached(key)
+    if value is None:
+        with _cache_lock:
+            value = photo.get_cached(key)
+            if value is None:
+                value = compute()
+                photo.set_cached(key, value)
+    return value
+
+
+def get_grayscale_image(photo: Photo) -> np.ndarray:
+    """
+    Geef de grayscale versie van een foto, één keer berekend en op de photo bewaard
+
+    ValidationService roept dit aan voordat de validators starten, zodat alle
+    validators dezelfde conversie gebruiken. Niet in place aanpassen.
+
+    Args:
+        photo: Photo object
+
+    Returns:
+        Grayscale image als NumPy array
+    """
+    image = photo.image_data
+    if image.ndim == 2:
+        # Already grayscale
+        return image
+    return _get_or_compute(photo, "gray", lambda: cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+
+
+def get_edge_map(photo: Photo, low: int = 50, high: int = 150) -> np.ndarray:
+    """
+    Geef de Canny edge map van de grayscale foto, één keer per drempelpaar berekend
+
+    Als OpenCV een OpenCL device heeft (bv. een iGPU) draait Canny via UMat op
+    dat device; het resultaat wordt als gewone NumPy array bewaard zodat alle
+    validators het kunnen delen. Niet in place aanpassen. Canny draait op volle
+    resolutie: op een verkleinde foto verandert de edge dichtheid met de
+    schaal, en dan zouden vaste drempels per resolutie iets anders betekenen.
+
+    Args:
+        photo: Photo object
+        low: Onderste hysterese drempel
+        high: Bovenste hysterese drempel
+
+    Returns:
+        Edge map (0 of 255) met de afmetingen van photo.image_data
+    """
+    key = f"edges_{low}_{high}"
+    edges = photo.get_cached(key)
+    if edges is not None:
+        return edges
+
+    # buiten _get_or_compute ophalen: die houdt de (niet reentrant) cache lock vast
+    gray = get_grayscale_image(photo)
+
+    def compute():
+        if cv2.ocl.useOpenCL():
+            return cv2.Canny(cv2.UMat(gray), low, high).get()
+        return cv2.Canny(gray, low, high)
+
+    return _get_or_compute(photo, key, compute)
+
+
+def linear_decay(distance: float, scale: float) -> float:
+    """
+    Score die lineair afneemt met de afstand buiten het toegestane bereik
+
+    Args:
+        distance: Afstand tot het bereik (0 of negatief = binnen het bereik)
+        scale: Afstand waarop de score 0.0 wordt
+
+    Returns:
+        1.0 binnen het bereik, daarbuiten 1 - distance/scale (minimaal 0.0)
+    """
+    if distance <= 0:
+        return 1.0
+    return max(0.0, 1.0 - distance / scale)
+
+
+def padded_region(image: np.ndarray, bbox: tuple, padding: int) -> np.ndarray:
+    """
+    Geef de regio van een bounding box met padding rondom, begrensd door de image
+
+    Args:
+        image: Image (grayscale of BGR)
+        bbox: Bounding box (x, y, width, height)
+        padding: Aantal pixels extra aan elke kant
+
+    Returns:
+        View op de image (geen kopie)
+    """
+    x, y, w, h = bbox
+    x = max(0, x - padding)
+    y = max(0, y - padding)
+    w = min(image.shape[1] - x, w + 2 * padding)
+    h = min(image.shape[0] - y, h + 2 * padding)
+    return image[y:y+h, x:x+w]
+
+
+def downscale_region(region: np.ndarray, max_side: int = REGION_SIZE) -> tuple:
+    """
+    Verklein een (grote) analyse regio tot hoogstens max_side pixels per zijde
+
+    INTER_NEAREST pakt echte pixels in plaats van te middelen, zodat de
+    verdeling van de pixelwaardes (en dus drempel tellingen en std) gelijk
+    blijft. Alleen geschikt voor analyses van grote vlakken: kleine details
+    (reflecties, scherpte) verdwijnen of veranderen bij verkleinen.
+
+    Args:
+        region: Image regio (grayscale of BGR)
+        max_side: Maximale lengte van de langste zijde
+
+    Returns:
+        (regio, scale) met scale = nieuwe breedte / originele breedte
+    """
+    h, w = region.shape[:2]
+    if max(h, w) <= max_side:
+        return region, 1.0
+    scale = max_side / max(h, w)
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(region, size, interpolation=cv2.INTER_NEAREST), size[0] / w
+
+
 class IValidator(ABC):
     """
     Interface voor foto validators
@@ -50,6 +196,25 @@ class IValidator(ABC):
         """
         pass
 
+    def requires_face(self) -> bool:
+        """
+        Geeft aan of de validator een gedetecteerd gezicht nodig heeft
+
+        Returns:
+            True als de validator zonder gezicht altijd faalt
+        """
+        return False
+
+    def is_critical(self) -> bool:
+        """
+        Geeft aan of een zeer lage score van deze validator de foto sowieso afkeurt
+
+        Returns:
+            True als de overige validators bij fast_fail overgeslagen mogen worden
+            wanneer deze validator ver onder de maat scoort
+        """
+        return False
+
 
 class BaseValidator(IValidator):
     """
@@ -66,6 +231,8 @@ class BaseValidator(IValidator):
         if not 0.0 <= threshold <= 1.0:
             raise ValueError("Threshold must be between 0.0 and 1.0")
         self._threshold = threshold
+        # herbruikbare werk buffers per thread (validators kunnen op een pool draaien)
+        self._buffers = threading.local()
 
     @property
     def threshold(self) -> float:
@@ -92,7 +259,7 @@ class BaseValidator(IValidator):
         is_valid: bool,
         confidence: float,
         message: str,
-        details: Optional[dict] = None
+        details: Optional[Union[dict, Callable[[], dict]]] = None
     ) -> ValidationResult:
         """
         Helper methode om ValidationResult te maken
@@ -101,11 +268,16 @@ class BaseValidator(IValidator):
             is_valid: Of validatie geslaagd is
             confidence: Confidence score
             message: Feedback bericht
-            details: Optionele extra details
+            details: Optionele extra details, of een functie die ze pas
+                opbouwt als iemand ze leest (per frame leest meestal niemand ze)
 
         Returns:
             ValidationResult object
         """
+        if callable(details):
+            return ValidationResult.from_details_factory(
+                self.get_name(), is_valid, confidence, message, details
+            )
         return ValidationResult(
             validator_name=self.get_name(),
             is_valid=is_valid,
@@ -116,7 +288,7 @@ class BaseValidator(IValidator):
 
     def _get_grayscale_image(self, photo: Photo) -> np.ndarray:
         """
-        Converteer foto naar grayscale
+        Converteer foto naar grayscale (gedeeld, zie get_grayscale_image)
 
         Args:
             photo: Photo object
@@ -124,11 +296,57 @@ class BaseValidator(IValidator):
         Returns:
             Grayscale image als NumPy array
         """
-        import cv2
-        if len(photo.image_data.shape) == 2:
-            # Already grayscale
-            return photo.image_data
-        return cv2.cvtColor(photo.image_data, cv2.COLOR_BGR2GRAY)
+        return get_grayscale_image(photo)
+
+    def _no_face_result(self, message: str = "Geen gezicht gedetecteerd") -> ValidationResult:
+        """
+        Resultaat voor als er geen (bruikbaar) gezicht gedetecteerd is
+
+        Elk resultaat krijgt een eigen details dict, want details mogen
+        achteraf aangepast worden.
+
+        Args:
+            message: Feedback bericht
+
+        Returns:
+            Ongeldig ValidationResult met confidence 0.0
+        """
+        return self._create_result(False, 0.0, message, {"error": "no_face_detected"})
+
+    def _no_landmarks_result(self, message: str) -> ValidationResult:
+        """
+        Resultaat voor als er wel een gezicht is, maar zonder landmarks
+
+        Args:
+            message: Feedback bericht
+
+        Returns:
+            Ongeldig ValidationResult met confidence 0.0
+        """
+        return self._create_result(False, 0.0, message, {"error": "no_landmarks"})
+
+    def _get_buffer(self, name: str, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """
+        Haal een werk buffer van deze thread op, nieuw alleen als vorm of type verandert
+
+        Bij de webcam blijft de grootte van de (gezichts)regio frame na frame
+        (vrijwel) gelijk, dus dan wordt dezelfde buffer steeds hergebruikt via dst=.
+        Inhoud is ongedefinieerd en alleen geldig tot de volgende validate() call
+        in dezelfde thread; nooit in een resultaat bewaren.
+
+        Args:
+            name: Naam van de buffer (één buffer per naam)
+            shape: Gewenste vorm
+            dtype: Gewenst type
+
+        Returns:
+            Buffer met de gevraagde vorm en type
+        """
+        buffer = getattr(self._buffers, name, None)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            setattr(self._buffers, name, buffer)
+        return buffer
 
     def _validate_image_data(self, photo: Photo) -> None:
         """
@@ -140,9 +358,10 @@ class BaseValidator(IValidator):
         Raises:
             ValueError: Als image data niet geldig is
         """
-        if photo.image_data is None:
+        image = photo.image_data
+        if image is None:
             raise ValueError("Photo has no image data")
-        if photo.image_data.size == 0:
+        if image.size == 0:
             raise ValueError("Photo image data is empty")
 
 
@@ -3,12 +3,51 @@ Validator voor belichting controle
 """
 import numpy as np
 import cv2
-from typing import Optional
+from typing import List, Optional
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
 from .base_validator import BaseValidator, ValidatorConfig
 
 
+# pixelwaardes 0-255, om het gemiddelde uit de histogram te berekenen
+_PIXEL_VALUES = np.arange(256, dtype=np.float64)
+
+
+def _histogram(gray: np.ndarray) -> np.ndarray:
+    """
+    Tel hoe vaak elke pixelwaarde (0-255) voorkomt, in één pass over de image
+
+    calcHist is hier sneller dan np.bincount, dat de uint8 pixels eerst naar
+    int64 kopieert. Net als alle OpenCV calls laat calcHist de GIL los, dus deze
+    pass draait echt parallel met de andere validators op de thread pool; de
+    numpy nabewerking in _brightness_metrics is maar 256 waardes.
+
+    Args:
+        gray: Grayscale image (of platte rij pixels)
+
+    Returns:
+        Aantallen per pixelwaarde als float64 array van 256
+    """
+    return cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel().astype(np.float64)
+
+
+def _brightness_metrics(counts: np.ndarray, total: int):
+    """
+    Bereken de belichtings metingen uit histogram(men)
+
+    Args:
+        counts: Histogram (256,) of een stapel histogrammen (N, 256)
+        total: Aantal pixels per image
+
+    Returns:
+        (mean_brightness, overexposed_ratio, underexposed_ratio)
+    """
+    mean_brightness = (counts @ _PIXEL_VALUES) / total
+    overexposed_ratio = counts[..., 240:].sum(axis=-1) / total  # pixels tussen 240-255 (bijna wit)
+    underexposed_ratio = counts[..., :15].sum(axis=-1) / total   # pixels tussen 0-15 (bijna zwart)
+    return mean_brightness, overexposed_ratio, underexposed_ratio
+
+
 class BrightnessValidator(BaseValidator):
     """
     Valideert of de belichting van de foto correct is
@@ -53,31 +92,85 @@ class BrightnessValidator(BaseValidator):
         self._validate_image_data(photo)
 
         # zet de foto om naar grijstinten, dan kunnen we makkelijker brightness berekenen
+        # (op volle resolutie: verkleinen middelt losse over/onderbelichte pixels
+        # weg, dus de staart ratio's zouden dan te laag uitvallen)
         gray = self._get_grayscale_image(photo)
 
-        # bereken de gemiddelde helderheid van alle pixels
-        mean_brightness = np.mean(gray)
+        # tel hoe vaak elke pixelwaarde (0-255) voorkomt; de gemiddelde helderheid en
+        # hoeveel pixels bijna wit (overbelichting) of bijna zwart (onderbelichting)
+        # zijn komen allemaal uit deze ene pass over de image. Bij opnieuw
+        # valideren van dezelfde foto hergebruiken we de histogram
+        counts = photo.get_cached("histogram")
+        if counts is None:
+            counts = _histogram(gray)
+            photo.set_cached("histogram", counts)
+        mean_brightness, overexposed_ratio, underexposed_ratio = _brightness_metrics(counts, gray.size)
 
-        # maak een histogram van alle pixelwaardes (0-255)
-        hist = cv2.calcHist([gray], [0], None, [256], [0, 256])
-        hist_normalized = hist / hist.sum()
+        return self._score(mean_brightness, overexposed_ratio, underexposed_ratio)
 
-        # kijk hoeveel pixels bijna wit zijn (overbelichting) of bijna zwart (onderbelichting)
-        overexposed_ratio = hist_normalized[240:].sum()  # pixels tussen 240-255 (bijna wit)
-        underexposed_ratio = hist_normalized[:15].sum()   # pixels tussen 0-15 (bijna zwart)
+    def validate_array(self, images: np.ndarray, chunk_size: int = 256) -> List[ValidationResult]:
+        """
+        Valideer belichting van een hele batch images in één keer
+
+        Geeft dezelfde resultaten als validate() per image, maar de grijsconversie
+        draait als één OpenCV call per chunk (en per image één histogram).
+
+        Args:
+            images: Batch als NumPy array (N, H, W, 3) in BGR, of (N, H, W) grayscale
+            chunk_size: Aantal images per chunk (beperkt geheugengebruik)
 
+        Returns:
+            Lijst met ValidationResult, één per image
+        """
+        if images.size == 0:
+            raise ValueError("Image batch is empty")
+
+        results = []
+        for start in range(0, len(images), chunk_size):
+            chunk = np.ascontiguousarray(images[start:start + chunk_size])
+            n, h = chunk.shape[:2]
+
+            if chunk.ndim == 4:
+                # stapel alle images onder elkaar zodat cvtColor maar één keer nodig is
+                gray = cv2.cvtColor(chunk.reshape(n * h, *chunk.shape[2:]), cv2.COLOR_BGR2GRAY)
+                gray = gray.reshape(n, -1)
+            else:
+                gray = chunk.reshape(n, -1)
+
+            # één histogram per image in plaats van drie passes over de hele chunk
+            counts = np.stack([_histogram(row) for row in gray])
+            mean_brightness, overexposed_ratio, underexposed_ratio = _brightness_metrics(
+                counts, gray.shape[1]
+            )
+
+            for i in range(n):
+                results.append(self._score(mean_brightness[i], overexposed_ratio[i], underexposed_ratio[i]))
+
+        return results
+
+    def _score(
+        self,
+        mean_brightness: float,
+        overexposed_ratio: float,
+        underexposed_ratio: float
+    ) -> ValidationResult:
+        """
+        Bereken score en feedback uit de belichtings metingen
+
+        Args:
+            mean_brightness: Gemiddelde helderheid (0-255)
+            overexposed_ratio: Fractie bijna witte pixels
+            underexposed_ratio: Fractie bijna zwarte pixels
+
+        Returns:
+            ValidationResult met resultaat
+        """
         # bereken hoe goed de foto belicht is
         # factor 1: zit de brightness binnen het goede bereik?
-        if self._min_brightness <= mean_brightness <= self._max_brightness:
-            brightness_score = 1.0  # perfect!
-        else:
-            # foto is te donker of te licht, bereken hoeveel te veel
-            if mean_brightness < self._min_brightness:
-                distance = self._min_brightness - mean_brightness
-            else:
-                distance = mean_brightness - self._max_brightness
-            # hoe verder we ernaast zitten, hoe lager de score
-            brightness_score = max(0.0, 1.0 - (distance / 30))
+        # afstand tot het bereik (0 als hij erbinnen zit, dan is de score 1.0);
+        # hoe verder we ernaast zitten, hoe lager de score
+        distance = max(0.0, self._min_brightness - mean_brightness, mean_brightness - self._max_brightness)
+        brightness_score = max(0.0, 1.0 - (distance / 30))
 
         # factor 2: zijn er te veel super donkere of super lichte plekken?
         extreme_score = 1.0 - min(1.0, (overexposed_ratio + underexposed_ratio) * 2)
@@ -113,6 +206,10 @@ class BrightnessValidator(BaseValidator):
 
         return self._create_result(is_valid, confidence, message, details)
 
+    def is_critical(self) -> bool:
+        """Bij een onbruikbaar belichte foto hoeven de andere validators niet meer te draaien"""
+        return True
+
     def get_name(self) -> str:
         """Haal naam van validator op"""
         return "BrightnessValidator"
@@ -47,22 +47,11 @@ class FacialExpressionValidator(BaseValidator):
 
         # Face detection met landmarks is verplicht
         if not face_detection or not face_detection.face_found:
-            return self._create_result(
-                is_valid=False,
-                confidence=0.0,
-                message="Geen gezicht gedetecteerd",
-                details={"error": "no_face_detected"}
-            )
-
-        if not face_detection.landmarks:
-            return self._create_result(
-                is_valid=False,
-                confidence=0.0,
-                message="Gezichtskenmerken konden niet worden gedetecteerd",
-                details={"error": "no_landmarks"}
-            )
+            return self._no_face_result()
 
         landmarks = face_detection.landmarks
+        if not landmarks:
+            return self._no_landmarks_result("Gezichtskenmerken konden niet worden gedetecteerd")
 
         # Bereken mond aspect ratio (MAR)
         # MAR = hoogte / breedte van de mond
@@ -73,14 +62,10 @@ class FacialExpressionValidator(BaseValidator):
 
         # Check of mond acceptabel is (niet wijd open)
         # threshold is 0.5, dus alleen echt wijd open is een probleem
-        if mouth_aspect_ratio <= self._mouth_open_threshold:
-            mouth_score = 1.0
-            mouth_closed = True
-        else:
-            # Mond is te wijd open - geef lagere score
-            excess = mouth_aspect_ratio - self._mouth_open_threshold
-            mouth_score = max(0.0, 1.0 - (excess / 0.3))  # gradueel afnemen
-            mouth_closed = False
+        # Boven de threshold neemt de score gradueel af (0 bij 0.3 te ver open)
+        mouth_closed = mouth_aspect_ratio <= self._mouth_open_threshold
+        excess = max(0.0, mouth_aspect_ratio - self._mouth_open_threshold)
+        mouth_score = max(0.0, 1.0 - excess / 0.3)
 
         # Check voor extreme gezichtsuitdrukkingen via landmarks
         # Bijvoorbeeld: wenkbrauwen te hoog (verrassing), te laag (boos), etc.
@@ -125,10 +110,13 @@ class FacialExpressionValidator(BaseValidator):
         # mouth_lower heeft HOGERE y-waarde dan mouth_upper (want y groeit naar beneden)
         # Dus: mouth_height = mouth_lower - mouth_upper
 
-        if 'mouth_upper' in landmarks and 'mouth_lower' in landmarks and 'mouth_width' in landmarks:
+        mouth_upper = landmarks.get('mouth_upper')
+        mouth_lower = landmarks.get('mouth_lower')
+        mouth_width = landmarks.get('mouth_width')
+
+        if mouth_upper is not None and mouth_lower is not None and mouth_width is not None:
             # Bereken hoogte: lower y - upper y (lower is groter in pixel coords)
-            mouth_height = abs(landmarks['mouth_lower'] - landmarks['mouth_upper'])
-            mouth_width = landmarks['mouth_width']
+            mouth_height = abs(mouth_lower - mouth_upper)
         else:
             # Geen landmarks beschikbaar - ga uit van gesloten mond
             return 0.1  # Conservatieve waarde voor gesloten mond
@@ -157,19 +145,23 @@ class FacialExpressionValidator(BaseValidator):
         score = 1.0
 
         # Check eyebrow position (if available)
-        if 'eyebrow_raise' in landmarks:
-            eyebrow_raise = landmarks['eyebrow_raise']
+        eyebrow_raise = landmarks.get('eyebrow_raise')
+        if eyebrow_raise is not None:
             if eyebrow_raise > 0.3:  # Te hoog opgetrokken
                 score -= 0.3
 
         # Check voor asymmetrie (lachen, scheef kijken)
-        if 'mouth_symmetry' in landmarks:
-            symmetry = landmarks['mouth_symmetry']
+        symmetry = landmarks.get('mouth_symmetry')
+        if symmetry is not None:
             if symmetry < 0.7:  # Te asymmetrisch
                 score -= 0.2
 
         return max(0.0, min(1.0, score))
 
+    def requires_face(self) -> bool:
+        """Deze validator heeft een gedetecteerd gezicht nodig"""
+        return True
+
     def get_name(self) -> str:
         """Haal naam van validator op"""
         return "FacialExpressionValidator"
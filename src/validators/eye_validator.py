@@ -3,11 +3,44 @@ Validator voor ogen zichtbaarheid
 """
 from typing import Optional
 import numpy as np
+import cv2
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
 from .base_validator import BaseValidator, ValidatorConfig
 
 
+# MediaPipe EAR waarden (gebaseerd op testdata):
+# - Gesloten oog: ~0.15-0.22 (foto met dichte ogen gaf 0.175-0.212!)
+# - Half open: ~0.20-0.25
+# - Normaal open: ~0.25-0.35
+# - Wijd open: ~0.35+
+_CLOSED_THRESHOLD = 0.22  # onder dit zijn ogen waarschijnlijk dicht
+_MIN_ACCEPTABLE = 0.25    # alles boven 0.25 is prima
+
+# landmark key met de EAR per oog; vaste strings houden hun hash bij, een
+# f-string key wordt elke keer opnieuw opgebouwd en gehasht
+_EAR_KEYS = {'left': 'left_eye_height', 'right': 'right_eye_height'}
+
+
+def _ear_score(ear: float) -> float:
+    """
+    Score voor hoe open één oog is
+
+    Args:
+        ear: Eye aspect ratio van het oog
+
+    Returns:
+        1.0 boven _MIN_ACCEPTABLE, 0.6-1.0 als half open, 0.0-0.5 als dicht
+    """
+    if ear >= _MIN_ACCEPTABLE:
+        return 1.0  # goed open
+    if ear >= _CLOSED_THRESHOLD:
+        # half open - geef lagere maar acceptabele score
+        return 0.6 + (ear - _CLOSED_THRESHOLD) / (_MIN_ACCEPTABLE - _CLOSED_THRESHOLD) * 0.4
+    # echt dicht
+    return max(0.0, ear / _CLOSED_THRESHOLD * 0.5)
+
+
 class EyeVisibilityValidator(BaseValidator):
     """
     Valideert of beide ogen goed zichtbaar zijn
@@ -49,61 +82,26 @@ class EyeVisibilityValidator(BaseValidator):
 
         # voor deze validator hebben we echt face detection nodig
         if not face_detection or not face_detection.face_found:
-            return self._create_result(
-                is_valid=False,
-                confidence=0.0,
-                message="Geen gezicht gedetecteerd",
-                details={"error": "no_face_detected"}
-            )
+            return self._no_face_result()
 
         # zonder landmarks kunnen we de ogen niet vinden
-        if not face_detection.landmarks:
-            return self._create_result(
-                is_valid=False,
-                confidence=0.0,
-                message="Ogen konden niet worden gedetecteerd",
-                details={"error": "no_landmarks"}
-            )
-
         landmarks = face_detection.landmarks
+        if not landmarks:
+            return self._no_landmarks_result("Ogen konden niet worden gedetecteerd")
 
         # bereken hoe open elk oog is (eye aspect ratio)
         left_ear = self._calculate_eye_aspect_ratio(landmarks, eye='left')
         right_ear = self._calculate_eye_aspect_ratio(landmarks, eye='right')
 
-        # MediaPipe EAR waarden (gebaseerd op testdata):
-        # - Gesloten oog: ~0.15-0.22 (foto met dichte ogen gaf 0.175-0.212!)
-        # - Half open: ~0.20-0.25
-        # - Normaal open: ~0.25-0.35
-        # - Wijd open: ~0.35+
-
         # Check of ogen open genoeg zijn - verhoogd na testen met echte data
-        closed_threshold = 0.22  # onder dit zijn ogen waarschijnlijk dicht
-        left_eye_open = left_ear >= closed_threshold
-        right_eye_open = right_ear >= closed_threshold
-
-        # Score berekening: alles boven 0.25 is prima
-        min_acceptable = 0.25
-
-        if left_ear >= min_acceptable:
-            left_score = 1.0  # goed open
-        elif left_ear >= closed_threshold:
-            # half open - geef lagere maar acceptabele score
-            left_score = 0.6 + (left_ear - closed_threshold) / (min_acceptable - closed_threshold) * 0.4
-        else:
-            # echt dicht
-            left_score = max(0.0, left_ear / closed_threshold * 0.5)
+        left_eye_open = left_ear >= _CLOSED_THRESHOLD
+        right_eye_open = right_ear >= _CLOSED_THRESHOLD
 
-        if right_ear >= min_acceptable:
-            right_score = 1.0  # goed open
-        elif right_ear >= closed_threshold:
-            right_score = 0.6 + (right_ear - closed_threshold) / (min_acceptable - closed_threshold) * 0.4
-        else:
-            right_score = max(0.0, right_ear / closed_threshold * 0.5)
+        left_score = _ear_score(left_ear)
+        right_score = _ear_score(right_ear)
 
         # check of de ogen bedekt zijn (bv door bril reflectie of haar)
-        left_coverage = self._check_eye_coverage(photo, face_detection, eye='left')
-        right_coverage = self._check_eye_coverage(photo, face_detection, eye='right')
+        left_coverage, right_coverage = self._check_eye_coverage_both(photo, landmarks)
 
         coverage_score = (left_coverage + right_coverage) / 2
 
@@ -113,7 +111,7 @@ class EyeVisibilityValidator(BaseValidator):
         confidence = (eye_openness_score * 0.7 + coverage_score * 0.3)
 
         # Validatie: ogen moeten open zijn EN confidence hoog genoeg
-        # Als een oog echt dicht is (onder closed_threshold), is het NIET valid
+        # Als een oog echt dicht is (onder _CLOSED_THRESHOLD), is het NIET valid
         is_valid = confidence >= self.threshold and left_eye_open and right_eye_open
 
         # maak een duidelijke feedback message
@@ -161,72 +159,85 @@ class EyeVisibilityValidator(BaseValidator):
         # eye aspect ratio (EAR) is een formule om te meten hoe open een oog is
         # hoe hoger de waarde, hoe verder het oog open staat
 
-        key_prefix = f'{eye}_eye'
-
         # De face detection model berekent al de ratio (height/width)
         # en slaat deze op als '{eye}_eye_height' (eigenlijk de ratio)
-        if f'{key_prefix}_height' in landmarks:
+        ear = landmarks.get(_EAR_KEYS[eye])
+        if ear is not None:
             # Dit is al de eye aspect ratio (hoogte/breedte), niet de ruwe hoogte
-            ear = landmarks[f'{key_prefix}_height']
             return ear
         else:
             # als we geen landmarks hebben, weten we het niet - return lage waarde
             # zodat het niet automatisch als "open" wordt gezien
             return 0.10  # lage waarde = onbekend/gesloten
 
-    def _check_eye_coverage(
+    def _check_eye_coverage_both(
         self,
         photo: Photo,
-        face_detection: FaceDetectionResult,
-        eye: str
-    ) -> float:
+        landmarks: dict
+    ) -> tuple:
         """
-        Check of het oog bedekt is (reflectie, haar, etc.)
+        Check voor beide ogen of ze bedekt zijn (reflectie, haar, etc.)
+
+        Beide oog regio's worden uit dezelfde gedeelde grayscale foto gesneden,
+        zodat er per foto maar één grijs conversie is (die de andere validators
+        ook al gebruiken) in plaats van een cvtColor per oog.
 
         Args:
             photo: Photo object
-            face_detection: FaceDetectionResult
-            eye: 'left' of 'right'
+            landmarks: Dictionary met gezichtslandmarks
 
         Returns:
-            Score tussen 0.0 (volledig bedekt) en 1.0 (volledig zichtbaar)
+            Tuple (links, rechts) met scores tussen 0.0 (volledig bedekt) en 1.0 (volledig zichtbaar)
         """
-        import cv2
+        left_region = landmarks.get('left_eye_region')
+        right_region = landmarks.get('right_eye_region')
 
-        landmarks = face_detection.landmarks
-        key_prefix = f'{eye}_eye'
+        # als we geen expliciete regio hebben, wees dan voorzichtig
+        if left_region is None and right_region is None:
+            return 0.8, 0.8
+
+        gray = self._get_grayscale_image(photo)
+        return self._coverage_score(gray, left_region), self._coverage_score(gray, right_region)
+
+    @staticmethod
+    def _coverage_score(gray: np.ndarray, region: Optional[tuple]) -> float:
+        """
+        Bedekking score voor één oog regio in de grayscale foto
+
+        Args:
+            gray: Grayscale versie van de foto
+            region: (x, y, w, h) van het oog, of None als die onbekend is
+
+        Returns:
+            Score tussen 0.0 (volledig bedekt) en 1.0 (volledig zichtbaar)
+        """
+        if region is None:
+            return 0.8  # geen expliciete regio, wees voorzichtig
 
         # pak het stukje foto waar het oog zit
-        if f'{key_prefix}_region' in landmarks:
-            # als we weten waar het oog precies zit
-            x, y, w, h = landmarks[f'{key_prefix}_region']
-            eye_region = photo.image_data[y:y+h, x:x+w]
-
-            # check of we wel wat hebben gevonden
-            if eye_region.size == 0:
-                return 0.5  # we weten het niet zeker
-
-            # zet om naar grijstinten voor makkelijkere analyse
-            if len(eye_region.shape) == 3:
-                eye_gray = cv2.cvtColor(eye_region, cv2.COLOR_BGR2GRAY)
-            else:
-                eye_gray = eye_region
-
-            # tel hoeveel pixels heel erg licht zijn (reflectie!)
-            bright_pixels = np.sum(eye_gray > 240)
-            total_pixels = eye_gray.size
-            bright_ratio = bright_pixels / total_pixels
-
-            # als er veel super lichte pixels zijn, is er waarschijnlijk reflectie
-            if bright_ratio > 0.3:  # meer dan 30% = waarschijnlijk reflectie
-                return 0.5
-            elif bright_ratio > 0.15:  # tussen 15-30% = beetje reflectie
-                return 0.7
-            else:
-                return 1.0  # ziet er goed uit!
+        x, y, w, h = region
+        eye_gray = gray[y:y+h, x:x+w]
+
+        # check of we wel wat hebben gevonden
+        if eye_gray.size == 0:
+            return 0.5  # we weten het niet zeker
+
+        # tel hoeveel pixels heel erg licht zijn (reflectie!); compare +
+        # countNonZero telt in OpenCV zonder bool tussenresultaat in numpy
+        bright_pixels = cv2.countNonZero(cv2.compare(eye_gray, 240, cv2.CMP_GT))
+        bright_ratio = bright_pixels / eye_gray.size
+
+        # als er veel super lichte pixels zijn, is er waarschijnlijk reflectie
+        if bright_ratio > 0.3:  # meer dan 30% = waarschijnlijk reflectie
+            return 0.5
+        elif bright_ratio > 0.15:  # tussen 15-30% = beetje reflectie
+            return 0.7
         else:
-            # als we geen expliciete regio hebben, wees dan voorzichtig
-            return 0.8
+            return 1.0  # ziet er goed uit!
+
+    def requires_face(self) -> bool:
+        """Deze validator heeft een gedetecteerd gezicht nodig"""
+        return True
 
     def get_name(self) -> str:
         """Haal naam van validator op"""
@@ -4,7 +4,7 @@ Validator voor gezichtspositie controle
 from typing import Optional
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
-from .base_validator import BaseValidator, ValidatorConfig
+from .base_validator import BaseValidator, ValidatorConfig, linear_decay
 
 
 class FacePositionValidator(BaseValidator):
@@ -53,12 +53,7 @@ class FacePositionValidator(BaseValidator):
 
         # Face detection is verplicht voor deze validator
         if not face_detection or not face_detection.face_found:
-            return self._create_result(
-                is_valid=False,
-                confidence=0.0,
-                message="Geen gezicht gedetecteerd. Zorg dat uw gezicht zichtbaar is",
-                details={"error": "no_face_detected"}
-            )
+            return self._no_face_result("Geen gezicht gedetecteerd. Zorg dat uw gezicht zichtbaar is")
 
         if not face_detection.face_bbox:
             return self._create_result(
@@ -73,12 +68,14 @@ class FacePositionValidator(BaseValidator):
         img_center_x = img_width / 2
         img_center_y = img_height / 2
 
-        # Haal gezichtsinformatie op
-        face_center = face_detection.get_face_center()
-        face_size = face_detection.get_face_size()
+        # Haal gezichtsinformatie op: bbox één keer uitpakken en centrum en
+        # oppervlakte hier uitrekenen (zelfde als get_face_center/get_face_size)
         x, y, w, h = face_detection.face_bbox
+        face_x = x + w // 2
+        face_y = y + h // 2
+        face_size = w * h
 
-        if not face_center or not face_size:
+        if not face_size:
             return self._create_result(
                 is_valid=False,
                 confidence=0.0,
@@ -86,48 +83,31 @@ class FacePositionValidator(BaseValidator):
                 details={"error": "invalid_face_data"}
             )
 
-        face_x, face_y = face_center
-
         # 1. Check centering (horizontaal en verticaal)
         center_offset_x = abs(face_x - img_center_x) / img_width
         center_offset_y = abs(face_y - img_center_y) / img_height
         max_center_offset = max(center_offset_x, center_offset_y)
 
-        if max_center_offset <= self._center_tolerance:
-            centering_score = 1.0
-        else:
-            # Lineair afnemen bij grotere afwijking
-            centering_score = max(0.0, 1.0 - (max_center_offset - self._center_tolerance) / self._center_tolerance)
+        # Lineair afnemen bij grotere afwijking
+        centering_score = linear_decay(max_center_offset - self._center_tolerance, self._center_tolerance)
 
         # 2. Check grootte (afstand)
         img_size = img_width * img_height
         face_size_ratio = face_size / img_size
 
-        if self._min_size_ratio <= face_size_ratio <= self._max_size_ratio:
-            size_score = 1.0
+        # Buiten het bereik lineair afnemen: te klein (te ver weg) relatief aan
+        # de minimum ratio, te groot (te dichtbij) relatief aan de maximum ratio
+        if face_size_ratio < self._min_size_ratio:
+            size_score = linear_decay(self._min_size_ratio - face_size_ratio, self._min_size_ratio)
         else:
-            if face_size_ratio < self._min_size_ratio:
-                # Te klein (te ver weg)
-                distance = self._min_size_ratio - face_size_ratio
-                size_score = max(0.0, 1.0 - (distance / self._min_size_ratio))
-            else:
-                # Te groot (te dichtbij)
-                distance = face_size_ratio - self._max_size_ratio
-                size_score = max(0.0, 1.0 - (distance / self._max_size_ratio))
+            size_score = linear_decay(face_size_ratio - self._max_size_ratio, self._max_size_ratio)
 
         # 3. Check aspect ratio (gezicht moet redelijk proportioneel zijn)
         aspect_ratio = w / h if h > 0 else 0
         # Gezicht bounding box is typisch breder dan hoog of ongeveer gelijk
-        # Acceptabel bereik: 0.55 - 1.1 (gezicht is meestal smaller dan vierkant)
-        if 0.55 <= aspect_ratio <= 1.1:
-            aspect_score = 1.0
-        else:
-            # Buiten bereik - bereken penalty
-            if aspect_ratio < 0.55:
-                aspect_distance = 0.55 - aspect_ratio
-            else:
-                aspect_distance = aspect_ratio - 1.1
-            aspect_score = max(0.0, 1.0 - aspect_distance * 2)
+        # Acceptabel bereik: 0.55 - 1.1 (gezicht is meestal smaller dan vierkant),
+        # daarbuiten 0.0 bij een afstand van 0.5 tot het bereik
+        aspect_score = linear_decay(max(0.55 - aspect_ratio, aspect_ratio - 1.1), 0.5)
 
         # Combineer scores
         confidence = (centering_score * 0.4 + size_score * 0.4 + aspect_score * 0.2)
@@ -171,6 +151,10 @@ class FacePositionValidator(BaseValidator):
 
         return self._create_result(is_valid, confidence, message, details)
 
+    def requires_face(self) -> bool:
+        """Deze validator heeft een gedetecteerd gezicht nodig"""
+        return True
+
     def get_name(self) -> str:
         """Haal naam van validator op"""
         return "FacePositionValidator"
@@ -9,6 +9,21 @@ from ..models.photo import Photo, ValidationResult, FaceDetectionResult
 from .base_validator import BaseValidator, ValidatorConfig
 
 
+# maximaal aantal pixels waarop het voorhoofd geanalyseerd wordt (~64x64)
+_ANALYSIS_PIXELS = 64 * 64
+
+# huid in HSV: de donkere-huid range [0,10,40]-[25,200,255] plus het deel van
+# de gewone range [0,20,70]-[20,255,255] met saturatie boven 200
+_SKIN_LOWER = np.array([0, 10, 40], dtype=np.uint8)
+_SKIN_UPPER = np.array([25, 200, 255], dtype=np.uint8)
+_SKIN_HIGH_SAT_LOWER = np.array([0, 201, 70], dtype=np.uint8)
+_SKIN_HIGH_SAT_UPPER = np.array([20, 255, 255], dtype=np.uint8)
+# gedeeld door alle validate() calls, dus niet per ongeluk aanpasbaar
+for _bound in (_SKIN_LOWER, _SKIN_UPPER, _SKIN_HIGH_SAT_LOWER, _SKIN_HIGH_SAT_UPPER):
+    _bound.setflags(write=False)
+del _bound
+
+
 class HeadwearValidator(BaseValidator):
     """
     Valideert dat er geen hoofddeksel wordt gedragen
@@ -42,56 +57,73 @@ class HeadwearValidator(BaseValidator):
         self._validate_image_data(photo)
 
         if not face_detection or not face_detection.face_found or not face_detection.face_bbox:
-            return self._create_result(
-                is_valid=False,
-                confidence=0.0,
-                message="Geen gezicht gedetecteerd",
-                details={"error": "no_face_detected"}
-            )
+            return self._no_face_result()
 
         # Haal gezichtsinformatie op
         x, y, w, h = face_detection.face_bbox
-        img_height, img_width = photo.image_data.shape[:2]
 
         # Check het gebied boven het voorhoofd
         # Als daar iets is (niet huid-kleurig), kan het een hoofddeksel zijn
         forehead_top = max(0, y - int(h * 0.3))  # 30% boven de face bbox
-        forehead_region = photo.image_data[forehead_top:y, x:x+w]
 
-        if forehead_region.size == 0:
-            return self._create_result(
-                is_valid=True,
-                confidence=0.8,
-                message="Geen hoofddeksel gedetecteerd",
-                details={"note": "small_region"}
-            )
-
-        # Analyseer de kleuren in het voorhoofd gebied
-        # Huid heeft typisch bepaalde HSV waarden
-        hsv = cv2.cvtColor(forehead_region, cv2.COLOR_BGR2HSV)
+        # Gezicht tegen de bovenrand (of lege bbox): dan is er geen voorhoofd
+        # gebied en hoeven we niet eens te slicen
+        if forehead_top >= y or w <= 0:
+            return self._small_region_result()
 
-        # Skin tone ranges in HSV
-        lower_skin = np.array([0, 20, 70], dtype=np.uint8)
-        upper_skin = np.array([20, 255, 255], dtype=np.uint8)
-
-        # Tweede range voor donkerdere huid
-        lower_skin2 = np.array([0, 10, 40], dtype=np.uint8)
-        upper_skin2 = np.array([25, 200, 255], dtype=np.uint8)
+        forehead_region = photo.image_data[forehead_top:y, x:x+w]
 
-        skin_mask1 = cv2.inRange(hsv, lower_skin, upper_skin)
-        skin_mask2 = cv2.inRange(hsv, lower_skin2, upper_skin2)
-        skin_mask = cv2.bitwise_or(skin_mask1, skin_mask2)
+        # bbox (deels) buiten de foto
+        if forehead_region.size == 0:
+            return self._small_region_result()
+
+        # Alle metingen zijn verhoudingen of een spreiding, daarvoor is een
+        # steekproef van ~64x64 pixels genoeg. INTER_NEAREST pakt echte pixels
+        # (geen middeling), zodat drempel tellingen als de donkere ratio niet
+        # verschuiven zoals bij INTER_AREA
+        region_h, region_w = forehead_region.shape[:2]
+        if region_h * region_w > _ANALYSIS_PIXELS:
+            scale = np.sqrt(_ANALYSIS_PIXELS / (region_h * region_w))
+            size = (max(1, int(region_w * scale)), max(1, int(region_h * scale)))
+            forehead_region = cv2.resize(forehead_region, size, interpolation=cv2.INTER_NEAREST)
+
+        region_pixels = forehead_region.shape[0] * forehead_region.shape[1]
+
+        if forehead_region.ndim == 2:
+            # Grayscale foto: zonder kleur is de saturatie overal 0, dus er is
+            # geen huid in HSV zin en het gebied is zelf al het grijs beeld.
+            # Geen omzetting naar BGR/HSV nodig
+            gray = forehead_region
+            skin_pixels = 0
+        else:
+            # Analyseer de kleuren in het voorhoofd gebied
+            # Huid heeft typisch bepaalde HSV waarden
+            hsv = cv2.cvtColor(forehead_region, cv2.COLOR_BGR2HSV)
+
+            # Skin tone ranges in HSV: [0,20,70]-[20,255,255] en voor donkerdere huid
+            # [0,10,40]-[25,200,255]. De vereniging tellen we als de tweede range plus
+            # het stuk van de eerste dat daar buiten valt (S > 200); die twee overlappen
+            # niet, dus de aantallen kunnen gewoon opgeteld worden zonder bitwise_or.
+            # Beide inRange calls schrijven in hetzelfde masker
+            mask = cv2.inRange(hsv, _SKIN_LOWER, _SKIN_UPPER)
+            skin_pixels = cv2.countNonZero(mask)
+            cv2.inRange(hsv, _SKIN_HIGH_SAT_LOWER, _SKIN_HIGH_SAT_UPPER, dst=mask)
+            skin_pixels += cv2.countNonZero(mask)
+
+            gray = cv2.cvtColor(forehead_region, cv2.COLOR_BGR2GRAY)
 
         # Bereken hoeveel van het gebied huidkleurig is
-        skin_ratio = np.sum(skin_mask > 0) / skin_mask.size
+        skin_ratio = skin_pixels / region_pixels
 
         # Check ook voor donkere pixels (pet/hoed is vaak donker)
-        gray = cv2.cvtColor(forehead_region, cv2.COLOR_BGR2GRAY)
-        dark_ratio = np.sum(gray < 60) / gray.size
+        dark_ratio = cv2.countNonZero(cv2.compare(gray, 60, cv2.CMP_LT)) / region_pixels
 
         # Check voor uniforme niet-huid kleuren (typisch voor petten)
-        # Bereken kleur variatie
-        std_color = np.std(forehead_region)
+        # Kleur variatie over alle kanalen samen (zelfde als np.std van de regio).
+        # Als één kanaal bekeken (rijen van w*3 waardes, een view want elke rij
+        # is aaneengesloten) geeft één meanStdDev pass dat direct
+        _, std = cv2.meanStdDev(forehead_region.reshape(forehead_region.shape[0], -1))
+        std_color = float(std[0, 0])
 
         # Bepaal of er een hoofddeksel is
         has_headwear = False
@@ -128,6 +160,24 @@ class HeadwearValidator(BaseValidator):
 
         return self._create_result(is_valid, confidence, message, details)
 
+    def _small_region_result(self) -> ValidationResult:
+        """
+        Resultaat als er boven het gezicht geen gebied is om te analyseren
+
+        Returns:
+            Valid ValidationResult met iets lagere confidence
+        """
+        return self._create_result(
+            is_valid=True,
+            confidence=0.8,
+            message="Geen hoofddeksel gedetecteerd",
+            details={"note": "small_region"}
+        )
+
+    def requires_face(self) -> bool:
+        """Deze validator heeft een gedetecteerd gezicht nodig"""
+        return True
+
     def get_name(self) -> str:
         """Haal naam van validator op"""
         return "HeadwearValidator"
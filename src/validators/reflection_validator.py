@@ -6,7 +6,14 @@ import cv2
 from typing import Optional
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
-from .base_validator import BaseValidator, ValidatorConfig
+from .base_validator import BaseValidator, ValidatorConfig, linear_decay
+
+
+# kernel voor het wegfilteren van ruis in het reflectie masker, één keer gemaakt
+_OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+
+# minimum oppervlakte (pixels) van een significante reflectie
+_MIN_REFLECTION_AREA = 50
 
 
 class ReflectionValidator(BaseValidator):
@@ -62,48 +69,47 @@ class ReflectionValidator(BaseValidator):
         else:
             analysis_region = gray
 
-        # Detect zeer heldere pixels (mogelijke reflecties)
-        _, bright_mask = cv2.threshold(
+        # Detect zeer heldere pixels (mogelijke reflecties). Threshold en
+        # opening schrijven allebei in hetzelfde masker buffer
+        bright_mask = self._get_buffer("mask", analysis_region.shape)
+        cv2.threshold(
             analysis_region,
             self._brightness_threshold,
             255,
-            cv2.THRESH_BINARY
+            cv2.THRESH_BINARY,
+            dst=bright_mask
         )
 
         # Morfologische operaties om kleine ruis te verwijderen
-        kernel = np.ones((3, 3), np.uint8)
-        bright_mask = cv2.morphologyEx(bright_mask, cv2.MORPH_OPEN, kernel)
+        cv2.morphologyEx(bright_mask, cv2.MORPH_OPEN, _OPEN_KERNEL, dst=bright_mask)
 
         # Tel reflectie pixels
-        reflection_pixels = np.sum(bright_mask > 0)
+        reflection_pixels = cv2.countNonZero(bright_mask)
         total_pixels = analysis_region.size
         reflection_ratio = reflection_pixels / total_pixels
 
-        # Vind connected components (clusters van heldere pixels)
-        num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(
-            bright_mask, connectivity=8
-        )
-
-        # Filter kleine components (ruis)
-        significant_reflections = 0
-        large_reflections = []
-
-        for i in range(1, num_labels):  # Skip 0 (background)
-            area = stats[i, cv2.CC_STAT_AREA]
-            if area > 50:  # Minimum area voor significante reflectie
-                significant_reflections += 1
-                large_reflections.append({
-                    'area': area,
-                    'center': centroids[i].tolist()
-                })
+        # Vind connected components (clusters van heldere pixels). Met niet meer
+        # heldere pixels dan de minimum oppervlakte kan geen enkele cluster
+        # significant zijn; dan is de (dure) labeling niet nodig
+        large_areas = large_centers = np.empty(0)
+        if reflection_pixels > _MIN_REFLECTION_AREA:
+            _, _, stats, centroids = cv2.connectedComponentsWithStats(
+                bright_mask, connectivity=8
+            )
+
+            # Filter kleine components (ruis) in numpy; de significante
+            # reflecties worden pas Python objecten als de details gelezen
+            # worden. Label 0 is de achtergrond
+            areas = stats[1:, cv2.CC_STAT_AREA]
+            significant = np.flatnonzero(areas > _MIN_REFLECTION_AREA)
+            large_areas = areas[significant]
+            large_centers = centroids[significant + 1]
+
+        significant_reflections = len(large_areas)
 
         # Bereken confidence score
         # Factor 1: Totale reflectie ratio
-        if reflection_ratio <= self._max_reflection_ratio:
-            ratio_score = 1.0
-        else:
-            excess = reflection_ratio - self._max_reflection_ratio
-            ratio_score = max(0.0, 1.0 - (excess / self._max_reflection_ratio))
+        ratio_score = linear_decay(reflection_ratio - self._max_reflection_ratio, self._max_reflection_ratio)
 
         # Factor 2: Aantal significante reflecties
         if significant_reflections == 0:
@@ -129,14 +135,18 @@ class ReflectionValidator(BaseValidator):
         else:
             message = "Lichte reflectie gedetecteerd. Pas positie of belichting aan"
 
-        details = {
-            "reflection_ratio": float(reflection_ratio),
-            "reflection_pixels": int(reflection_pixels),
-            "significant_reflections": significant_reflections,
-            "large_reflections": large_reflections,
-            "ratio_score": float(ratio_score),
-            "count_score": float(count_score)
-        }
+        def details():
+            return {
+                "reflection_ratio": float(reflection_ratio),
+                "reflection_pixels": int(reflection_pixels),
+                "significant_reflections": significant_reflections,
+                "large_reflections": [
+                    {'area': area, 'center': center}
+                    for area, center in zip(large_areas.tolist(), large_centers.tolist())
+                ],
+                "ratio_score": float(ratio_score),
+                "count_score": float(count_score)
+            }
 
         return self._create_result(is_valid, confidence, message, details)
 
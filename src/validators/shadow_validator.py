@@ -6,7 +6,11 @@ import cv2
 from typing import Optional
 
 from ..models.photo import Photo, ValidationResult, FaceDetectionResult
-from .base_validator import BaseValidator, ValidatorConfig
+from .base_validator import BaseValidator, ValidatorConfig, downscale_region, linear_decay, padded_region
+
+
+# kernel voor het wegfilteren van ruis in het schaduw masker, één keer gemaakt
+_OPEN_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
 
 
 class ShadowValidator(BaseValidator):
@@ -55,56 +59,60 @@ class ShadowValidator(BaseValidator):
 
         # Als gezicht gedetecteerd is, focus op gezichtsregio
         if face_detection and face_detection.face_found and face_detection.face_bbox:
-            x, y, w, h = face_detection.face_bbox
+            bbox = face_detection.face_bbox
             # Voeg wat padding toe om nek/schouders mee te nemen
-            padding = int(h * 0.2)
-            x = max(0, x - padding)
-            y = max(0, y - padding)
-            w = min(gray.shape[1] - x, w + 2 * padding)
-            h = min(gray.shape[0] - y, h + 2 * padding)
-            analysis_region = gray[y:y+h, x:x+w]
+            analysis_region = padded_region(gray, bbox, int(bbox[3] * 0.2))
         else:
             analysis_region = gray
 
-        # Detect zeer donkere pixels (mogelijke schaduwen)
-        _, dark_mask = cv2.threshold(
+        # Grote regio's (DSLR/4K foto's, of de hele foto zonder gezicht)
+        # verkleinen: schaduwen zijn grote vlakken, dus de ratio's en std
+        # blijven vrijwel gelijk bij veel minder pixels
+        analysis_region, scale = downscale_region(analysis_region)
+
+        # Detect zeer donkere pixels (mogelijke schaduwen). Threshold en
+        # opening schrijven allebei in hetzelfde masker buffer
+        dark_mask = self._get_buffer("mask", analysis_region.shape)
+        cv2.threshold(
             analysis_region,
             self._darkness_threshold,
             255,
-            cv2.THRESH_BINARY_INV
+            cv2.THRESH_BINARY_INV,
+            dst=dark_mask
         )
 
         # Morfologische operaties om kleine ruis te verwijderen
-        kernel = np.ones((5, 5), np.uint8)
-        dark_mask = cv2.morphologyEx(dark_mask, cv2.MORPH_OPEN, kernel)
+        cv2.morphologyEx(dark_mask, cv2.MORPH_OPEN, _OPEN_KERNEL, dst=dark_mask)
 
         # Tel schaduw pixels
-        shadow_pixels = np.sum(dark_mask > 0)
+        shadow_pixels = cv2.countNonZero(dark_mask)
         total_pixels = analysis_region.size
         shadow_ratio = shadow_pixels / total_pixels
 
-        # Detect edges in shadow mask voor harde schaduw grenzen
-        edges = cv2.Canny(dark_mask, 50, 150)
-        edge_pixels = np.sum(edges > 0)
-
-        # Bereken standaard deviatie van brightness (uniformiteit)
-        std_dev = np.std(analysis_region)
+        # Detect edges in shadow mask voor harde schaduw grenzen. Een masker
+        # zonder (of met alleen) schaduw is egaal en heeft geen edges; dat is
+        # het gewone geval bij een goed belichte foto, dan kan Canny over
+        edge_pixels = 0
+        if 0 < shadow_pixels < total_pixels:
+            edges = cv2.Canny(dark_mask, 50, 150, edges=self._get_buffer("edges", analysis_region.shape))
+            edge_pixels = cv2.countNonZero(edges)
+        # edges zijn lijnen van ~1 pixel breed: hun aantal schaalt met de zijde,
+        # het totaal aantal pixels met het kwadraat. Terugrekenen naar de
+        # originele resolutie
+        edge_ratio = edge_pixels / total_pixels * scale
+
+        # Bereken standaard deviatie van brightness (uniformiteit); meanStdDev
+        # doet dat in één pass op de uint8 data, zonder float64 kopie
+        _, stddev = cv2.meanStdDev(analysis_region)
+        std_dev = float(stddev[0, 0])
 
         # Bereken confidence score
         # Factor 1: Totale schaduw ratio
-        if shadow_ratio <= self._max_shadow_ratio:
-            ratio_score = 1.0
-        else:
-            excess = shadow_ratio - self._max_shadow_ratio
-            ratio_score = max(0.0, 1.0 - (excess / self._max_shadow_ratio))
+        ratio_score = linear_decay(shadow_ratio - self._max_shadow_ratio, self._max_shadow_ratio)
 
         # Factor 2: Harde schaduw grenzen
         # Minder edges = zachtere overgangen = beter
-        edge_ratio = edge_pixels / total_pixels
-        if edge_ratio < 0.02:
-            edge_score = 1.0
-        else:
-            edge_score = max(0.0, 1.0 - (edge_ratio - 0.02) / 0.05)
+        edge_score = linear_decay(edge_ratio - 0.02, 0.05)
 
         # Factor 3: Uniformiteit (lagere std = uniformer = beter)
         if std_dev < 30:
@@ -112,7 +120,7 @@ class ShadowValidator(BaseValidator):
         elif std_dev < 50:
             uniformity_score = 0.8
         else:
-            uniformity_score = max(0.0, 1.0 - (std_dev - 50) / 50)
+            uniformity_score = linear_decay(std_dev - 50, 50)
 
         # Combineer scores
         confidence = (ratio_score * 0.5 + edge_score * 0.3 + uniformity_score * 0.2)
@@ -132,15 +140,16 @@ class ShadowValidator(BaseValidator):
         else:
             message = "Lichte schaduwen gedetecteerd. Pas belichting aan voor optimaal resultaat"
 
-        details = {
-            "shadow_ratio": float(shadow_ratio),
-            "shadow_pixels": int(shadow_pixels),
-            "edge_ratio": float(edge_ratio),
-            "std_deviation": float(std_dev),
-            "ratio_score": float(ratio_score),
-            "edge_score": float(edge_score),
-            "uniformity_score": float(uniformity_score)
-        }
+        def details():
+            return {
+                "shadow_ratio": float(shadow_ratio),
+                "shadow_pixels": int(round(shadow_pixels / (scale * scale))),
+                "edge_ratio": float(edge_ratio),
+                "std_deviation": float(std_dev),
+                "ratio_score": float(ratio_score),
+                "edge_score": float(edge_score),
+                "uniformity_score": float(uniformity_score)
+            }
 
         return self._create_result(is_valid, confidence, message, details)
 
@@ -2,15 +2,18 @@
 Test script om validators te testen met echte foto's
 """
 import cv2
+import io
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
 from pathlib import Path
 
 # Voeg src toe aan path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.models.photo import Photo
-from src.models.face_detection_model import FaceDetectionModel
+from src.models.face_detection_model import FaceDetectionModelFactory
 from src.validators.brightness_validator import BrightnessValidator
 from src.validators.sharpness_validator import SharpnessValidator
 from src.validators.face_position_validator import FacePositionValidator
@@ -20,65 +23,120 @@ from src.validators.reflection_validator import ReflectionValidator
 from src.validators.shadow_validator import ShadowValidator
 from src.validators.headwear_validator import HeadwearValidator
 from src.validators.background_validator import BackgroundValidator
+from src.validators.base_validator import get_grayscale_image
 
+# Per-worker validators (worden één keer per proces aangemaakt in _worker_init)
+_worker_validators = None
 
-def validate_photo(image_path: str, expected_valid: bool):
-    """Test een foto met alle validators (helper functie, geen pytest test)"""
-    print(f"\n{'='*60}")
-    print(f"Testing: {os.path.basename(image_path)}")
-    print(f"Expected: {'APPROVED' if expected_valid else 'REJECTED'}")
-    print(f"{'='*60}")
+
+def create_validators():
+    """Maak de validators één keer aan; ze hebben geen state per foto en worden gedeeld"""
+    return [
+        BrightnessValidator(),
+        SharpnessValidator(),
+        FacePositionValidator(),
+        FacialExpressionValidator(),
+        EyeVisibilityValidator(),
+        ReflectionValidator(),
+        ShadowValidator(),
+        HeadwearValidator(),
+        BackgroundValidator(),
+    ]
+
+
+def _worker_init():
+    """Initialiseer een worker proces met eigen validators (MediaPipe wordt per proces geladen)"""
+    global _worker_validators
+    _worker_validators = create_validators()
+
+
+def _process_photo(job):
+    """
+    Test één foto in een worker proces
+
+    Args:
+        job: (category, image_path, expected_valid)
+
+    Returns:
+        (category, filename, match, output) met de geprinte output als string
+    """
+    category, image_path, expected_valid = job
+    out = io.StringIO()
+    match = validate_photo(image_path, expected_valid, _worker_validators, out=out, parallel=False)
+    return category, os.path.basename(image_path), match, out.getvalue()
+
+
+def validate_photo(image_path: str, expected_valid: bool, validators=None, out=None, parallel: bool = True):
+    """
+    Test een foto met alle validators (helper functie, geen pytest test)
+
+    Args:
+        image_path: Pad naar de foto
+        expected_valid: Of de foto goedgekeurd zou moeten worden
+        validators: Validators om te gebruiken (default: create_validators())
+        out: Stream voor de output (default: stdout)
+        parallel: Validators parallel in threads draaien (uit in worker processen)
+
+    Returns:
+        Of het resultaat overeenkomt met de verwachting
+    """
+    print(f"\n{'='*60}", file=out)
+    print(f"Testing: {os.path.basename(image_path)}", file=out)
+    print(f"Expected: {'APPROVED' if expected_valid else 'REJECTED'}", file=out)
+    print(f"{'='*60}", file=out)
 
     # Laad image
     image = cv2.imread(image_path)
     if image is None:
-        print(f"ERROR: Could not load image: {image_path}")
+        print(f"ERROR: Could not load image: {image_path}", file=out)
         return False
 
-    # Maak Photo object
+    # Maak Photo object; de grayscale versie wordt hierop één keer berekend
+    # en door alle validators gedeeld
     photo = Photo(image_data=image)
 
-    # Face detection
-    face_model = FaceDetectionModel(min_detection_confidence=0.4)
+    # Face detection; het MediaPipe model wordt via de factory maar één keer
+    # geladen in plaats van per foto
+    face_model = FaceDetectionModelFactory.create_mediapipe_model(min_detection_confidence=0.4)
     face_result = face_model.detect_face(image)
 
-    print(f"\nFace Detection:")
-    print(f"  - Face found: {face_result.face_found}")
-    print(f"  - Confidence: {face_result.confidence:.2f}")
+    print(f"\nFace Detection:", file=out)
+    print(f"  - Face found: {face_result.face_found}", file=out)
+    print(f"  - Confidence: {face_result.confidence:.2f}", file=out)
     if face_result.landmarks:
         if 'left_eye_height' in face_result.landmarks:
-            print(f"  - Left eye EAR: {face_result.landmarks['left_eye_height']:.3f}")
+            print(f"  - Left eye EAR: {face_result.landmarks['left_eye_height']:.3f}", file=out)
         if 'right_eye_height' in face_result.landmarks:
-            print(f"  - Right eye EAR: {face_result.landmarks['right_eye_height']:.3f}")
-
-    # Initialiseer validators
-    validators = [
-        BrightnessValidator(),
-        SharpnessValidator(),
-        FacePositionValidator(),
-        FacialExpressionValidator(),
-        EyeVisibilityValidator(),
-        ReflectionValidator(),
-        ShadowValidator(),
-        HeadwearValidator(),
-        BackgroundValidator(),
-    ]
+            print(f"  - Right eye EAR: {face_result.landmarks['right_eye_height']:.3f}", file=out)
+
+    if validators is None:
+        validators = create_validators()
+
+    # Run alle validators parallel: OpenCV geeft de GIL vrij, en de grayscale
+    # versie wordt vooraf berekend zodat alle threads dezelfde (read-only) data lezen.
+    # Resultaten worden in de vaste volgorde van de validators geprint. In een
+    # worker proces zijn de cores al bezet door de andere workers
+    get_grayscale_image(photo)
+    if parallel:
+        with ThreadPoolExecutor(max_workers=min(len(validators), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(validator.validate, photo, face_result) for validator in validators]
+            results = [future.result() for future in futures]
+    else:
+        results = [validator.validate(photo, face_result) for validator in validators]
 
-    # Run alle validators
     all_valid = True
-    print(f"\nValidator Results:")
-    for validator in validators:
-        result = validator.validate(photo, face_result)
+    print(f"\nValidator Results:", file=out)
+    for validator, result in zip(validators, results):
         status = "PASS" if result.is_valid else "FAIL"
-        print(f"  [{status}] {validator.get_name()}: {result.message} (conf: {result.confidence:.2f})")
+        print(f"  [{status}] {validator.get_name()}: {result.message} (conf: {result.confidence:.2f})", file=out)
 
         # Print details voor debugging
         if not result.is_valid and result.details:
             for key, value in result.details.items():
                 if isinstance(value, float):
-                    print(f"         - {key}: {value:.3f}")
+                    print(f"         - {key}: {value:.3f}", file=out)
                 elif key != 'error':
-                    print(f"         - {key}: {value}")
+                    print(f"         - {key}: {value}", file=out)
 
         if not result.is_valid:
             all_valid = False
@@ -88,8 +146,8 @@ def validate_photo(image_path: str, expected_valid: bool):
     expected_result = "APPROVED" if expected_valid else "REJECTED"
     match = actual_result == expected_result
 
-    print(f"\nFinal Result: {actual_result}")
-    print(f"Match with expected: {'YES' if match else 'NO'}")
+    print(f"\nFinal Result: {actual_result}", file=out)
+    print(f"Match with expected: {'YES' if match else 'NO'}", file=out)
 
     return match
 
@@ -101,31 +159,33 @@ def main():
     approved_path = base_path / "approved"
     rejected_path = base_path / "rejected"
 
+    headers = {
+        "approved": "TESTING APPROVED PHOTOS (should all pass)",
+        "rejected": "TESTING REJECTED PHOTOS (should all fail)",
+    }
+
+    jobs = []
+    for category, path, expected_valid in (("approved", approved_path, True), ("rejected", rejected_path, False)):
+        if path.exists():
+            jobs.extend((category, str(photo_file), expected_valid) for photo_file in path.glob("*.jpg"))
+        else:
+            print(f"{category.capitalize()} folder not found: {path}")
+
+    # Foto's zijn onafhankelijk van elkaar en worden parallel getest in een
+    # multiprocessing Pool; elke worker heeft eigen validators en een eigen
+    # MediaPipe model (graph objecten zijn niet te picklen). imap houdt de
+    # volgorde vast zodat de output gelijk blijft aan een sequentiële run
     results = []
-
-    # Test approved photos
-    print("\n" + "="*70)
-    print("TESTING APPROVED PHOTOS (should all pass)")
-    print("="*70)
-
-    if approved_path.exists():
-        for photo_file in approved_path.glob("*.jpg"):
-            match = validate_photo(str(photo_file), expected_valid=True)
-            results.append(("approved", photo_file.name, match))
-    else:
-        print(f"Approved folder not found: {approved_path}")
-
-    # Test rejected photos
-    print("\n" + "="*70)
-    print("TESTING REJECTED PHOTOS (should all fail)")
-    print("="*70)
-
-    if rejected_path.exists():
-        for photo_file in rejected_path.glob("*.jpg"):
-            match = validate_photo(str(photo_file), expected_valid=False)
-            results.append(("rejected", photo_file.name, match))
-    else:
-        print(f"Rejected folder not found: {rejected_path}")
+    current_category = None
+    with Pool(processes=os.cpu_count(), initializer=_worker_init) as pool:
+        for category, filename, match, output in pool.imap(_process_photo, jobs):
+            if category != current_category:
+                current_category = category
+                print("\n" + "="*70)
+                print(headers[category])
+                print("="*70)
+            print(output, end="")
+            results.append((category, filename, match))
 
     # Summary
     print("\n" + "="*70)
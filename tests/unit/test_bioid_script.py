@@ -0,0 +1,57 @@
+"""
+Smoke test voor het BioID test script (parallelle run met worker processen)
+"""
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="module")
+def bioid_script():
+    """Laad scripts/test_with_bioid.py als module (scripts is geen package)"""
+    path = Path(__file__).parents[2] / "scripts" / "test_with_bioid.py"
+    spec = importlib.util.spec_from_file_location("test_with_bioid", path)
+    module = importlib.util.module_from_spec(spec)
+    # registreren zodat de worker processen de functies van de Pool terugvinden
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules[spec.name]
+
+
+@pytest.fixture
+def dataset_path(tmp_path, bioid_script):
+    """Map met drie gegenereerde BioID-achtige .pgm images"""
+    images = tmp_path / "images"
+    images.mkdir()
+    rng = np.random.default_rng(0)
+    for i in range(3):
+        image = rng.integers(0, 256, bioid_script.BIOID_IMAGE_SHAPE, dtype=np.uint8)
+        cv2.imwrite(str(images / f"BioID_{i:04d}.pgm"), image)
+    return images
+
+
+class TestBioIDScript:
+    """Test suite voor het BioID test script"""
+
+    def test_parallel_run_finishes(self, bioid_script, dataset_path):
+        """test_all met twee workers verwerkt alle images (en blijft niet hangen)"""
+        tester = bioid_script.BioIDTester(dataset_path=str(dataset_path))
+        # het hoofdproces laadt het model al vóór de fork, zoals een eerdere
+        # sequentiële run zou doen
+        tester.face_model
+
+        # in een thread met timeout, zodat een hangende worker de test laat
+        # falen in plaats van de hele test run te blokkeren
+        results = []
+        run = threading.Thread(target=lambda: results.extend(tester.test_all(workers=2)), daemon=True)
+        run.start()
+        run.join(timeout=60)
+
+        assert not run.is_alive(), "test_all hangt"
+        assert sorted(r['filename'] for r in results) == [f"BioID_{i:04d}.pgm" for i in range(3)]
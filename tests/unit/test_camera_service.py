@@ -0,0 +1,74 @@
+"""
+Unit tests voor CameraService
+"""
+import pytest
+import numpy as np
+
+from src.services.camera_service import CameraService, PhotoBoothCameraService
+
+
+class FakeCapture:
+    """VideoCapture die genummerde frames in de meegegeven buffer schrijft"""
+
+    def __init__(self, shape=(48, 64, 3)):
+        self.shape = shape
+        self.count = 0
+
+    def grab(self):
+        self.count += 1
+        return True
+
+    def retrieve(self, image=None):
+        if image is None or image.shape != self.shape:
+            image = np.empty(self.shape, dtype=np.uint8)
+        image[:] = self.count
+        return True, image
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def camera():
+    """CameraService met een nep camera"""
+    service = CameraService()
+    service._camera = FakeCapture()
+    service._is_initialized = True
+    return service
+
+
+class TestCameraService:
+    """Test suite voor CameraService"""
+
+    def test_get_frame_reuses_buffers(self, camera):
+        """Frames worden om de beurt in dezelfde buffers gelezen"""
+        frames = [camera.get_frame() for _ in range(CameraService._FRAME_BUFFERS + 1)]
+
+        assert frames[-1] is frames[0]
+        assert len({id(frame) for frame in frames}) == CameraService._FRAME_BUFFERS
+        assert frames[-1][0, 0, 0] == CameraService._FRAME_BUFFERS + 1
+
+    def test_capture_photo_copies_frame(self, camera):
+        """De photo houdt zijn eigen kopie, ook als de buffers hergebruikt worden"""
+        photo = camera.capture_photo()
+
+        for _ in range(CameraService._FRAME_BUFFERS):
+            camera.get_frame()
+
+        assert photo.image_data[0, 0, 0] == 1
+        assert photo.metadata["resolution"] == "64x48"
+
+
+class TestPhotoBoothCameraService:
+    """Test suite voor PhotoBoothCameraService"""
+
+    def test_overlay_is_drawn_in_frame_buffer(self):
+        """De overlay wordt in de frame buffer zelf getekend, zonder kopie"""
+        camera = PhotoBoothCameraService()
+        camera._camera = FakeCapture(shape=(480, 640, 3))
+        camera._is_initialized = True
+
+        frame = camera.get_preview_with_overlay(overlay_type="guidelines")
+
+        assert frame is camera._frame_buffers[camera._frame_index]
+        assert tuple(frame[240, 320]) == (0, 255, 0)
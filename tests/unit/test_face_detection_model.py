@@ -0,0 +1,137 @@
+"""
+Unit tests voor FaceDetectionModel
+"""
+import multiprocessing
+import os
+import pytest
+import numpy as np
+from types import SimpleNamespace
+
+from src.models.face_detection_model import FaceDetectionModel, FaceDetectionModelFactory
+
+
+@pytest.fixture(scope="module")
+def model():
+    """Eén face detection model voor alle tests"""
+    return FaceDetectionModel()
+
+
+def create_face_landmarks(seed: int = 0):
+    """Helper om nep MediaPipe landmarks (468 genormaliseerde punten) te maken"""
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0.2, 0.8, size=(468, 2))
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in coords])
+
+
+class FakeFaceMesh:
+    """Face mesh dat altijd dezelfde landmarks teruggeeft en de input onthoudt"""
+
+    def __init__(self, face_landmarks):
+        self.face_landmarks = face_landmarks
+        self.last_shape = None
+
+    def process(self, image_rgb):
+        self.last_shape = image_rgb.shape
+        return SimpleNamespace(multi_face_landmarks=[self.face_landmarks])
+
+    def close(self):
+        pass
+
+
+class TestFaceDetectionModel:
+    """Test suite voor FaceDetectionModel"""
+
+    def test_landmarks_to_points(self, model):
+        """Landmarks worden geschaald naar pixel coordinaten"""
+        face_landmarks = create_face_landmarks()
+
+        points = model._landmarks_to_points(face_landmarks, (480, 640, 3))
+
+        assert points.shape == (468, 2)
+        lm = face_landmarks.landmark[10]
+        assert points[10, 0] == pytest.approx(lm.x * 640)
+        assert points[10, 1] == pytest.approx(lm.y * 480)
+
+    def test_calculate_bounding_box(self, model):
+        """Bounding box omsluit alle landmarks met 10% padding"""
+        face_landmarks = create_face_landmarks()
+        points = model._landmarks_to_points(face_landmarks, (480, 640))
+
+        x, y, w, h = model._calculate_bounding_box(points, (480, 640))
+
+        x_min = int(min(lm.x * 640 for lm in face_landmarks.landmark))
+        x_max = int(max(lm.x * 640 for lm in face_landmarks.landmark))
+        y_min = int(min(lm.y * 480 for lm in face_landmarks.landmark))
+        assert x == x_min - int((x_max - x_min) * 0.1)
+        assert y <= y_min
+        assert x + w <= 640 and y + h <= 480
+
+    def test_extract_landmarks(self, model):
+        """Landmark features gebruiken afgekapte pixel coordinaten"""
+        face_landmarks = create_face_landmarks()
+        points = model._landmarks_to_points(face_landmarks, (480, 640, 3))
+
+        landmarks = model._extract_landmarks(points, (480, 640, 3))
+
+        top = face_landmarks.landmark[13]
+        bottom = face_landmarks.landmark[14]
+        assert landmarks['mouth_upper'] == int(top.y * 480)
+        assert landmarks['mouth_lower'] == int(bottom.y * 480)
+        assert len(landmarks['left_eye_region']) == 4
+        assert 0.0 <= landmarks['mouth_symmetry'] <= 1.0
+
+    def test_detect_face_downscales_large_images(self):
+        """Grote images worden verkleind, bbox is in originele pixels"""
+        model = FaceDetectionModel()
+        face_landmarks = create_face_landmarks()
+        model._face_mesh = FakeFaceMesh(face_landmarks)
+
+        result = model.detect_face(np.zeros((720, 1280, 3), dtype=np.uint8))
+
+        assert model._face_mesh.last_shape == (360, 640, 3)
+        assert result.face_found is True
+        expected = model._calculate_bounding_box(
+            model._landmarks_to_points(face_landmarks, (720, 1280)), (720, 1280)
+        )
+        assert result.face_bbox == expected
+
+    def test_detect_faces_batch(self):
+        """Batch detectie geeft één resultaat per image, in dezelfde volgorde"""
+        model = FaceDetectionModel()
+        model._face_mesh = FakeFaceMesh(create_face_landmarks())
+        images = [np.zeros((480, 640, 3), dtype=np.uint8), np.zeros((240, 320), dtype=np.uint8)]
+
+        results = model.detect_faces_batch(images)
+
+        assert [r.face_bbox for r in results] == [model.detect_face(image).face_bbox for image in images]
+        assert results[1].face_bbox != results[0].face_bbox
+
+
+def _cached_model_count() -> int:
+    """Aantal gedeelde models in de factory cache van dit proces (draait in een child)"""
+    return len(FaceDetectionModelFactory._models)
+
+
+class TestFaceDetectionModelFactory:
+    """Test suite voor FaceDetectionModelFactory"""
+
+    def test_default_model_is_shared(self):
+        """Default model wordt maar één keer aangemaakt"""
+        assert FaceDetectionModelFactory.create_default_model() is FaceDetectionModelFactory.create_default_model()
+
+    def test_models_are_shared_per_parameters(self):
+        """Andere parameters geven een ander model"""
+        model = FaceDetectionModelFactory.create_mediapipe_model(min_detection_confidence=0.8)
+
+        assert FaceDetectionModelFactory.create_mediapipe_model(min_detection_confidence=0.8) is model
+        assert FaceDetectionModelFactory.create_default_model() is not model
+
+    @pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="geen fork op dit platform")
+    def test_forked_child_starts_with_empty_cache(self):
+        """Een geforkt proces erft de MediaPipe graph van de parent niet"""
+        FaceDetectionModelFactory.create_default_model()
+
+        with multiprocessing.get_context("fork").Pool(1) as pool:
+            # timeout: een child dat op de graph van de parent wacht blijft anders eeuwig hangen
+            assert pool.apply_async(_cached_model_count).get(timeout=60) == 0
+        assert len(FaceDetectionModelFactory._models) > 0
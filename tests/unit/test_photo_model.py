@@ -8,22 +8,31 @@ from datetime import datetime
 from src.models.photo import Photo, PhotoStatus, ValidationResult, FaceDetectionResult
 
 
+@pytest.fixture(scope="module")
+def blank_image():
+    """Eén zwarte BGR image voor alle tests; read-only zodat geen test hem aanpast"""
+    image = np.zeros((480, 640, 3), dtype=np.uint8)
+    image.setflags(write=False)
+    return image
+
+
 class TestPhoto:
     """Test suite voor Photo class"""
 
-    def test_create_photo_with_valid_data(self):
+    def test_create_photo_with_valid_data(self, blank_image):
         """UT-DM-01: Creëer Photo object met geldige data"""
-        image_data = np.zeros((480, 640, 3), dtype=np.uint8)
-        photo = Photo(image_data=image_data)
+        photo = Photo(image_data=blank_image)
 
         assert photo.image_data is not None
         assert photo.status == PhotoStatus.PENDING
         assert isinstance(photo.timestamp, datetime)
         assert len(photo.validation_results) == 0
+        assert photo.get_overall_confidence() == 0.0
+        assert photo.get_failed_validations() == []
 
-    def test_add_validation_result(self):
+    def test_add_validation_result(self, blank_image):
         """UT-DM-02: add_validation_result() voegt result toe"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
         result = ValidationResult(
             validator_name="TestValidator",
             is_valid=True,
@@ -36,9 +45,9 @@ class TestPhoto:
         assert len(photo.validation_results) == 1
         assert photo.validation_results[0] == result
 
-    def test_is_valid_with_all_passed(self):
+    def test_is_valid_with_all_passed(self, blank_image):
         """UT-DM-03: is_valid() met alle passed validators"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
 
         # Add multiple passed validations
         for i in range(3):
@@ -52,9 +61,9 @@ class TestPhoto:
 
         assert photo.is_valid() is True
 
-    def test_is_valid_with_failed_validators(self):
+    def test_is_valid_with_failed_validators(self, blank_image):
         """UT-DM-04: is_valid() met gefaalde validators"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
 
         # Add one passed, one failed
         photo.add_validation_result(ValidationResult(
@@ -72,9 +81,9 @@ class TestPhoto:
 
         assert photo.is_valid() is False
 
-    def test_get_overall_confidence(self):
+    def test_get_overall_confidence(self, blank_image):
         """UT-DM-05: get_overall_confidence() berekening"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
 
         # Add results with known confidences
         photo.add_validation_result(ValidationResult(
@@ -90,9 +99,9 @@ class TestPhoto:
         expected_confidence = (0.8 + 0.6 + 1.0) / 3
         assert photo.get_overall_confidence() == pytest.approx(expected_confidence)
 
-    def test_update_status_approved(self):
+    def test_update_status_approved(self, blank_image):
         """UT-DM-06: update_status() met passed validations"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
 
         photo.add_validation_result(ValidationResult(
             validator_name="V1", is_valid=True, confidence=0.9, message="ok"
@@ -102,9 +111,9 @@ class TestPhoto:
 
         assert photo.status == PhotoStatus.APPROVED
 
-    def test_update_status_rejected(self):
+    def test_update_status_rejected(self, blank_image):
         """UT-DM-07: update_status() met failed validations"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
 
         photo.add_validation_result(ValidationResult(
             validator_name="V1", is_valid=False, confidence=0.3, message="failed"
@@ -114,9 +123,9 @@ class TestPhoto:
 
         assert photo.status == PhotoStatus.REJECTED
 
-    def test_get_failed_validations(self):
+    def test_get_failed_validations(self, blank_image):
         """Test get_failed_validations() methode"""
-        photo = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+        photo = Photo(image_data=blank_image)
 
         passed_result = ValidationResult(
             validator_name="V1", is_valid=True, confidence=0.9, message="ok"
@@ -139,6 +148,54 @@ class TestPhoto:
         assert failed_result2 in failed
         assert passed_result not in failed
 
+    def test_is_grayscale(self, blank_image):
+        """Test is_grayscale voor 2-D, BGR en ontbrekende image data"""
+        assert Photo(image_data=np.zeros((480, 640), dtype=np.uint8)).is_grayscale is True
+        assert Photo(image_data=blank_image).is_grayscale is False
+        assert Photo().is_grayscale is False
+
+    def test_totals_from_constructor(self):
+        """Test dat meegegeven validation_results meetellen in de totalen"""
+        results = [
+            ValidationResult("Validator0", True, 0.8, "Passed"),
+            ValidationResult("Validator1", False, 0.4, "Failed")
+        ]
+        photo = Photo(validation_results=results)
+
+        assert photo.is_valid() is False
+        assert photo.get_overall_confidence() == pytest.approx(0.6)
+        assert photo.get_failed_validations() == [results[1]]
+
+    def test_reset(self, blank_image):
+        """Test reset() hergebruikt het object voor nieuwe image data"""
+        photo = Photo(image_data=blank_image)
+        photo.add_validation_result(ValidationResult("TestValidator", False, 0.2, "Failed"))
+        photo.update_status()
+        results = photo.validation_results
+        new_image = np.zeros((286, 384), dtype=np.uint8)
+
+        photo.reset(new_image)
+
+        assert photo.image_data is new_image
+        assert photo.status == PhotoStatus.PENDING
+        assert photo.validation_results is results
+        assert len(photo.validation_results) == 0
+
+
+    def test_cache_belongs_to_image(self):
+        """Gecachte data geldt alleen voor de image waarvoor hij opgeslagen is"""
+        photo = Photo(image_data=np.zeros((10, 10, 3), dtype=np.uint8))
+        photo.set_cached("gray", "value")
+
+        assert photo.get_cached("gray") == "value"
+
+        photo.image_data = np.zeros((10, 10, 3), dtype=np.uint8)
+        assert photo.get_cached("gray") is None
+
+        photo.set_cached("gray", "value")
+        photo.reset(photo.image_data)
+        assert photo.get_cached("gray") is None
+
 
 class TestValidationResult:
     """Test suite voor ValidationResult class"""
@@ -187,6 +244,41 @@ class TestValidationResult:
 
         assert result.details == details
 
+    def test_json_details_are_parsed_lazily(self):
+        """Details uit JSON worden pas bij het eerste lezen geparsed"""
+        result = ValidationResult.from_json_details("Test", True, 0.9, "ok", b'{"score": 0.9}')
+
+        assert result._details == b'{"score": 0.9}'
+        assert result.details == {"score": 0.9}
+        assert result._details == {"score": 0.9}
+        assert result == ValidationResult("Test", True, 0.9, "ok", {"score": 0.9})
+
+    def test_json_details_empty(self):
+        """Lege JSON details geven None"""
+        assert ValidationResult.from_json_details("Test", True, 0.9, "ok", None).details is None
+
+    def test_factory_details_are_built_once_on_first_read(self):
+        """Details van een factory worden pas bij het eerste lezen (één keer) opgebouwd"""
+        calls = []
+
+        def details():
+            calls.append(1)
+            return {"score": 0.9}
+
+        result = ValidationResult.from_details_factory("Test", True, 0.9, "ok", details)
+
+        assert calls == []
+        assert result.details == {"score": 0.9}
+        assert result.details == {"score": 0.9}
+        assert calls == [1]
+
+    def test_setting_details_replaces_factory(self):
+        """Details zetten vervangt een nog niet aangeroepen factory"""
+        result = ValidationResult.from_details_factory("Test", True, 0.9, "ok", lambda: {"old": 1})
+        result.details = {"new": 2}
+
+        assert result.details == {"new": 2}
+
 
 class TestFaceDetectionResult:
     """Test suite voor FaceDetectionResult class"""
@@ -0,0 +1,249 @@
+"""
+Unit tests voor SQLitePhotoRepository
+"""
+import sqlite3
+from datetime import datetime
+import pytest
+import numpy as np
+
+from src.models.photo import Photo, PhotoStatus, ValidationResult
+from src.repositories.photo_repository import SQLitePhotoRepository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Repository met een tijdelijke database"""
+    repository = SQLitePhotoRepository(db_path=str(tmp_path / "photos.db"))
+    yield repository
+    repository.close()
+
+
+def create_photo(is_valid: bool = True) -> Photo:
+    """Helper om een gevalideerde photo te maken"""
+    photo = Photo(metadata={"resolution": "640x480"})
+    photo.add_validation_result(ValidationResult(
+        validator_name="BrightnessValidator",
+        is_valid=is_valid,
+        confidence=0.9 if is_valid else 0.2,
+        message="Test",
+        details={"mean_brightness": np.float64(140.0)}
+    ))
+    photo.update_status()
+    return photo
+
+
+class TestSQLitePhotoRepository:
+    """Test suite voor SQLitePhotoRepository"""
+
+    def test_save_and_get_by_id(self, repository):
+        """Opgeslagen photo kan weer worden opgehaald"""
+        photo = create_photo()
+
+        assert repository.save(photo) is True
+
+        loaded = repository.get_by_id(photo.id)
+        assert loaded is not None
+        assert loaded.status == PhotoStatus.APPROVED
+        assert loaded.metadata == {"resolution": "640x480"}
+        assert len(loaded.validation_results) == 1
+        assert loaded.validation_results[0].details == {"mean_brightness": 140.0}
+
+    def test_save_numpy_details(self, repository):
+        """Numpy waardes in details en metadata worden als gewone JSON opgeslagen"""
+        photo = create_photo()
+        photo.metadata["shape"] = np.array([480, 640])
+        photo.validation_results[0].details = {
+            "ratio": np.float32(0.5), "count": np.int64(3), "ok": np.bool_(True)
+        }
+        repository.save(photo)
+
+        loaded = repository.get_by_id(photo.id)
+
+        assert loaded.metadata["shape"] == [480, 640]
+        assert loaded.validation_results[0].details == {"ratio": 0.5, "count": 3, "ok": True}
+
+    def test_numpy_confidence_is_stored_as_real(self, repository, tmp_path):
+        """Een numpy float32 confidence wordt als REAL opgeslagen, niet als BLOB"""
+        photo = create_photo()
+        photo.validation_results[0].confidence = np.float32(0.75)
+        repository.save(photo)
+
+        conn = sqlite3.connect(str(tmp_path / "photos.db"))
+        stored_type = conn.execute('SELECT typeof(confidence) FROM validation_results').fetchone()[0]
+        conn.close()
+
+        assert stored_type == "real"
+        assert repository.get_by_id(photo.id).validation_results[0].confidence == 0.75
+
+    def test_get_by_id_reads_blob_confidence(self, repository, tmp_path):
+        """Confidence die als float32 BLOB is opgeslagen (oudere database) wordt ook gelezen"""
+        photo = create_photo()
+        repository.save(photo)
+        conn = sqlite3.connect(str(tmp_path / "photos.db"))
+        conn.execute('UPDATE validation_results SET confidence = ?', (np.float32(0.5).tobytes(),))
+        conn.commit()
+        conn.close()
+
+        assert repository.get_by_id(photo.id).validation_results[0].confidence == 0.5
+
+    def test_get_by_id_reads_text_metadata(self, repository, tmp_path):
+        """Metadata die nog als TEXT is opgeslagen (oudere database) wordt ook gelezen"""
+        conn = sqlite3.connect(str(tmp_path / "photos.db"))
+        conn.execute(
+            "INSERT INTO photos (id, timestamp, status, metadata) VALUES (?, ?, ?, ?)",
+            ("old", datetime(2024, 1, 1).isoformat(), "pending", '{"resolution": "640x480"}')
+        )
+        conn.commit()
+        conn.close()
+
+        assert repository.get_by_id("old").metadata == {"resolution": "640x480"}
+
+    def test_get_file_info(self, repository):
+        """get_file_info geeft alleen pad en status"""
+        photo = create_photo()
+        photo.file_path = "data/photos/approved/test.jpg"
+        repository.save(photo)
+
+        assert repository.get_file_info(photo.id) == ("data/photos/approved/test.jpg", PhotoStatus.APPROVED)
+        assert repository.get_file_info("does-not-exist") is None
+
+    def test_get_by_id_not_found(self, repository):
+        """Onbekend ID geeft None"""
+        assert repository.get_by_id("does-not-exist") is None
+
+    def test_save_photos_batch(self, repository):
+        """save_photos slaat alle photos op, ook over meerdere batches"""
+        photos = [create_photo(is_valid=i % 2 == 0) for i in range(5)]
+
+        saved = repository.save_photos(photos, batch_size=2)
+
+        assert saved == 5
+        assert all(photo.id is not None for photo in photos)
+        assert len(repository.get_all()) == 5
+        assert len(repository.get_by_status(PhotoStatus.REJECTED)) == 2
+
+        stats = repository.get_statistics()
+        assert stats["total_photos"] == 5
+        assert stats["by_status"] == {"approved": 3, "rejected": 2}
+
+    def test_save_photos_single_transaction(self, repository):
+        """Met batch_size=None gaat alles in één transactie"""
+        photos = [create_photo() for _ in range(3)]
+
+        assert repository.save_photos(photos, batch_size=None) == 3
+        assert repository.get_statistics()["total_photos"] == 3
+
+    def test_save_photos_single_transaction_rolls_back_on_error(self, repository):
+        """Als één photo faalt wordt niks opgeslagen"""
+        broken = create_photo()
+        broken.validation_results[0].confidence = None  # NOT NULL in de database
+
+        assert repository.save_photos([create_photo(), broken], batch_size=None) == 0
+        assert repository.get_statistics()["total_photos"] == 0
+
+        # de connectie is niet in een open transactie blijven hangen
+        assert repository.save(create_photo()) is True
+
+    def test_save_photos_counts_committed_batches_on_error(self, repository):
+        """Bij een fout telt save_photos alleen de batches die al gecommit zijn"""
+        broken = create_photo()
+        broken.validation_results[0].confidence = None
+
+        assert repository.save_photos([create_photo(), broken], batch_size=1) == 1
+        assert repository.get_statistics()["total_photos"] == 1
+
+    def test_get_all_with_limit(self, repository):
+        """get_all geeft de nieuwste photos met al hun validation results"""
+        photos = [create_photo() for _ in range(3)]
+        for i, photo in enumerate(photos):
+            photo.timestamp = photo.timestamp.replace(year=2020 + i)
+            photo.add_validation_result(ValidationResult("SharpnessValidator", False, 0.1, "Wazig"))
+            repository.save(photo)
+        repository.save(Photo(timestamp=datetime(2000, 1, 1)))  # zonder validation results
+
+        loaded = repository.get_all(limit=2)
+
+        assert [p.id for p in loaded] == [photos[2].id, photos[1].id]
+        assert [r.validator_name for r in loaded[0].validation_results] == [
+            "BrightnessValidator", "SharpnessValidator"
+        ]
+        assert len(repository.get_all()) == 4
+
+    def test_iter_all_across_fetch_batches(self, repository, monkeypatch):
+        """iter_all levert alle photos compleet, ook als een photo over twee batches valt"""
+        monkeypatch.setattr(SQLitePhotoRepository, "_FETCH_SIZE", 3)
+        photos = [create_photo() for _ in range(4)]
+        for i, photo in enumerate(photos):
+            photo.timestamp = datetime(2020 + i, 1, 1)
+            photo.add_validation_result(ValidationResult("SharpnessValidator", True, 0.8, "Scherp"))
+        repository.save_photos(photos)
+
+        loaded = list(repository.iter_all())
+
+        assert [p.id for p in loaded] == [p.id for p in reversed(photos)]
+        assert all(len(p.validation_results) == 2 for p in loaded)
+
+    def test_delete(self, repository):
+        """Verwijderde photo is niet meer op te halen"""
+        photo = create_photo()
+        repository.save(photo)
+
+        assert repository.delete(photo.id) is True
+        assert repository.get_by_id(photo.id) is None
+        assert repository.delete(photo.id) is False
+
+    def test_delete_cascades_validation_results(self, repository, tmp_path):
+        """Bij delete worden ook de validation results verwijderd"""
+        photo = create_photo()
+        repository.save(photo)
+
+        repository.delete(photo.id)
+
+        conn = sqlite3.connect(str(tmp_path / "photos.db"))
+        count = conn.execute('SELECT COUNT(*) FROM validation_results').fetchone()[0]
+        conn.close()
+        assert count == 0
+
+    def test_connection_is_reused(self, repository):
+        """Dezelfde thread krijgt steeds dezelfde connectie, ook na close() weer een werkende"""
+        assert repository._connect() is repository._connect()
+
+        repository.close()
+
+        assert repository.get_statistics()["total_photos"] == 0
+
+    def test_delete_older_than(self, repository):
+        """Oude photos worden in één keer verwijderd, behalve de uitgezonderde status"""
+        old_rejected = create_photo(is_valid=False)
+        old_approved = create_photo(is_valid=True)
+        new_rejected = create_photo(is_valid=False)
+        for photo in (old_rejected, old_approved):
+            photo.timestamp = datetime(2020, 1, 1)
+        old_rejected.file_path = "data/photos/rejected/old.jpg"
+        repository.save_photos([old_rejected, old_approved, new_rejected])
+
+        deleted = repository.delete_older_than(datetime(2021, 1, 1), exclude_status=PhotoStatus.APPROVED)
+
+        assert deleted == [(old_rejected.id, "data/photos/rejected/old.jpg")]
+        assert repository.get_by_id(old_rejected.id) is None
+        assert repository.get_statistics()["total_photos"] == 2
+
+    def test_statistics_are_cached_until_write(self, repository, tmp_path):
+        """get_statistics hergebruikt zijn resultaat, maar een save maakt de cache leeg"""
+        repository.save(create_photo())
+        assert repository.get_statistics()["total_photos"] == 1
+
+        # een write buiten de repository om wordt binnen de TTL niet gezien
+        conn = sqlite3.connect(str(tmp_path / "photos.db"))
+        conn.execute(
+            "INSERT INTO photos (id, timestamp, status) VALUES (?, ?, ?)",
+            ("extern", datetime(2024, 1, 1).isoformat(), "pending")
+        )
+        conn.commit()
+        conn.close()
+        assert repository.get_statistics()["total_photos"] == 1
+
+        repository.save(create_photo())
+        stats = repository.get_statistics()
+        assert stats["total_photos"] == 3
+        assert stats["by_status"] == {"approved": 2, "pending": 1}
@@ -0,0 +1,188 @@
+"""
+Unit tests voor StorageService
+"""
+import os
+import cv2
+import pytest
+import numpy as np
+from datetime import datetime
+
+from src.models.photo import Photo, PhotoStatus
+from src.repositories.photo_repository import SQLitePhotoRepository
+from src.services.storage_service import StorageService, _dir_size
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """StorageService met een tijdelijke directory en database"""
+    repository = SQLitePhotoRepository(db_path=str(tmp_path / "photos.db"))
+    service = StorageService(storage_path=str(tmp_path / "photos"), repository=repository)
+    yield service
+    service.close()
+
+
+def create_photo(status: PhotoStatus, timestamp: datetime = None) -> Photo:
+    """Helper om een photo met image data te maken"""
+    photo = Photo(image_data=np.full((48, 64, 3), 128, dtype=np.uint8), status=status)
+    if timestamp is not None:
+        photo.timestamp = timestamp
+    return photo
+
+
+class TestDirSize:
+    """Test suite voor _dir_size"""
+
+    def test_dir_size_counts_nested_files(self, tmp_path):
+        """Bestanden in subdirectories tellen mee"""
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "top.bin").write_bytes(b"x" * 10)
+        (tmp_path / "a" / "mid.bin").write_bytes(b"x" * 20)
+        (tmp_path / "a" / "b" / "deep.bin").write_bytes(b"x" * 30)
+
+        assert _dir_size(str(tmp_path)) == 60
+
+    def test_dir_size_missing_directory(self, tmp_path):
+        """Een niet bestaande directory is 0 bytes"""
+        assert _dir_size(str(tmp_path / "missing")) == 0
+
+
+class TestStorageService:
+    """Test suite voor StorageService"""
+
+    def test_save_and_load_photo(self, storage):
+        """Opgeslagen photo staat op disk en kan weer geladen worden"""
+        photo = create_photo(PhotoStatus.APPROVED)
+
+        assert storage.save_photo(photo) is True
+        storage.flush()
+        assert os.path.exists(photo.file_path)
+
+        loaded = storage.load_photo(photo.id)
+        assert loaded is not None
+        assert loaded.image_data.shape == (48, 64, 3)
+
+    def test_load_photo_reads_cached_path_in_background(self, storage, monkeypatch):
+        """Voor een bekende photo wordt het bestand op de reader thread gelezen"""
+        photo = create_photo(PhotoStatus.APPROVED)
+        storage.save_photo(photo)
+        submitted = []
+        submit = storage._read_executor.submit
+        monkeypatch.setattr(
+            storage._read_executor, "submit",
+            lambda fn, path, *args: submitted.append(path) or submit(fn, path, *args)
+        )
+
+        loaded = storage.load_photo(photo.id)
+
+        assert submitted == [photo.file_path]
+        assert loaded.image_data.shape == (48, 64, 3)
+
+    def test_load_photo_without_cached_path(self, tmp_path):
+        """Een photo die deze service nog niet kent wordt via get_file_info gevonden"""
+        repository = SQLitePhotoRepository(db_path=str(tmp_path / "photos.db"))
+        first = StorageService(storage_path=str(tmp_path / "photos"), repository=repository)
+        photo = create_photo(PhotoStatus.APPROVED)
+        first.save_photo(photo)
+        first.flush()
+
+        second = StorageService(storage_path=str(tmp_path / "photos"), repository=repository)
+        loaded = second.load_photo(photo.id)
+        second.close()
+        first.close()
+
+        assert loaded.image_data.shape == (48, 64, 3)
+        assert dict(second._meta_cache) == {photo.id: (photo.file_path, PhotoStatus.APPROVED)}
+
+    def test_meta_cache_is_bounded(self, storage, monkeypatch):
+        """De cache houdt alleen de meest recente photos vast"""
+        monkeypatch.setattr(StorageService, "_META_CACHE_SIZE", 2)
+        for photo_id in ("a", "b", "c"):
+            storage._remember_meta(photo_id, f"{photo_id}.jpg", PhotoStatus.PENDING)
+
+        assert list(storage._meta_cache) == ["b", "c"]
+
+    def test_delete_photo_uses_cached_path(self, storage, monkeypatch):
+        """delete_photo haalt niet de hele photo op als het pad al bekend is"""
+        photo = create_photo(PhotoStatus.REJECTED)
+        storage.save_photo(photo)
+        storage.flush()
+        monkeypatch.setattr(storage._repository, "get_by_id", None)
+
+        assert storage.delete_photo(photo.id) is True
+        assert not os.path.exists(photo.file_path)
+        assert photo.id not in storage._meta_cache
+
+    def test_save_photo_writes_in_background(self, storage):
+        """Metadata staat direct in de database, het bestand na flush() op disk"""
+        photos = [create_photo(PhotoStatus.PENDING) for _ in range(5)]
+
+        for photo in photos:
+            assert storage.save_photo(photo) is True
+            assert storage._repository.get_by_id(photo.id) is not None
+
+        storage.flush()
+
+        for photo in photos:
+            image = cv2.imread(photo.file_path)
+            assert image is not None
+            assert image.shape == (48, 64, 3)
+
+    def test_save_photo_rejects_empty_image(self, storage):
+        """Een lege image wordt niet opgeslagen, ook niet in de database"""
+        photo = Photo(image_data=np.zeros((0, 0, 3), dtype=np.uint8))
+
+        assert storage.save_photo(photo) is False
+        assert storage._repository.get_statistics()["total_photos"] == 0
+
+    def test_save_photo_writes_a_private_copy(self, storage):
+        """Als de caller de image na save_photo overschrijft, verandert het bestand niet"""
+        photo = create_photo(PhotoStatus.PENDING)
+        photo.image_data[:] = 10
+
+        storage.save_photo(photo)
+        photo.image_data[:] = 250
+        storage.flush()
+
+        assert cv2.imread(photo.file_path).mean() == pytest.approx(10, abs=2)
+
+    def test_failed_write_is_rolled_back(self, storage, monkeypatch):
+        """Als encoden mislukt verdwijnt de database rij en meldt flush() het ID"""
+        monkeypatch.setattr(cv2, "imencode", lambda *args: (False, None))
+        photo = create_photo(PhotoStatus.PENDING)
+
+        assert storage.save_photo(photo) is True
+
+        assert storage.flush() == [photo.id]
+        assert storage._repository.get_by_id(photo.id) is None
+        assert photo.id not in storage._meta_cache
+        assert storage.flush() == []
+
+    def test_cleanup_old_photos(self, storage):
+        """Oude, niet goedgekeurde photos worden verwijderd (bestand + metadata)"""
+        old_rejected = create_photo(PhotoStatus.REJECTED, datetime(2020, 1, 1))
+        old_approved = create_photo(PhotoStatus.APPROVED, datetime(2020, 1, 1))
+        new_rejected = create_photo(PhotoStatus.REJECTED)
+        for photo in (old_rejected, old_approved, new_rejected):
+            storage.save_photo(photo)
+
+        assert storage.cleanup_old_photos(days=30) == 1
+
+        assert not os.path.exists(old_rejected.file_path)
+        assert os.path.exists(old_approved.file_path)
+        assert os.path.exists(new_rejected.file_path)
+        assert storage.load_photo(old_rejected.id) is None
+
+    def test_storage_statistics_track_saved_and_deleted_files(self, storage):
+        """De gecachte directory grootte wordt bijgewerkt bij save en delete"""
+        empty_size = storage.get_storage_statistics()["total_size_bytes"]
+        photo = create_photo(PhotoStatus.PENDING)
+
+        storage.save_photo(photo)
+        stats = storage.get_storage_statistics()
+
+        file_size = os.path.getsize(photo.file_path)
+        assert stats["total_size_bytes"] == empty_size + file_size
+        assert stats["total_photos"] == 1
+
+        storage.delete_photo(photo.id)
+        assert storage.get_storage_statistics()["total_size_bytes"] == empty_size
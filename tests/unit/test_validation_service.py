@@ -0,0 +1,360 @@
+"""
+Unit tests voor ValidationService
+"""
+import threading
+import pytest
+import numpy as np
+
+from src.models.photo import Photo, PhotoStatus, FaceDetectionResult
+from src.models.face_detection_model import FaceDetectionModelFactory
+from src.services.validation_service import ValidationService, IValidationObserver, SummaryRow
+from src.validators.brightness_validator import BrightnessValidator
+from src.validators.face_position_validator import FacePositionValidator
+
+
+class StubFaceDetectionModel:
+    """Face detection model dat een vast resultaat teruggeeft"""
+
+    def __init__(self, result: FaceDetectionResult):
+        self.result = result
+        self.calls = 0
+        self.batch_sizes = []
+
+    def detect_face(self, image: np.ndarray) -> FaceDetectionResult:
+        self.calls += 1
+        return self.result
+
+    def detect_faces_batch(self, images):
+        self.batch_sizes.append(len(images))
+        return [self.result for _ in images]
+
+
+class SpyValidator(FacePositionValidator):
+    """FacePositionValidator die bijhoudt of validate() aangeroepen is"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def validate(self, photo, face_detection=None):
+        self.calls += 1
+        return super().validate(photo, face_detection)
+
+
+class ThreadRecordingValidator(BrightnessValidator):
+    """BrightnessValidator die onthoudt op welke thread hij draaide"""
+
+    def __init__(self):
+        super().__init__()
+        self.thread = None
+
+    def validate(self, photo, face_detection=None):
+        self.thread = threading.current_thread()
+        return super().validate(photo, face_detection)
+
+
+class RecordingObserver(IValidationObserver):
+    """Observer die alleen resultaten en de afgeronde photo bijhoudt"""
+
+    def __init__(self):
+        self.results = []
+        self.completed = None
+
+    def on_validation_result(self, result):
+        self.results.append(result)
+
+    def on_validation_complete(self, photo):
+        self.completed = photo
+
+
+def create_photo() -> Photo:
+    """Helper om een photo met normale belichting te maken"""
+    return Photo(image_data=np.full((480, 640, 3), 140, dtype=np.uint8))
+
+
+class TestValidationService:
+    """Test suite voor ValidationService"""
+
+    def test_validate_photo_runs_all_validators(self):
+        """Alle validators leveren een resultaat"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator(), FacePositionValidator()])
+
+        photo = service.validate_photo(create_photo())
+
+        assert model.calls == 1
+        assert [r.validator_name for r in photo.validation_results] == [
+            "BrightnessValidator", "FacePositionValidator"
+        ]
+        assert photo.status == PhotoStatus.REJECTED
+
+    def test_validate_photo_reuses_face_detection(self):
+        """Meegegeven face detection wordt niet opnieuw berekend"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()])
+        detection = FaceDetectionResult(face_found=False, confidence=0.0)
+
+        service.validate_photo(create_photo(), face_detection=detection)
+
+        assert model.calls == 0
+
+    def test_fast_fail_skips_face_validators(self):
+        """Met fast_fail worden gezichts-validators overgeslagen als er geen gezicht is"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        spy = SpyValidator()
+        service = ValidationService(model, [BrightnessValidator(), spy])
+
+        photo = service.validate_photo(create_photo(), fast_fail=True)
+
+        assert spy.calls == 0
+        result = photo.validation_results[1]
+        assert result.validator_name == "FacePositionValidator"
+        assert result.is_valid is False
+        assert result.confidence == 0.0
+        assert photo.validation_results[0].validator_name == "BrightnessValidator"
+
+    def test_fast_fail_runs_face_validators_when_face_found(self):
+        """Met fast_fail en een gevonden gezicht draaien alle validators gewoon"""
+        detection = FaceDetectionResult(face_found=True, confidence=1.0, face_bbox=(160, 120, 320, 240))
+        spy = SpyValidator()
+        service = ValidationService(StubFaceDetectionModel(detection), [spy])
+
+        photo = service.validate_photo(create_photo(), fast_fail=True)
+
+        assert spy.calls == 1
+        assert photo.validation_results[0].is_valid == True  # gebruik == voor numpy booleans
+
+    def test_dispatch_follows_added_and_removed_validators(self):
+        """Na add/remove_validator draait precies de nieuwe set validators"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        service.validate_photo(create_photo())
+
+        service.add_validator(FacePositionValidator())
+        service.remove_validator("BrightnessValidator")
+        photo = service.validate_photo(create_photo())
+
+        assert [r.validator_name for r in photo.validation_results] == ["FacePositionValidator"]
+
+    def test_stop_on_critical_skips_after_critical_failure(self):
+        """Met stop_on_critical worden validators na een zwaar falende kritieke validator overgeslagen"""
+        detection = FaceDetectionResult(face_found=True, confidence=1.0, face_bbox=(160, 120, 320, 240))
+        spy = SpyValidator()
+        service = ValidationService(StubFaceDetectionModel(detection), [BrightnessValidator(), spy], max_workers=1)
+        dark = Photo(image_data=np.zeros((480, 640, 3), dtype=np.uint8))
+
+        photo = service.validate_photo(dark, stop_on_critical=True)
+
+        assert spy.calls == 0
+        skipped = photo.validation_results[1]
+        assert skipped.is_valid is False
+        assert skipped.details["failed_validator"] == "BrightnessValidator"
+
+        # met alleen fast_fail (gezicht gevonden) draait alles gewoon
+        service.validate_photo(Photo(image_data=dark.image_data.copy()), fast_fail=True)
+        assert spy.calls == 1
+
+    def test_observers_receive_events(self):
+        """Observers krijgen per event hun eigen methode aangeroepen"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator(), FacePositionValidator()])
+        observer = RecordingObserver()
+        service.add_observer(observer)
+
+        photo = service.validate_photo(create_photo())
+
+        assert observer.results == photo.validation_results
+        assert observer.completed is photo
+
+    def test_observers_are_indexed_by_event(self):
+        """Een observer krijgt alleen de events die hij zelf afhandelt of waarop hij ingeschreven is"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        observer = RecordingObserver()
+        completed_only = RecordingObserver()
+        service.add_observer(observer)
+        service.add_observer(completed_only, event_types=["on_validation_complete"])
+
+        assert [o for o, _ in service._observers_by_event["on_validation_result"]] == [observer]
+        assert not service._has_observers("on_validation_progress")
+
+        photo = service.validate_photo(create_photo())
+
+        assert completed_only.results == []
+        assert completed_only.completed is photo
+
+        service.remove_observer(observer)
+        assert not service._has_observers("on_validation_result")
+        with pytest.raises(ValueError):
+            service.add_observer(observer, event_types=["on_unknown"])
+
+    def test_validators_run_on_thread_pool(self):
+        """Validators draaien op de pool, resultaten blijven in validator volgorde"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        validators = [ThreadRecordingValidator(), FacePositionValidator(), ThreadRecordingValidator()]
+        service = ValidationService(model, validators, max_workers=2)
+
+        photo = service.validate_photo(create_photo())
+        service.close()
+
+        assert validators[0].thread is not threading.current_thread()
+        assert [r.validator_name for r in photo.validation_results] == [
+            "BrightnessValidator", "FacePositionValidator", "BrightnessValidator"
+        ]
+
+    def test_single_worker_runs_on_calling_thread(self):
+        """Met max_workers=1 draait alles op de aanroepende thread"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        validator = ThreadRecordingValidator()
+        service = ValidationService(model, [validator], max_workers=1)
+
+        service.validate_photo(create_photo())
+
+        assert validator.thread is threading.current_thread()
+
+    def test_validate_photo_stream(self):
+        """Stream valideert alle photos in volgorde met hun eigen face detection"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        photos = [create_photo() for _ in range(5)]
+
+        validated = list(service.validate_photo_stream(photos))
+
+        assert [id(photo) for photo in validated] == [id(photo) for photo in photos]
+        assert model.calls == 5
+        assert all(len(photo.validation_results) == 1 for photo in validated)
+
+    def test_validate_photo_stream_stops_early(self):
+        """Als de consumer stopt, stopt de detector thread ook"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+
+        def endless_photos():
+            while True:
+                yield create_photo()
+
+        stream = service.validate_photo_stream(endless_photos())
+        next(stream)
+        stream.close()
+
+        assert not any(t.name == "FaceDetector" for t in threading.enumerate())
+
+    def test_validate_photos_detects_faces_in_one_batch(self):
+        """validate_photos doet face detection voor alle nieuwe photos in één call"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        validated_before = service.validate_photo(create_photo())
+        photos = [create_photo() for _ in range(3)] + [validated_before]
+
+        validated = service.validate_photos(photos)
+
+        assert validated == photos
+        assert model.batch_sizes == [3]
+        assert model.calls == 1  # alleen de losse validate_photo van hierboven
+        assert all(len(photo.validation_results) >= 1 for photo in validated)
+
+    def test_validate_photo_stream_reports_detection_before_detecting(self):
+        """on_face_detection komt binnen voordat de detectie voor die photo gedaan is"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        calls_at_event = []
+
+        class DetectionObserver(IValidationObserver):
+            def on_face_detection(self, message):
+                calls_at_event.append(model.calls)
+
+        service.add_observer(DetectionObserver())
+        list(service.validate_photo_stream([create_photo() for _ in range(3)]))
+
+        assert calls_at_event == [0, 1, 2]
+
+    def test_validate_photo_stream_does_not_hang_on_blocked_source(self, monkeypatch):
+        """Een bron die blijft blokkeren houdt het stoppen van de stream niet tegen"""
+        monkeypatch.setattr(ValidationService, "_STREAM_JOIN_TIMEOUT", 0.1)
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        release = threading.Event()
+
+        def blocking_photos():
+            yield create_photo()
+            release.wait()
+
+        stream = service.validate_photo_stream(blocking_photos())
+        next(stream)
+        stream.close()
+        release.set()
+
+    def test_revalidation_reuses_face_detection(self):
+        """Dezelfde image opnieuw valideren doet geen nieuwe face detection"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator()], max_workers=1)
+        photo = create_photo()
+
+        service.validate_photo(photo)
+        service.validate_photo(photo)
+        assert model.calls == 1
+
+        photo.reset(create_photo().image_data)
+        service.validate_photo(photo)
+        assert model.calls == 2
+
+    def test_grayscale_is_computed_before_validators(self):
+        """De service rekent de grayscale versie uit voordat de validators starten"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [], max_workers=1)
+
+        photo = service.validate_photo(create_photo())
+
+        assert photo.get_cached("gray").shape == (480, 640)
+
+    def test_defaults_are_created_lazily(self, monkeypatch):
+        """Het default model en de validators worden pas bij het eerste gebruik gemaakt"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        created = []
+        monkeypatch.setattr(
+            FaceDetectionModelFactory, "create_default_model",
+            lambda: created.append(model) or model
+        )
+
+        service = ValidationService(max_workers=1)
+
+        assert created == []
+        assert service._validators is None
+
+        photo = service.validate_photo(create_photo())
+
+        assert created == [model]
+        assert len(photo.validation_results) == len(service.get_validators()) == 7
+
+    def test_validation_summary(self):
+        """De samenvatting telt geslaagde en gefaalde validators en geeft SummaryRows"""
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator(), FacePositionValidator()], max_workers=1)
+        photo = service.validate_photo(create_photo())
+
+        summary = service.get_validation_summary(photo)
+
+        assert summary["total_validators"] == 2
+        assert summary["passed_validators"] + summary["failed_validators"] == 2
+        assert summary["failed_validators"] == len(photo.get_failed_validations())
+        first = summary["results"][0]
+        assert isinstance(first, SummaryRow)
+        assert first._asdict()["validator"] == "BrightnessValidator"
+
+    def test_grayscale_runs_on_pool_during_face_detection(self, monkeypatch):
+        """Met een pool wordt de grayscale versie naast de face detection uitgerekend"""
+        import src.services.validation_service as validation_service_module
+        threads = []
+        original = validation_service_module.get_grayscale_image
+        monkeypatch.setattr(
+            validation_service_module, "get_grayscale_image",
+            lambda photo: threads.append(threading.current_thread()) or original(photo)
+        )
+        model = StubFaceDetectionModel(FaceDetectionResult(face_found=False, confidence=0.0))
+        service = ValidationService(model, [BrightnessValidator(), FacePositionValidator()], max_workers=2)
+
+        photo = service.validate_photo(create_photo())
+        service.close()
+
+        assert threads and threads[0] is not threading.current_thread()
+        assert photo.get_cached("gray").shape == (480, 640)